@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+import openai
+from agents import (
+    Agent,
+    AgentOutputSchemaBase,
+    Handoff,
+    Model,
+    ModelSettings,
+    ModelTracing,
+    Tool,
+    TResponseInputItem,
+)
+from agents.items import ModelResponse, TResponseStreamEvent
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    """Limits for one provider. Rates are unlimited if `None`."""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+
+    initial_concurrency: int = 8
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    """Bounds for the adaptive limit on requests in flight."""
+
+    decrease_factor: float = 0.5
+    """The concurrency limit is multiplied by this on a 429 or a slow response."""
+
+    latency_target: float | None = None
+    """Seconds a request (to its first event, when streamed) may take before the provider is
+    treated as overloaded. Only 429s count if `None`."""
+
+    max_retries: int = 3
+    """Times a request that got a 429 is queued again before the error is raised."""
+
+    retry_delay: float = 1.0
+    """Seconds to hold all requests after a 429 without a `Retry-After` header."""
+
+    default_output_tokens: int = 1024
+    """The output estimate for requests without `ModelSettings.max_tokens`."""
+
+
+@dataclass
+class AdmissionStats:
+    admitted: int = 0
+    rate_limited: int = 0
+    slow: int = 0
+    retries: int = 0
+    queued: int = 0
+    peak_queued: int = 0
+    queue_seconds: float = 0.0
+    """Total time requests spent waiting to be admitted."""
+
+
+class _MinuteBucket:
+    """A token bucket that refills `per_minute` tokens a minute and holds at most that many."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available; 0 if they are now."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.tokens - amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+@dataclass(slots=True)
+class _Ticket:
+    tokens: int
+    epoch: int
+    admitted_at: float
+
+
+class AdmissionController:
+    """Decides when requests to one provider may start, so many concurrent agents share its
+    limits instead of all running into 429s.
+
+    A request is admitted once three things allow it: a token bucket on requests per minute, one
+    on tokens per minute (charged an estimate up front and corrected with the actual usage), and
+    an adaptive limit on requests in flight. That limit grows by one for every window of requests
+    that finish without trouble and is cut by `decrease_factor` on a 429 or a response slower than
+    `latency_target` (AIMD). Only requests admitted since the last cut can cut it again, so one
+    burst of 429s counts once.
+
+    Waiting requests are admitted by priority, lowest first, then in arrival order.
+    """
+
+    def __init__(self, limits: AdmissionLimits | None = None) -> None:
+        self.limits = limits or AdmissionLimits()
+        self.stats = AdmissionStats()
+        self.concurrency = float(self.limits.initial_concurrency)
+        self.in_flight = 0
+        self._requests = (
+            _MinuteBucket(self.limits.requests_per_minute)
+            if self.limits.requests_per_minute
+            else None
+        )
+        self._tokens = (
+            _MinuteBucket(self.limits.tokens_per_minute) if self.limits.tokens_per_minute else None
+        )
+        self._waiting: list[tuple[int, int, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._epoch = 0
+        self._paused_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def acquire(self, tokens: int, priority: int = 0) -> _Ticket:
+        """Waits until a request estimated at `tokens` tokens may start."""
+        start = time.monotonic()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._order), tokens, future))
+        self.stats.queued += 1
+        self.stats.peak_queued = max(self.stats.peak_queued, len(self._waiting))
+        self._admit()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as it was cancelled: hand the slot back.
+                self.in_flight -= 1
+                self._admit()
+            else:
+                self._waiting = [entry for entry in self._waiting if entry[3] is not future]
+                heapq.heapify(self._waiting)
+            raise
+        self.stats.queue_seconds += time.monotonic() - start
+        return _Ticket(tokens, self._epoch, time.monotonic())
+
+    def release(
+        self,
+        ticket: _Ticket,
+        *,
+        used_tokens: int | None = None,
+        latency: float | None = None,
+        rate_limited: bool = False,
+        retry_after: float | None = None,
+    ) -> None:
+        """Reports how an admitted request went and frees its slot."""
+        self.in_flight -= 1
+        if self._tokens is not None and used_tokens is not None:
+            self._tokens.take(used_tokens - ticket.tokens)
+
+        target = self.limits.latency_target
+        slow = latency is not None and target is not None and latency > target
+        if rate_limited:
+            self.stats.rate_limited += 1
+            pause = retry_after if retry_after is not None else self.limits.retry_delay
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        elif slow:
+            self.stats.slow += 1
+
+        if rate_limited or slow:
+            if ticket.epoch == self._epoch:
+                self._epoch += 1
+                self.concurrency = max(
+                    float(self.limits.min_concurrency),
+                    self.concurrency * self.limits.decrease_factor,
+                )
+        else:
+            self.concurrency = min(
+                float(self.limits.max_concurrency), self.concurrency + 1 / self.concurrency
+            )
+        self._admit()
+
+    def _admit(self) -> None:
+        now = time.monotonic()
+        wait = self._paused_until - now
+        while self._waiting and wait <= 0:
+            _, _, tokens, future = self._waiting[0]
+            if future.done():
+                heapq.heappop(self._waiting)
+                continue
+            if self.in_flight >= int(self.concurrency):
+                return
+            wait = max(
+                self._requests.wait_for(1) if self._requests else 0.0,
+                self._tokens.wait_for(tokens) if self._tokens else 0.0,
+            )
+            if wait > 0:
+                break
+            heapq.heappop(self._waiting)
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(tokens)
+            self.in_flight += 1
+            self.stats.admitted += 1
+            future.set_result(None)
+
+        if self._waiting and wait > 0 and self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(wait, self._wake)
+
+    def _wake(self) -> None:
+        self._timer = None
+        self._admit()
+
+
+def estimate_tokens(
+    system_instructions: str | None,
+    input: str | list[TResponseInputItem],
+    model_settings: ModelSettings,
+    default_output_tokens: int,
+) -> int:
+    """Input characters / 4, plus `max_tokens` or `default_output_tokens` for the output."""
+    text = input if isinstance(input, str) else json.dumps(input, default=str)
+    chars = len(text) + len(system_instructions or "")
+    return chars // 4 + (model_settings.max_tokens or default_output_tokens)
+
+
+def _retry_after(error: openai.RateLimitError) -> float | None:
+    value = error.response.headers.get("retry-after") if error.response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AdmissionModel(Model):
+    """Wraps a model so every request it makes is admitted by an `AdmissionController`.
+
+    A 429 is reported to the controller and the request queued again, up to `max_retries` times.
+    Give the client `max_retries=0` so its own retries don't hide 429s from the controller.
+    """
+
+    def __init__(self, model: Model, controller: AdmissionController, priority: int = 0) -> None:
+        self.model = model
+        self.controller = controller
+        self.priority = priority
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        limits = self.controller.limits
+        tokens = estimate_tokens(
+            system_instructions, input, model_settings, limits.default_output_tokens
+        )
+        for attempt in range(limits.max_retries + 1):
+            ticket = await self.controller.acquire(tokens, self.priority)
+            try:
+                response = await self.model.get_response(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    tracing,
+                    **kwargs,
+                )
+            except openai.RateLimitError as error:
+                self.controller.release(ticket, rate_limited=True, retry_after=_retry_after(error))
+                if attempt == limits.max_retries:
+                    raise
+                self.controller.stats.retries += 1
+                continue
+            except BaseException:
+                self.controller.release(ticket, used_tokens=ticket.tokens)
+                raise
+            self.controller.release(
+                ticket,
+                used_tokens=response.usage.total_tokens or ticket.tokens,
+                latency=time.monotonic() - ticket.admitted_at,
+            )
+            return response
+        raise AssertionError("unreachable")
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        limits = self.controller.limits
+        tokens = estimate_tokens(
+            system_instructions, input, model_settings, limits.default_output_tokens
+        )
+        for attempt in range(limits.max_retries + 1):
+            ticket = await self.controller.acquire(tokens, self.priority)
+            latency = None
+            used_tokens = ticket.tokens
+            try:
+                async for event in self.model.stream_response(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    tracing,
+                    **kwargs,
+                ):
+                    if latency is None:
+                        latency = time.monotonic() - ticket.admitted_at
+                    if event.type == "response.completed" and event.response.usage is not None:
+                        used_tokens = event.response.usage.total_tokens
+                    yield event
+            except openai.RateLimitError as error:
+                self.controller.release(ticket, rate_limited=True, retry_after=_retry_after(error))
+                # Once events have been yielded the request can't be replayed.
+                if attempt == limits.max_retries or latency is not None:
+                    raise
+                self.controller.stats.retries += 1
+                continue
+            except BaseException:
+                self.controller.release(ticket, used_tokens=used_tokens)
+                raise
+            self.controller.release(ticket, used_tokens=used_tokens, latency=latency)
+            return
+
+
+_controllers: dict[str, AdmissionController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_controller(
+    provider: str = "default", limits: AdmissionLimits | None = None
+) -> AdmissionController:
+    """The process-wide controller for `provider`, e.g. a base URL. `limits` only apply the first
+    time a provider is seen."""
+    with _controllers_lock:
+        controller = _controllers.get(provider)
+        if controller is None:
+            controller = _controllers[provider] = AdmissionController(limits)
+        return controller
+
+
+def admit_agents(
+    controller: AdmissionController,
+    *agents: Agent[Any],
+    priorities: dict[str, int] | None = None,
+) -> None:
+    """Routes the models of `agents` through `controller`, in place. `priorities` maps agent names
+    to priorities; lower is admitted first, and unlisted agents get 0.
+
+    Agents whose model is given by name, or comes from `RunConfig.model`, aren't wrapped; wrap
+    those models with `AdmissionModel` directly.
+    """
+    priorities = priorities or {}
+    for agent in agents:
+        if isinstance(agent.model, Model) and not isinstance(agent.model, AdmissionModel):
+            agent.model = AdmissionModel(agent.model, controller, priorities.get(agent.name, 0))
@@ -0,0 +1,62 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from admission import AdmissionLimits, admit_agents, get_controller
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+# max_retries=0: the controller sees every 429 and retries itself.
+client = AsyncOpenAI(api_key=api_key, base_url=BASE_URL, max_retries=0)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+config = RunConfig(model_provider = client,
+                   tracing_disabled = True
+                   )
+
+# One controller per endpoint, shared by every agent in the process.
+controller = get_controller(BASE_URL, AdmissionLimits(requests_per_minute = 15,
+                                                      tokens_per_minute = 1_000_000,
+                                                      initial_concurrency = 4,
+                                                      latency_target = 10.0))
+
+support_agent = Agent(
+    name = "Support agent",
+    instructions = "You answer customer questions in one sentence.",
+    model = model
+)
+
+summary_agent = Agent(
+    name = "Summary agent",
+    instructions = "You summarize the given text in one sentence.",
+    model = model
+)
+
+# Customer-facing requests go first when both agents are waiting.
+admit_agents(controller, support_agent, summary_agent, priorities = {"Support agent": 0, "Summary agent": 1})
+
+questions = ["How do I reset my password?", "Where is my order?", "Can I change my plan?"]
+texts = [f"Report {i}: sales grew by {i * 3}% this quarter while costs stayed flat." for i in range(10)]
+
+
+async def main():
+    runs = [Runner.run(support_agent, question, run_config = config) for question in questions]
+    runs += [Runner.run(summary_agent, text, run_config = config) for text in texts]
+    results = await asyncio.gather(*runs, return_exceptions = True)
+
+    for result in results:
+        print(result if isinstance(result, Exception) else result.final_output)
+
+    print("\n=== Admission ===")
+    print(f"Concurrency limit: {controller.concurrency:.1f}")
+    print(controller.stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
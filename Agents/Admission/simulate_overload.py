@@ -0,0 +1,80 @@
+"""Many agents sharing one overloaded endpoint, with and without an `AdmissionController`.
+
+Starts `StubServer`, which serves `CAPACITY` requests at a time and answers the rest with 429s,
+then runs `RUNS` one-shot runs at once against it, split between a high and a low priority agent.
+Without a controller the OpenAI client retries 429s with its own backoff; with one, the
+controller queues requests and finds the server's capacity itself.
+
+    python simulate_overload.py
+"""
+
+import asyncio
+import statistics
+import time
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner
+from agents.run import RunConfig
+
+from admission import AdmissionController, AdmissionLimits, admit_agents
+from stub_server import StubServer
+
+CAPACITY = 8
+RUNS = 200
+
+
+def make_agents(server: StubServer, max_retries: int) -> tuple[Agent, Agent]:
+    client = AsyncOpenAI(api_key="stub", base_url=server.base_url, max_retries=max_retries)
+    model = OpenAIChatCompletionsModel(model="stub", openai_client=client)
+    interactive = Agent(name="Interactive agent", instructions="Answer briefly.", model=model)
+    background = Agent(name="Background agent", instructions="Answer briefly.", model=model)
+    return interactive, background
+
+
+async def timed_run(agent: Agent, config: RunConfig) -> float | None:
+    start = time.perf_counter()
+    try:
+        await Runner.run(agent, "What is the weather?", run_config=config)
+    except Exception:
+        return None
+    return time.perf_counter() - start
+
+
+async def scenario(name: str, controller: AdmissionController | None) -> None:
+    server = StubServer(capacity=CAPACITY, latency=0.1, retry_after=0.2).start()
+    interactive, background = make_agents(server, max_retries=0 if controller else 5)
+    if controller is not None:
+        priorities = {"Interactive agent": 0, "Background agent": 1}
+        admit_agents(controller, interactive, background, priorities=priorities)
+    config = RunConfig(tracing_disabled=True)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(timed_run(interactive if i % 4 == 0 else background, config) for i in range(RUNS))
+    )
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    for label, picked in (("interactive", results[::4]), ("all", results)):
+        done = sorted(r for r in picked if r is not None)
+        failed = len(picked) - len(done)
+        p50 = statistics.median(done) if done else float("nan")
+        p99 = done[int(len(done) * 0.99) - 1] if done else float("nan")
+        print(
+            f"{name:<12} {label:<12} {elapsed:>7.2f}s {p50:>7.2f}s {p99:>7.2f}s"
+            f" {failed:>7} {server.rejected:>7}"
+        )
+    if controller is not None:
+        print(f"{'':<12} concurrency settled at {controller.concurrency:.1f}: {controller.stats}")
+
+
+async def main() -> None:
+    print(
+        f"{'scenario':<12} {'runs':<12} {'wall':>8} {'p50':>8} {'p99':>8}"
+        f" {'failed':>7} {'429s':>7}"
+    )
+    await scenario("client only", None)
+    await scenario("admission", AdmissionController(AdmissionLimits(initial_concurrency=16)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""A local stand-in for an OpenAI-compatible chat completions endpoint that gets overloaded.
+
+It serves up to `capacity` requests at a time, each taking `latency` seconds (plus `slowdown`
+seconds for every request in flight beyond half the capacity), and answers anything past
+`capacity` with a 429 and a `Retry-After` header.
+
+    python stub_server.py --port 8765 --capacity 8
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int = 0,
+        capacity: int = 8,
+        latency: float = 0.1,
+        slowdown: float = 0.05,
+        retry_after: float = 0.5,
+    ) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.capacity = capacity
+        self.latency = latency
+        self.slowdown = slowdown
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.served = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1/"
+
+    def start(self) -> "StubServer":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubServer
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            if server.in_flight >= server.capacity:
+                server.rejected += 1
+                busy = True
+            else:
+                server.in_flight += 1
+                busy = False
+                overload = max(server.in_flight - server.capacity // 2, 0)
+        if busy:
+            error = {"error": {"message": "Rate limit exceeded", "type": "rate_limit_error"}}
+            self._send(429, error, {"Retry-After": str(server.retry_after)})
+            return
+        try:
+            time.sleep(server.latency + overload * server.slowdown)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+                server.served += 1
+        self._send(200, _completion())
+
+    def _send(self, status: int, body: dict, headers: dict[str, str] | None = None) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def _completion() -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "stub",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "The weather is sunny."},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 40, "completion_tokens": 8, "total_tokens": 48},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+    server = StubServer(args.port, args.capacity, args.latency)
+    print(f"Serving on {server.base_url}")
+    server.serve_forever()
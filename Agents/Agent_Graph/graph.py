@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from agents import Agent, FunctionTool, Handoff, RunContextWrapper, handoff
+from agents.exceptions import UserError
+
+
+@dataclass(frozen=True)
+class AgentNode:
+    """One agent of a compiled graph, with the handoffs the runner would otherwise rebuild."""
+
+    agent: Agent[Any]
+    """The compiled clone of `source`, which the graph runs."""
+
+    source: Agent[Any]
+    """The agent passed to `compile_graph`. It is left unchanged."""
+
+    handoffs: tuple[Handoff, ...]
+    """The agent's handoffs, built once. Also assigned to `agent.handoffs`."""
+
+    routes: Mapping[str, Agent[Any]]
+    """The compiled agent each handoff tool name leads to, for handoffs whose target is known."""
+
+
+@dataclass(frozen=True)
+class AgentGraph:
+    """An immutable routing table for a graph of agents, built by `compile_graph`."""
+
+    entry: Agent[Any]
+    """The compiled entry agent. Pass it to `Runner.run`."""
+
+    nodes: tuple[AgentNode, ...]
+    cycles: tuple[tuple[str, ...], ...]
+    """Handoff cycles, as agent names. Triage graphs that hand back to the triage agent have one."""
+
+    def node(self, agent: Agent[Any]) -> AgentNode:
+        """The node of `agent`, which can be a compiled agent or the agent it was compiled from."""
+        for node in self.nodes:
+            if node.agent is agent or node.source is agent:
+                return node
+        raise KeyError(f"Agent {agent.name!r} is not part of this graph")
+
+    def route(self, agent: Agent[Any], tool_name: str) -> Agent[Any]:
+        """Returns the compiled agent that `agent` hands off to through `tool_name`."""
+        return self.node(agent).routes[tool_name]
+
+
+def compile_graph(
+    entry: Agent[Any],
+    *agents: Agent[Any],
+    require_model: bool = False,
+    allow_cycles: bool = True,
+) -> AgentGraph:
+    """Walks the agent graph reachable from `entry` once, validates it and freezes it.
+
+    The graph is compiled into clones of its agents, so the agents passed in are never changed;
+    run `graph.entry`. Every handoff given as a bare `Agent` is turned into its `Handoff` once
+    and given to the clone, so the runner reuses it instead of building the handoff and its JSON
+    schema again on every turn. Handoffs made with `handoff()` do not record their target agent,
+    so pass their targets in `agents` to have them compiled too; they are matched by name, and
+    the handoff is pointed at the compiled target.
+
+    Raises `UserError`, before anything is cloned, if two tools or handoffs of one agent share a
+    name, if an agent has no model and `require_model` is true (leave it off when the model comes
+    from `RunConfig.model`), or if the graph has a cycle and `allow_cycles` is false.
+    """
+    known = _agents_by_name(entry, agents)
+    order: list[Agent[Any]] = []
+    edges: dict[int, list[Agent[Any]]] = {}
+    pending = [entry, *agents]
+    seen: set[int] = set()
+
+    while pending:
+        agent = pending.pop()
+        if id(agent) in seen:
+            continue
+        seen.add(id(agent))
+        order.append(agent)
+        targets = edges[id(agent)] = []
+        for item in agent.handoffs:
+            if isinstance(item, Agent):
+                targets.append(item)
+            elif isinstance(item, Handoff) and item.agent_name in known:
+                targets.append(known[item.agent_name])
+        pending.extend(targets)
+
+    cycles = _find_cycles(order, edges)
+    if cycles and not allow_cycles:
+        raise UserError(f"Agent graph has handoff cycles: {cycles}")
+    for agent in order:
+        _validate(agent, require_model)
+
+    # Every clone exists before any handoff is built, so handoffs can lead to clones in cycles.
+    clones = {id(agent): agent.clone() for agent in order}
+    nodes = tuple(_compile_node(agent, clones, known) for agent in order)
+    return AgentGraph(entry=clones[id(entry)], nodes=nodes, cycles=cycles)
+
+
+def _agents_by_name(entry: Agent[Any], agents: Iterable[Agent[Any]]) -> dict[str, Agent[Any]]:
+    by_name: dict[str, Agent[Any]] = {}
+    for agent in (entry, *agents):
+        if by_name.setdefault(agent.name, agent) is not agent:
+            raise UserError(f"Two different agents are named {agent.name!r}")
+    return by_name
+
+
+def _validate(agent: Agent[Any], require_model: bool) -> None:
+    if require_model and agent.model is None:
+        raise UserError(f"Agent {agent.name!r} has no model")
+    names = [tool.name for tool in agent.tools if isinstance(tool, FunctionTool)]
+    names += [
+        item.tool_name if isinstance(item, Handoff) else Handoff.default_tool_name(item)
+        for item in agent.handoffs
+    ]
+    seen: set[str] = set()
+    for name in names:
+        if name in seen:
+            raise UserError(f"Agent {agent.name!r} has two tools or handoffs named {name!r}")
+        seen.add(name)
+
+
+def _compile_node(
+    agent: Agent[Any], clones: Mapping[int, Agent[Any]], known: Mapping[str, Agent[Any]]
+) -> AgentNode:
+    handoffs: list[Handoff] = []
+    routes: dict[str, Agent[Any]] = {}
+    for item in agent.handoffs:
+        if isinstance(item, Agent):
+            target = clones[id(item)]
+            item = handoff(target)
+        elif item.agent_name in known:
+            target = clones[id(known[item.agent_name])]
+            item = _redirect(item, target)
+        else:
+            handoffs.append(item)
+            continue
+        handoffs.append(item)
+        routes[item.tool_name] = target
+
+    clone = clones[id(agent)]
+    clone.handoffs = list(handoffs)
+    return AgentNode(
+        agent=clone, source=agent, handoffs=tuple(handoffs), routes=MappingProxyType(routes)
+    )
+
+
+def _redirect(item: Handoff, target: Agent[Any]) -> Handoff:
+    """`item`, handing off to `target` instead of the agent it was built for. Its input
+    validation and `on_handoff` callback still run."""
+
+    async def on_invoke_handoff(context: RunContextWrapper[Any], input_json: str) -> Agent[Any]:
+        await item.on_invoke_handoff(context, input_json)
+        return target
+
+    return dataclasses.replace(item, on_invoke_handoff=on_invoke_handoff)
+
+
+def _find_cycles(
+    order: list[Agent[Any]], edges: dict[int, list[Agent[Any]]]
+) -> tuple[tuple[str, ...], ...]:
+    cycles: list[tuple[str, ...]] = []
+    state: dict[int, int] = {}  # 1 while on the current path, 2 once fully explored
+    path: list[Agent[Any]] = []
+
+    def visit(agent: Agent[Any]) -> None:
+        state[id(agent)] = 1
+        path.append(agent)
+        for target in edges.get(id(agent), ()):
+            if state.get(id(target)) == 1:
+                start = next(i for i, a in enumerate(path) if a is target)
+                cycles.append(tuple(a.name for a in path[start:]) + (target.name,))
+            elif id(target) not in state:
+                visit(target)
+        path.pop()
+        state[id(agent)] = 2
+
+    for agent in order:
+        if id(agent) not in state:
+            visit(agent)
+    return tuple(cycles)
@@ -0,0 +1,46 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from graph import compile_graph
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   )
+
+spanish_agent = Agent(name="spanish_agent", instructions="You are a helpful assistant, who guide user whenever they want to talk in spanish language.", model = model)
+
+urdu_agent = Agent(name="urdu_agent", instructions="You are a helpful assistant, who guide user whenever they want to talk in urdu language.", model = model)
+
+triage_agent = Agent(name = "Assistant", instructions="Be a helpful assistant. If the user wants to speak Spanish, handoff to the Spanish assistant. If the user wants to speak Urdu, handoff to the Urdu assistant.", model = model, handoffs = [spanish_agent, urdu_agent])
+
+# Built once at startup: validates the graph and prebuilds every handoff, so the runner reuses
+# them on every turn.
+graph = compile_graph(triage_agent)
+
+async def main():
+    for node in graph.nodes:
+        print(f"{node.agent.name}: routes to {list(node.routes) or 'nothing'}")
+
+    while True:
+
+        user_input = input ("How may I help you today: " )
+
+        result = await Runner.run(graph.entry, input = user_input, run_config = config)
+
+        print(f"{result.last_agent.name}: ", str(result.final_output).strip())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
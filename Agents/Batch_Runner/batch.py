@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import random
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import openai
+from agents import (
+    Agent,
+    AgentOutputSchema,
+    AgentOutputSchemaBase,
+    AsyncOpenAI,
+    RunConfig,
+    Runner,
+    RunResult,
+    TResponseInputItem,
+    Usage,
+)
+from agents.exceptions import UserError
+from agents.models.chatcmpl_converter import Converter
+from agents.run import DEFAULT_MAX_TURNS
+
+BatchInput = str | list[TResponseInputItem]
+
+
+@dataclass(frozen=True)
+class BatchLimits:
+    """Rate limits shared by every run of one `run_many` call. Unlimited if `None`."""
+
+    requests_per_minute: float | None = None
+    """Runs started per minute. A run with several turns still counts once."""
+
+    tokens_per_minute: float | None = None
+    """Tokens per minute. A run is admitted on an estimate, its input length in characters / 4
+    plus `ModelSettings.max_tokens`, which is then corrected with the run's actual usage."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    """Attempts per input, including the first."""
+
+    base_delay: float = 1.0
+    """Seconds before the first retry. Doubles with every attempt, up to `max_delay`."""
+
+    max_delay: float = 30.0
+
+    retry_on: tuple[type[BaseException], ...] = (
+        openai.RateLimitError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+    """Errors worth another attempt. Anything else fails the input at once."""
+
+    def delay(self, attempt: int) -> float:
+        """A random delay up to the backoff for `attempt`, so retries don't arrive together."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class BatchItem:
+    """The outcome of one input. Exactly one of `final_output` and `error` is meaningful."""
+
+    index: int
+    """The input's position in `inputs`."""
+
+    input: BatchInput
+    final_output: Any = None
+    error: BaseException | None = None
+    usage: Usage = field(default_factory=Usage)
+    attempts: int = 0
+    duration: float = 0.0
+    """Seconds from the first attempt to the last, including backoff."""
+
+    result: RunResult | None = None
+    """The full run result. `None` for failed inputs and for provider batches."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchStats:
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    usage: Usage = field(default_factory=Usage)
+    """The usage of every completed input, added up."""
+
+    def add(self, item: BatchItem) -> None:
+        if item.ok:
+            self.completed += 1
+            self.usage.add(item.usage)
+        else:
+            self.failed += 1
+        self.retries += max(item.attempts - 1, 0)
+
+
+class _MinuteBucket:
+    """A token bucket that refills `per_minute` tokens a minute and holds at most that many."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def take(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Takes `amount` more tokens (or returns them, if negative) without waiting."""
+        self._refill()
+        self.tokens = min(self.tokens - amount, self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+def _estimate_tokens(input: BatchInput, max_tokens: int | None) -> int:
+    text = input if isinstance(input, str) else json.dumps(input, default=str)
+    return len(text) // 4 + (max_tokens or 0)
+
+
+def _prepare(
+    agent: Agent[Any], run_config: RunConfig | None
+) -> tuple[Agent[Any], RunConfig]:
+    """Builds the agent and `RunConfig` every run shares, with model names resolved to `Model`s
+    once instead of once per run."""
+    config = run_config or RunConfig()
+    if isinstance(config.model, str):
+        config = dataclasses.replace(config, model=config.model_provider.get_model(config.model))
+    elif config.model is None and isinstance(agent.model, str):
+        agent = agent.clone(model=config.model_provider.get_model(agent.model))
+    return agent, config
+
+
+async def run_many(
+    agent: Agent[Any],
+    inputs: Iterable[BatchInput],
+    *,
+    concurrency: int = 16,
+    run_config: RunConfig | None = None,
+    context: Any = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    limits: BatchLimits | None = None,
+    retry: RetryPolicy | None = None,
+    stats: BatchStats | None = None,
+) -> AsyncIterator[BatchItem]:
+    """Runs `agent` once per input, `concurrency` runs at a time, and yields each `BatchItem` as
+    soon as its run finishes, so results arrive in completion order rather than input order.
+
+    Every run shares one `RunConfig` and therefore one model and client. An input that still fails
+    after `retry.max_attempts` is yielded with its `error` set instead of ending the batch. Pass a
+    `BatchStats` to have completed, failed and retried inputs and the total `Usage` added up.
+
+    `inputs` is read lazily, so it can be a generator over more inputs than fit in memory. If
+    reading it raises, `run_many` raises that error after yielding the inputs read before it.
+    Leaving the `async for` early cancels the runs still in flight.
+    """
+    agent, config = _prepare(agent, run_config)
+    limits = limits or BatchLimits()
+    retry = retry or RetryPolicy()
+    settings = agent.model_settings.resolve(config.model_settings)
+    requests = _MinuteBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+    tokens = _MinuteBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+
+    pending = enumerate(inputs)
+    # Items, then one `None` from each worker when it's done, or the error that stopped it.
+    done: asyncio.Queue[BatchItem | Exception | None] = asyncio.Queue(maxsize=concurrency)
+
+    async def run_one(index: int, input: BatchInput) -> BatchItem:
+        item = BatchItem(index=index, input=input)
+        start = time.monotonic()
+        estimate = _estimate_tokens(input, settings.max_tokens)
+        while True:
+            item.attempts += 1
+            if requests is not None:
+                await requests.take(1)
+            if tokens is not None:
+                await tokens.take(estimate)
+            try:
+                result = await Runner.run(
+                    agent, input, context=context, max_turns=max_turns, run_config=config
+                )
+            except retry.retry_on as error:
+                if item.attempts >= retry.max_attempts:
+                    item.error = error
+                    break
+                await asyncio.sleep(retry.delay(item.attempts))
+            except Exception as error:
+                item.error = error
+                break
+            else:
+                item.result = result
+                item.final_output = result.final_output
+                item.usage = result.context_wrapper.usage
+                if tokens is not None:
+                    tokens.adjust(item.usage.total_tokens - estimate)
+                break
+        item.duration = time.monotonic() - start
+        return item
+
+    async def worker() -> None:
+        error: Exception | None = None
+        try:
+            for index, input in pending:
+                await done.put(await run_one(index, input))
+        except Exception as exception:
+            # Only reading `inputs` can raise: `run_one` turns run errors into failed items.
+            error = exception
+        finally:
+            # Skipped when cancelled, since then nothing reads the queue any more.
+            if not asyncio.current_task().cancelling():
+                await done.put(error)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        error: Exception | None = None
+        while running:
+            item = await done.get()
+            if item is None or isinstance(item, Exception):
+                running -= 1
+                error = error or item
+                continue
+            if stats is not None:
+                stats.add(item)
+            yield item
+        if error is not None:
+            raise error
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def run_provider_batch(
+    agent: Agent[Any],
+    inputs: Iterable[BatchInput],
+    *,
+    client: AsyncOpenAI,
+    model: str,
+    poll_interval: float = 60.0,
+    stats: BatchStats | None = None,
+) -> AsyncIterator[BatchItem]:
+    """Runs one-shot inputs through the provider's Batch API, for offline jobs that can wait.
+
+    Batches are priced lower than live requests, but finish within a completion window of up to
+    24 hours and can't call tools, so only agents without tools or handoffs and with plain string
+    instructions are accepted. Each input is a single chat completion; structured `output_type`s
+    are requested as JSON and validated like a normal run's final output.
+
+    Yields nothing until the whole batch is done, then every item in input order.
+    """
+    if agent.tools or agent.handoffs:
+        raise UserError(f"Agent {agent.name!r} has tools or handoffs, which a batch can't run")
+    if agent.instructions is not None and not isinstance(agent.instructions, str):
+        raise UserError(f"Agent {agent.name!r} has dynamic instructions, which a batch can't run")
+
+    schema = _output_schema(agent)
+    body = _request_body(agent, model, schema)
+    inputs = list(inputs)
+    lines = []
+    for index, input in enumerate(inputs):
+        messages = Converter.items_to_messages(input)
+        if agent.instructions:
+            messages.insert(0, {"role": "system", "content": agent.instructions})
+        request = {
+            "custom_id": str(index),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {**body, "messages": messages},
+        }
+        lines.append(json.dumps(request, separators=(",", ":"), default=str))
+
+    upload = await client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode(), "application/jsonl"), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window="24h"
+    )
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+
+    items = {index: BatchItem(index=index, input=input) for index, input in enumerate(inputs)}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if file_id is None:
+            continue
+        content = await client.files.content(file_id)
+        for line in content.text.splitlines():
+            if line.strip():
+                _read_batch_line(json.loads(line), items, schema)
+
+    for index in range(len(inputs)):
+        item = items[index]
+        item.attempts = 1
+        if item.usage.requests == 0 and item.error is None:
+            item.error = UserError(f"Batch {batch.id} ended as {batch.status!r} without this input")
+        if stats is not None:
+            stats.add(item)
+        yield item
+
+
+def _output_schema(agent: Agent[Any]) -> AgentOutputSchemaBase | None:
+    if agent.output_type is None or agent.output_type is str:
+        return None
+    if isinstance(agent.output_type, AgentOutputSchemaBase):
+        return agent.output_type
+    return AgentOutputSchema(agent.output_type)
+
+
+def _request_body(
+    agent: Agent[Any], model: str, schema: AgentOutputSchemaBase | None
+) -> dict[str, Any]:
+    settings = agent.model_settings
+    body: dict[str, Any] = {"model": model}
+    for name in ("temperature", "top_p", "max_tokens", "frequency_penalty", "presence_penalty"):
+        value = getattr(settings, name)
+        if value is not None:
+            body[name] = value
+    if schema is not None and not schema.is_plain_text():
+        body["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": "final_output",
+                "strict": schema.is_strict_json_schema(),
+                "schema": schema.json_schema(),
+            },
+        }
+    return body
+
+
+def _read_batch_line(
+    line: dict[str, Any], items: dict[int, BatchItem], schema: AgentOutputSchemaBase | None
+) -> None:
+    item = items.get(int(line["custom_id"]))
+    if item is None:
+        return
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        item.error = UserError(f"Batch request failed: {line.get('error') or response}")
+        return
+    completion = response["body"]
+    usage = completion.get("usage") or {}
+    item.usage = Usage(
+        requests=1,
+        input_tokens=usage.get("prompt_tokens", 0),
+        output_tokens=usage.get("completion_tokens", 0),
+        total_tokens=usage.get("total_tokens", 0),
+    )
+    text = completion["choices"][0]["message"].get("content") or ""
+    try:
+        item.final_output = text if schema is None else schema.validate_json(text)
+    except Exception as error:
+        item.error = error
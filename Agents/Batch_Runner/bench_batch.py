@@ -0,0 +1,50 @@
+"""Wall time for N one-shot runs, awaited one after another or through `run_many`.
+
+The model is a fake that answers after `LATENCY` seconds, so the numbers show how much of the
+model's latency `run_many` overlaps, plus its own scheduling cost.
+
+    python bench_batch.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from agents import Agent, Runner, set_tracing_disabled
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "Load_Test"))
+from batch import BatchStats, run_many
+from fake_model import FakeModel, text
+
+LATENCY = 0.05
+INPUTS = 200
+
+
+async def main() -> None:
+    set_tracing_disabled(True)
+    # One scripted turn, repeated for every request, so the model can be shared by all runs.
+    model = FakeModel([text("Why did the cat sit on the computer?")], latency=LATENCY)
+    agent = Agent(name="Assistant", instructions="Tell a joke.", model=model)
+    inputs = [f"Tell me a joke about topic {i}." for i in range(INPUTS)]
+
+    start = time.perf_counter()
+    for input in inputs:
+        await Runner.run(agent, input)
+    sequential = time.perf_counter() - start
+    print(f"{'sequential':<16} {sequential:>8.2f}s")
+
+    for concurrency in (8, 32, 128):
+        stats = BatchStats()
+        start = time.perf_counter()
+        async for _ in run_many(agent, inputs, concurrency=concurrency, stats=stats):
+            pass
+        elapsed = time.perf_counter() - start
+        print(
+            f"{f'run_many({concurrency})':<16} {elapsed:>8.2f}s"
+            f"  {sequential / elapsed:>5.1f}x  {stats.usage.total_tokens} tokens"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
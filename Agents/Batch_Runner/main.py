@@ -0,0 +1,65 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+from agents import Agent, AgentOutputSchema, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from batch import BatchLimits, BatchStats, RetryPolicy, run_many
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   )
+
+
+@dataclass
+class OutputType:
+    jokes: dict[int, str]
+    """A list of jokes, indexed by joke number."""
+
+
+agent = Agent(
+    name="Assistant",
+    instructions="You are a helpful assistant.",
+    output_type=AgentOutputSchema(OutputType, strict_json_schema=False),
+    model = model
+)
+
+topics = ["cats", "programmers", "coffee", "the weather", "Mondays", "pizza", "robots", "math"]
+
+
+async def main():
+    stats = BatchStats()
+    inputs = (f"Tell me 3 short jokes about {topic}." for topic in topics)
+
+    async for item in run_many(
+        agent,
+        inputs,
+        concurrency = 4,
+        run_config = config,
+        limits = BatchLimits(requests_per_minute = 15, tokens_per_minute = 100_000),
+        retry = RetryPolicy(max_attempts = 4),
+        stats = stats,
+    ):
+        if item.ok:
+            print(f"[{topics[item.index]}] ({item.duration:.1f}s, {item.attempts} attempt(s))")
+            print(item.final_output)
+        else:
+            print(f"[{topics[item.index]}] failed: {item.error}")
+
+    print("\n=== Batch ===")
+    print(f"Completed: {stats.completed}, failed: {stats.failed}, retries: {stats.retries}")
+    print(f"Requests: {stats.usage.requests}, total tokens: {stats.usage.total_tokens}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
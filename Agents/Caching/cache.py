@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from agents import (
+    AgentOutputSchemaBase,
+    Handoff,
+    Model,
+    ModelSettings,
+    ModelTracing,
+    Tool,
+    TResponseInputItem,
+    Usage,
+)
+from agents.items import ModelResponse, TResponseOutputItem, TResponseStreamEvent
+from pydantic import TypeAdapter
+
+_output_adapter: TypeAdapter[TResponseOutputItem] = TypeAdapter(TResponseOutputItem)
+_event_adapter: TypeAdapter[TResponseStreamEvent] = TypeAdapter(TResponseStreamEvent)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """A two-tier store of model responses: an in-memory LRU in front of an optional directory of
+    JSON files.
+
+    Entries older than `ttl` seconds are treated as missing. The disk tier deletes its oldest
+    files once it grows past `max_disk_bytes`. File sizes are tracked in memory from when the
+    cache is created, so a write doesn't list the directory; other processes' writes to the same
+    directory are only counted after a restart.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        directory: str | Path | None = None,
+        ttl: float | None = None,
+        max_disk_bytes: int = 100 * 1024 * 1024,
+    ) -> None:
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Oldest first, from the files' modification times.
+            files = sorted(
+                (path.stat().st_mtime_ns, path.name, path.stat().st_size)
+                for path in self.directory.glob("*.json")
+            )
+            self._files.update((name, size) for _, name, size in files)
+            self._disk_bytes = sum(self._files.values())
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and not self._expired(entry[0]):
+                self._memory.move_to_end(key)
+                self.stats.hits += 1
+                return entry[1]
+            self._memory.pop(key, None)
+
+        entry = self._read(key)
+        with self._lock:
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            self._remember(key, entry)
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        entry = (time.time(), value)
+        with self._lock:
+            self._remember(key, entry)
+        self._write(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._files.clear()
+            self._disk_bytes = 0
+        if self.directory is not None:
+            for path in self.directory.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _remember(self, key: str, entry: tuple[float, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> tuple[float, Any] | None:
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if self._expired(data["created"]):
+            with self._lock:
+                self._forget(path.name)
+            path.unlink(missing_ok=True)
+            return None
+        return data["created"], data["value"]
+
+    def _write(self, key: str, entry: tuple[float, Any]) -> None:
+        if self.directory is None:
+            return
+        path = self.directory / f"{key}.json"
+        # A temporary file of its own per write, renamed into place, so concurrent writers of
+        # one key never interleave and readers never see a partial file.
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(json.dumps({"created": entry[0], "value": entry[1]}))
+        size = os.path.getsize(tmp.name)
+        with self._lock:
+            # Renamed under the lock, so the recorded size is that of the file that won.
+            os.replace(tmp.name, path)
+            self._forget(path.name)
+            self._files[path.name] = size
+            self._disk_bytes += size
+            self._evict_disk()
+
+    def _forget(self, name: str) -> None:
+        self._disk_bytes -= self._files.pop(name, 0)
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes and self._files:
+            name, size = self._files.popitem(last=False)
+            (self.directory / name).unlink(missing_ok=True)
+            self._disk_bytes -= size
+
+
+def cache_key(
+    model: str,
+    system_instructions: str | None,
+    input: str | list[TResponseInputItem],
+    model_settings: ModelSettings,
+    tools: list[Tool],
+    output_schema: AgentOutputSchemaBase | None,
+    handoffs: list[Handoff],
+    previous_response_id: str | None = None,
+) -> str:
+    """A stable hash of everything that determines a model's response."""
+    payload = {
+        "model": model,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": model_settings.to_json_dict(),
+        "tools": [_tool_key(tool) for tool in tools],
+        "output_schema": (
+            None
+            if output_schema is None or output_schema.is_plain_text()
+            else [output_schema.name(), output_schema.json_schema()]
+        ),
+        "handoffs": [[handoff.tool_name, handoff.input_json_schema] for handoff in handoffs],
+        "previous_response_id": previous_response_id,
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _tool_key(tool: Tool) -> Any:
+    schema = getattr(tool, "params_json_schema", None)
+    return [type(tool).__name__, tool.name, getattr(tool, "description", None), schema]
+
+
+class CachingModel(Model):
+    """Wraps a model so identical requests are answered from a `ResponseCache`.
+
+    Responses are keyed on `cache_key`, so a change to the model, instructions, settings, tools,
+    output schema or input is a miss. Streamed responses are recorded event by event and replayed
+    in the same order, and are only stored once the stream completes.
+
+    A `Runner.run` hit returns an empty `Usage`, so `result.context_wrapper.usage` only counts
+    requests that reached the model. A replayed stream keeps the usage of the original
+    `response.completed` event. Hit and miss counts are in `cache.stats`.
+    """
+
+    def __init__(self, model: Model, model_name: str, cache: ResponseCache | None = None) -> None:
+        self.model = model
+        self.model_name = model_name
+        self.cache = cache or ResponseCache()
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        key = "response-" + cache_key(
+            self.model_name,
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            kwargs.get("previous_response_id"),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return ModelResponse(
+                output=[_output_adapter.validate_python(item) for item in cached["output"]],
+                usage=Usage(),
+                response_id=cached["response_id"],
+            )
+
+        response = await self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            **kwargs,
+        )
+        self.cache.set(
+            key,
+            {
+                "output": [item.model_dump(exclude_unset=True) for item in response.output],
+                "response_id": response.response_id,
+            },
+        )
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        key = "stream-" + cache_key(
+            self.model_name,
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            kwargs.get("previous_response_id"),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            for event in cached:
+                yield _event_adapter.validate_python(event)
+            return
+
+        events: list[dict[str, Any]] = []
+        completed = False
+        async for event in self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            **kwargs,
+        ):
+            events.append(event.model_dump(exclude_unset=True))
+            completed = completed or event.type == "response.completed"
+            yield event
+        if completed:
+            self.cache.set(key, events)
@@ -0,0 +1,44 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, ModelSettings, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from cache import CachingModel, ResponseCache
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+# Identical requests are answered from memory, or from `.cache/` after a restart, for a day.
+cache = ResponseCache(max_entries = 256, directory = ".cache", ttl = 24 * 60 * 60)
+
+model = CachingModel(
+    OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client),
+    model_name = "gemini-2.0-flash",
+    cache = cache,
+)
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   )
+
+agent = Agent(name="Assistant", instructions="You are a helpful assistant.", model = model, model_settings = ModelSettings(temperature = 0))
+
+async def main():
+    input = "Tell me 3 short jokes."
+
+    # The second run is a cache hit and makes no request.
+    for _ in range(2):
+        result = await Runner.run(agent, input, run_config = config)
+        print(result.final_output)
+        print(f"(requests: {result.context_wrapper.usage.requests})")
+
+    print(f"Cache hits: {cache.stats.hits}, misses: {cache.stats.misses}, hit rate: {cache.stats.hit_rate:.0%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
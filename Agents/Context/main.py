@@ -43,7 +43,7 @@ async def main():
         
         result = await Runner.run(agent, input = history, run_config = config, context = AgentContext(clientId = "123", clientName = "John Doe", clientPhone = "1234567890"))
         
-        print(f"Response: ", result.to_input_list()[-1]['content'][0]['text'].strip())
+        print(f"Response: ", str(result.final_output).strip())
   
         ##### 1st Method
         # --------------------------------------------------------------------------
@@ -0,0 +1,94 @@
+"""Run latency with a slow async instructions function, plain, cached, and cached + prefetched.
+
+The instructions take `RENDER_SECONDS` to render, like a profile lookup plus a template, and the
+caller spends `PREPARE_SECONDS` preparing input (e.g. loading history) before each run. The model
+is a fake that calls one tool and then answers, so each run has two turns.
+
+    python bench_instructions.py
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from agents import Agent, RunContextWrapper, Runner, function_tool
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "Load_Test"))
+from fake_model import FakeModel, text, tool_call
+from providers import instruction_provider, prefetch_instructions
+
+RENDER_SECONDS = 0.02
+PREPARE_SECONDS = 0.02
+RUNS = 50
+STYLES = ["haiku", "pirate", "robot", "None"]
+
+
+class CustomContext:
+    def __init__(self, style: str):
+        self.style = style
+
+
+@function_tool
+def get_weather_tool() -> str:
+    """Get the weather."""
+    return "FAisalabad weather is sunny!"
+
+
+def make_model() -> FakeModel:
+    """A model that calls `get_weather_tool` once, then answers."""
+    return FakeModel([tool_call("get_weather_tool"), text("Sunny!")])
+
+
+async def render(
+    run_context: RunContextWrapper[CustomContext], agent: Agent[CustomContext]
+) -> str:
+    # Stands in for a profile lookup and template rendering.
+    await asyncio.sleep(RENDER_SECONDS)
+    return f"Respond in the style: {run_context.context.style}."
+
+
+async def median_ms(agent: Agent[CustomContext], prefetch: bool) -> float:
+    latencies = []
+    for i in range(RUNS):
+        context = CustomContext(STYLES[i % len(STYLES)])
+        start = time.perf_counter()
+        if prefetch:
+            prefetch_instructions(context, agent)
+        await asyncio.sleep(PREPARE_SECONDS)
+        # A new model per run, since a `FakeModel` replays its script once.
+        run_agent = agent.clone(model=make_model())
+        await Runner.run(run_agent, [{"role": "user", "content": "Weather?"}], context=context)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1e3
+
+
+async def main() -> None:
+    plain = Agent(name="Chat agent", instructions=render, tools=[get_weather_tool])
+    print(f"{'instructions':<22} {'median run (ms)':>16} {'hit rate':>9}")
+    print(f"{'plain':<22} {await median_ms(plain, prefetch=False):>16.1f}")
+
+    for name, prefetch in (("cached", False), ("cached + prefetched", True)):
+        instructions = instruction_provider(render, key=lambda context: context.style)
+        agent = plain.clone(instructions=instructions)
+        ms = await median_ms(agent, prefetch)
+        print(f"{name:<22} {ms:>16.1f} {instructions.provider.stats.hit_rate:>9.0%}")
+
+    # A fresh cache on every run: prefetching alone, overlapping the render with input preparation.
+    latencies = []
+    for i in range(RUNS):
+        instructions = instruction_provider(render, key=lambda context: context.style)
+        agent = plain.clone(instructions=instructions, model=make_model())
+        context = CustomContext(STYLES[i % len(STYLES)])
+        start = time.perf_counter()
+        prefetch_instructions(context, agent)
+        await asyncio.sleep(PREPARE_SECONDS)
+        await Runner.run(agent, [{"role": "user", "content": "Weather?"}], context=context)
+        latencies.append(time.perf_counter() - start)
+    ms = statistics.median(latencies) * 1e3
+    print(f"{'cold + prefetched':<22} {ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,6 +9,8 @@ from agents.run import RunConfig
 from pydantic import BaseModel
 import asyncio
 
+from providers import instruction_provider, prefetch_instructions
+
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
 
@@ -28,7 +30,9 @@ class CustomContext:
         self.style = style
 
 
-def custom_instructions(
+# Cached per style for 10 minutes; the system prompt is only rendered again when the style changes.
+@instruction_provider(key=lambda context: context.style, ttl=600)
+async def custom_instructions(
     run_context: RunContextWrapper[CustomContext], agent: Agent[CustomContext]
 ) -> str:
     context = run_context.context
@@ -57,13 +61,18 @@ async def main():
         context = CustomContext(style=choice)
         print(f"Using style: {choice}\n")
 
-        user_message = input("Tell me what you want?: ")
+        # Render the system prompt while the user types.
+        prefetch_instructions(context, agent)
+        user_message = await asyncio.to_thread(input, "Tell me what you want?: ")
         print(f"User: {user_message}")
         
         history.append({"role": "user", "content": user_message})
         result = await Runner.run(agent, history, context=context, run_config=config)
 
-        print(f"Assistant: {result.to_input_list()[-1]['content'][0]['text'].strip()}")
+        print(f"Assistant: {str(result.final_output).strip()}")
+
+        stats = custom_instructions.provider.stats
+        print(f"Instructions: {stats.hit_rate:.0%} hit rate, {stats.mean_render_seconds:.2f}s per render\n")
 
 
 if __name__ == "__main__":
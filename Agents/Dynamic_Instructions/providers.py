@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from agents import Agent, RunContextWrapper
+
+TContext = TypeVar("TContext")
+
+InstructionsFunction = Callable[[RunContextWrapper[Any], Agent[Any]], str | Awaitable[str]]
+
+
+@dataclass
+class ProviderStats:
+    calls: int = 0
+    """Times the runner asked for instructions."""
+
+    hits: int = 0
+    """Calls answered from the cache or by joining a render already in flight."""
+
+    renders: int = 0
+    prefetches: int = 0
+    """Renders started by `prefetch_instructions` rather than by the runner."""
+
+    render_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+    @property
+    def mean_render_seconds(self) -> float:
+        return self.render_seconds / self.renders if self.renders else 0.0
+
+
+class InstructionProvider(Generic[TContext]):
+    """Caches the system prompts an instructions function renders.
+
+    The cache key is the agent's name plus `key(context)`, where `context` is the run's context
+    object, so declare in `key` every context field the prompt depends on. Entries expire after
+    `ttl` seconds, if set, and the least recently used go once there are more than `max_entries`.
+    Without a `key`, nothing is cached and the provider only records stats.
+
+    Async renders are single-flight: a call that finds a render of the same key in flight, e.g.
+    one started by `prefetch_instructions`, waits for it instead of starting another.
+    """
+
+    def __init__(
+        self,
+        render: InstructionsFunction,
+        key: Callable[[TContext], Hashable] | None = None,
+        ttl: float | None = None,
+        max_entries: int = 256,
+    ) -> None:
+        self.render = render
+        self.key = key
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.name = getattr(render, "__name__", type(render).__name__)
+        self.stats = ProviderStats()
+        self._cache: OrderedDict[Hashable, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Future[str]] = {}
+
+    def instructions_for(self, run_context: RunContextWrapper[TContext], agent: Agent[Any]) -> str:
+        """Sync renders: the prompt for this context, from the cache if possible."""
+        self.stats.calls += 1
+        key = self._key(run_context, agent)
+        cached = self._get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+        start = time.perf_counter()
+        prompt = self.render(run_context, agent)
+        self._rendered(key, prompt, start)
+        return prompt
+
+    async def ainstructions_for(
+        self, run_context: RunContextWrapper[TContext], agent: Agent[Any]
+    ) -> str:
+        """Async renders: the prompt for this context, from the cache or an in-flight render if
+        possible."""
+        self.stats.calls += 1
+        key = self._key(run_context, agent)
+        cached = self._get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+        future = self._in_flight.get(key) if key is not None else None
+        if future is not None:
+            self.stats.hits += 1
+        else:
+            future = self._start(run_context, agent, key)
+        # Shielded, so a cancelled run doesn't cancel a render other runs are waiting for.
+        return await asyncio.shield(future)
+
+    def prefetch(
+        self, run_context: RunContextWrapper[TContext], agent: Agent[Any]
+    ) -> asyncio.Future[str] | None:
+        """Starts rendering the prompt for this context in the background, unless it's cached or
+        already being rendered. Returns the render, or `None` if the prompt is cached or there's
+        no `key` to find the render by."""
+        key = self._key(run_context, agent)
+        if key is None or self._get(key) is not None:
+            return None
+        future = self._in_flight.get(key)
+        if future is None:
+            self.stats.prefetches += 1
+            future = self._start(run_context, agent, key)
+        return future
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _key(
+        self, run_context: RunContextWrapper[TContext], agent: Agent[Any]
+    ) -> Hashable | None:
+        if self.key is None:
+            return None
+        return (agent.name, self.key(run_context.context))
+
+    def _get(self, key: Hashable | None) -> str | None:
+        if key is None:
+            return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1]
+
+    def _start(
+        self, run_context: RunContextWrapper[TContext], agent: Agent[Any], key: Hashable | None
+    ) -> asyncio.Future[str]:
+        async def render() -> str:
+            start = time.perf_counter()
+            prompt = await self.render(run_context, agent)
+            self._rendered(key, prompt, start)
+            return prompt
+
+        def settle(task: asyncio.Future[str]) -> None:
+            self._in_flight.pop(key, None)
+            # Mark the error as retrieved: a prefetch nobody ended up awaiting shouldn't warn.
+            if not task.cancelled():
+                task.exception()
+
+        task = asyncio.ensure_future(render())
+        if key is not None:
+            self._in_flight[key] = task
+        task.add_done_callback(settle)
+        return task
+
+    def _rendered(self, key: Hashable | None, prompt: str, start: float) -> None:
+        self.stats.renders += 1
+        self.stats.render_seconds += time.perf_counter() - start
+        if key is None:
+            return
+        self._cache[key] = (time.monotonic(), prompt)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+def instruction_provider(
+    func: InstructionsFunction | None = None,
+    *,
+    key: Callable[[Any], Hashable] | None = None,
+    ttl: float | None = None,
+    max_entries: int = 256,
+) -> Any:
+    """Turns an instructions function into a cached one that can still be passed as an agent's
+    `instructions`. Its `InstructionProvider`, with the cache and stats, is at `.provider`.
+
+    The function keeps its kind: a sync function stays sync and an async one stays async, which
+    is how the runner tells whether to await it.
+    """
+
+    def decorator(render: InstructionsFunction) -> InstructionsFunction:
+        provider = InstructionProvider(render, key, ttl, max_entries)
+        if inspect.iscoroutinefunction(render):
+
+            @functools.wraps(render)
+            async def wrapper(run_context: RunContextWrapper[Any], agent: Agent[Any]) -> str:
+                return await provider.ainstructions_for(run_context, agent)
+
+        else:
+
+            @functools.wraps(render)
+            def wrapper(run_context: RunContextWrapper[Any], agent: Agent[Any]) -> str:
+                return provider.instructions_for(run_context, agent)
+
+        wrapper.provider = provider  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def prefetch_instructions(context: Any, *agents: Agent[Any]) -> list[asyncio.Future[str]]:
+    """Starts rendering the async, provider-backed instructions of `agents` for `context`, so the
+    renders overlap whatever the caller does before `Runner.run`, such as loading history.
+
+    Returns the renders started or joined; there's no need to await them, since the runner picks
+    them up. Agents with other kinds of instructions are skipped.
+    """
+    run_context = RunContextWrapper(context=context)
+    renders = []
+    for agent in agents:
+        provider = getattr(agent.instructions, "provider", None)
+        if isinstance(provider, InstructionProvider) and inspect.iscoroutinefunction(
+            provider.render
+        ):
+            render = provider.prefetch(run_context, agent)
+            if render is not None:
+                renders.append(render)
+    return renders
@@ -0,0 +1,90 @@
+"""Time to filter the history of a handoff carrying 1k to 10k items.
+
+Compares the previous `spanish_handoff_message_filter`, which walked the history, joined it into a
+string and `json.dumps`-ed it with indentation for debugging, with `HandoffCompactor` stages.
+
+    python bench_compaction.py
+"""
+
+import contextlib
+import io
+import json
+import time
+
+from agents import HandoffInputData
+
+from compaction import HandoffCompactor
+
+SIZES = (1_000, 10_000)
+REPEAT = 5
+
+
+def history(size: int) -> tuple:
+    items = []
+    for n in range(size // 4):
+        items.append({"role": "user", "content": f"Question {n}, please answer briefly."})
+        items.append(
+            {
+                "type": "function_call",
+                "call_id": f"call_{n}",
+                "name": "random_number_tool",
+                "arguments": '{"max": 100}',
+            }
+        )
+        items.append({"type": "function_call_output", "call_id": f"call_{n}", "output": "42"})
+        items.append(
+            {
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": f"Answer {n}.", "annotations": []}],
+            }
+        )
+    return tuple(items)
+
+
+def previous_filter(data: HandoffInputData) -> HandoffInputData:
+    summary = []
+    for message in data.input_history:
+        if isinstance(message, dict) and "content" in message and "role" in message:
+            if message["role"] == "user":
+                summary.append(f"User: {message['content']}")
+            elif message["role"] == "assistant":
+                content = message["content"]
+                if isinstance(content, list) and len(content) > 0 and "text" in content[0]:
+                    summary.append(f"Assistant: {content[0]['text']}")
+                elif isinstance(content, str):
+                    summary.append(f"Assistant: {content}")
+    summary_text = "Summary: " + " | ".join(summary) if summary else "No relevant history."
+    summarized_history = [{"role": "system", "content": summary_text}]
+    print("input_history:", json.dumps(summarized_history, indent=2))
+    print("pre_handoff_items:", json.dumps(data.pre_handoff_items, indent=2))
+    return HandoffInputData(
+        input_history=tuple(summarized_history),
+        pre_handoff_items=tuple(data.pre_handoff_items),
+        new_items=tuple(data.new_items),
+    )
+
+
+def timed(input_filter, data: HandoffInputData) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            input_filter(data)
+    return (time.perf_counter() - start) / REPEAT * 1e3
+
+
+def main() -> None:
+    filters = {
+        "previous filter": previous_filter,
+        "drop tools": HandoffCompactor(),
+        "drop tools + 2k budget": HandoffCompactor(max_tokens=2_000),
+        "summarize all": HandoffCompactor(max_tokens=0, summarize=True),
+    }
+    print(f"{'filter':<24}" + "".join(f"{f'{size} items (ms)':>18}" for size in SIZES))
+    data = {size: HandoffInputData(history(size), (), ()) for size in SIZES}
+    for name, input_filter in filters.items():
+        row = "".join(f"{timed(input_filter, data[size]):>18.2f}" for size in SIZES)
+        print(f"{name:<24}{row}")
+
+
+if __name__ == "__main__":
+    main()
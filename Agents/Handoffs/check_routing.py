@@ -0,0 +1,136 @@
+"""Offline checks for `routing.py`: the classifiers, `PreRouter.route` and `PreRouter.run`.
+
+The agents run on `FakeModel`, imported from `Agents/Load_Test/fake_model.py`, which answers from
+a script instead of a provider and counts its calls, so the checks can tell which agents were
+called: the fast path must skip the triage agent, and every miss must fall back to it and reach
+the specialist through its handoff. Exits with an
+`AssertionError` at the first check that fails.
+
+    python check_routing.py
+"""
+
+import asyncio
+import dataclasses
+import sys
+from pathlib import Path
+
+from agents import Agent, HandoffInputData, RunConfig, handoff
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "Load_Test"))
+from fake_model import FakeModel, handoff_call, text
+from routing import PreRouter, keyword_classifier, script_classifier
+
+
+def check(name: str, condition: bool, detail: object = "") -> None:
+    assert condition, f"{name}: {detail}"
+    print(f"ok  {name}")
+
+
+def mark_filtered(data: HandoffInputData) -> HandoffInputData:
+    marker = {"role": "system", "content": "filtered"}
+    return dataclasses.replace(data, input_history=(marker, *data.input_history))
+
+
+spanish = Agent(name="Spanish Assistant", model=FakeModel([text("Hola.")]))
+urdu = Agent(name="Urdu Assistant", model=FakeModel([text("سلام۔")]))
+billing = Agent(name="Billing", model=FakeModel([text("Paid.")]))
+triage = Agent(
+    name="Assistant",
+    handoffs=[handoff(spanish, input_filter=mark_filtered), urdu],
+    # Hands off on its first turn of every run, and the specialist answers.
+    model=FakeModel([handoff_call(spanish)]),
+)
+
+
+def check_classifiers() -> None:
+    keywords = keyword_classifier(
+        [(r"\b(spanish|español)\b|[¿¡ñ]", spanish), (r"\burdu\b", urdu), (r"\bhelp\b", billing)]
+    )
+    check("keyword hit", keywords("Reply in Spanish") == (spanish, 0.9))
+    check("keyword case-insensitive", keywords("URDU please")[0] is urdu)
+    check("keyword first match wins", keywords("help in español")[0] is spanish)
+    check("keyword miss", keywords("What's the weather?") == (None, 0.0))
+    check(
+        "keyword confidence",
+        keyword_classifier([("x", urdu)], confidence=0.5)("x") == (urdu, 0.5),
+    )
+
+    scripts = script_classifier({"ARABIC": urdu})
+    agent, confidence = scripts("آپ کیسے ہیں؟")
+    check("script hit", agent is urdu and confidence == 1.0, confidence)
+    agent, confidence = scripts("ok آپ کیسے")
+    check("script confidence is its share of letters", confidence == 6 / 8, (agent, confidence))
+    check("script miss", scripts("How are you?") == (None, 0.0))
+    check("script too few letters", scripts("آپ 123") == (None, 0.0))
+    check("script ignores non-letters", scripts("!!! ??? 42") == (None, 0.0))
+
+
+def check_route() -> None:
+    router = PreRouter(
+        triage=triage,
+        classifiers=[
+            script_classifier({"ARABIC": urdu}),
+            keyword_classifier([(r"\burdu\b", urdu), (r"\bspanish\b", spanish)], confidence=0.9),
+            keyword_classifier([(r"\bbill\b", billing), (r"\bmaybe\b", spanish)], confidence=0.5),
+        ],
+        threshold=0.8,
+    )
+    check("route hit", router.route("Answer in Spanish") is spanish)
+    check("route hit by script", router.route("آپ کیسے ہیں؟") is urdu)
+    check("route miss falls back to triage", router.route("What's the weather?") is triage)
+    check("route below threshold falls back", router.route("maybe") is triage)
+    check("route only to triage's handoffs", router.route("Pay my bill") is triage)
+    check(
+        "route only to triage's handoffs at any confidence",
+        PreRouter(triage, [keyword_classifier([("bill", billing)], 1.0)]).route("bill") is triage,
+    )
+    check("route empty input falls back", router.route("") is triage)
+
+    history = [
+        {"role": "user", "content": "Answer in Spanish"},
+        {"role": "assistant", "content": "Sure."},
+        {"role": "user", "content": [{"type": "input_text", "text": "Now in Urdu"}]},
+    ]
+    check("route reads the latest user message", router.route(history) is urdu)
+    check(
+        "route with no user message falls back",
+        router.route([{"role": "assistant", "content": "Urdu"}]) is triage,
+    )
+
+
+async def check_run() -> None:
+    config = RunConfig(tracing_disabled=True)
+    router = PreRouter(
+        triage=triage,
+        classifiers=[keyword_classifier([(r"\bspanish\b", spanish)])],
+        input_filters={spanish.name: mark_filtered},
+    )
+    triage_calls = triage.model.calls
+
+    result = await router.run("Answer in Spanish", run_config=config)
+    check("fast path answers", result.final_output == "Hola." and result.last_agent is spanish)
+    check("fast path skips triage", triage.model.calls == triage_calls, triage.model.calls)
+    check(
+        "fast path applies the handoff's input filter",
+        result.input[0] == {"role": "system", "content": "filtered"},
+        result.input,
+    )
+
+    result = await router.run("Hola, ¿qué tal?", run_config=config)
+    check("miss runs triage", triage.model.calls == triage_calls + 1, triage.model.calls)
+    check("triage hands off", result.final_output == "Hola." and result.last_agent is spanish)
+    check(
+        "triage handoff applies the same filter",
+        result.input[0] == {"role": "system", "content": "filtered"},
+        result.input,
+    )
+
+    stats = router.stats
+    check("stats count both paths", (stats.fast_path, stats.fallbacks) == (1, 1), stats)
+    check("hit rate", stats.hit_rate == 0.5, stats.hit_rate)
+
+
+if __name__ == "__main__":
+    check_classifiers()
+    check_route()
+    asyncio.run(check_run())
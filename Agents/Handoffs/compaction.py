@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from agents import HandoffInputData, TResponseInputItem
+from agents.items import (
+    HandoffCallItem,
+    HandoffOutputItem,
+    RunItem,
+    ToolCallItem,
+    ToolCallOutputItem,
+)
+
+TokenEstimator = Callable[[str], int]
+"""Counts the tokens in a piece of text."""
+
+TOOL_ITEM_TYPES = frozenset(
+    (
+        "function_call",
+        "function_call_output",
+        "computer_call",
+        "computer_call_output",
+        "file_search_call",
+        "web_search_call",
+        "code_interpreter_call",
+        "image_generation_call",
+        "local_shell_call",
+        "local_shell_call_output",
+        "mcp_call",
+        "mcp_list_tools",
+        "mcp_approval_request",
+        "mcp_approval_response",
+    )
+)
+"""Input item types that are tool calls or their outputs."""
+
+_TOOL_RUN_ITEMS = (ToolCallItem, ToolCallOutputItem)
+_HANDOFF_RUN_ITEMS = (HandoffCallItem, HandoffOutputItem)
+
+
+def estimate_tokens(text: str) -> int:
+    """A rough, offline token estimate of about four characters per token."""
+    return (len(text) + 3) // 4
+
+
+def item_text(item: TResponseInputItem) -> str:
+    """Returns the text of a message item, or an empty string for other items."""
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, dict):
+                text = block.get("text") or block.get("refusal")
+                if isinstance(text, str):
+                    parts.append(text)
+        return "".join(parts)
+    return ""
+
+
+@dataclass(frozen=True)
+class HandoffCompactor:
+    """A handoff input filter that compacts the conversation passed to the next agent.
+
+    Each stage is switched on by its field. All of them run in one pass over `input_history`,
+    from the newest item to the oldest, so the token budget keeps the most recent items:
+
+    1. `drop_tool_calls` removes tool calls and their outputs, from the history and from the
+       run items. `drop_handoff_items` also removes the handoff's own call and output, as
+       `handoff_filters.remove_all_tools` does.
+    2. `dedupe_system_messages` keeps only the newest copy of each system or developer message.
+    3. `max_tokens` keeps items verbatim until the budget is used up. The newest user message is
+       always kept, unless `keep_latest_user_message` is off, so the next agent has a turn to
+       answer.
+    4. `summarize` folds the user and assistant messages that did not fit into one system message
+       at the start of the history. Without it they are dropped.
+
+    The pass stops as soon as nothing older can be kept or summarized.
+
+    Pass an instance as `input_filter` to `handoff()`.
+    """
+
+    drop_tool_calls: bool = True
+
+    drop_handoff_items: bool = False
+
+    dedupe_system_messages: bool = True
+
+    max_tokens: int | None = None
+    """The token budget for the history kept verbatim. Unlimited if `None`."""
+
+    keep_latest_user_message: bool = True
+    """Keeps the newest user message verbatim even past `max_tokens`. It still counts toward it."""
+
+    summarize: bool = False
+
+    summary_max_tokens: int = 500
+    """The token budget for the summary message. The oldest lines are dropped first."""
+
+    estimator: TokenEstimator = estimate_tokens
+    """Counts tokens. Swap in a real tokenizer, e.g. `lambda text: len(enc.encode(text))`."""
+
+    def __call__(self, data: HandoffInputData) -> HandoffInputData:
+        history = data.input_history
+        if isinstance(history, str):
+            return data
+
+        drop_tools = self.drop_tool_calls
+        dedupe = self.dedupe_system_messages
+        budget = self.max_tokens
+        keep_user = self.keep_latest_user_message
+        summarize = self.summarize
+        estimator = self.estimator
+
+        kept: list[TResponseInputItem] = []
+        summary_lines: list[str] = []
+        summary_tokens = 0
+        seen_system: set[str] = set()
+        tokens = 0
+        over_budget = False
+
+        for item in reversed(history):
+            if drop_tools and item.get("type") in TOOL_ITEM_TYPES:
+                continue
+
+            role = item.get("role")
+            # Only worked out when a stage needs it.
+            text = None
+            if dedupe and (role == "system" or role == "developer"):
+                text = item_text(item)
+                if text in seen_system:
+                    continue
+                seen_system.add(text)
+
+            if budget is None:
+                kept.append(item)
+                continue
+            if keep_user and role == "user":
+                keep_user = False
+                text = item_text(item) if text is None else text
+                tokens += estimator(text) if text else 0
+                kept.append(item)
+                continue
+            if not over_budget:
+                text = item_text(item) if text is None else text
+                item_tokens = estimator(text) if text else 0
+                if tokens + item_tokens <= budget:
+                    tokens += item_tokens
+                    kept.append(item)
+                    continue
+                # Everything from here back is older than the budget allows.
+                over_budget = True
+
+            if not summarize or summary_tokens >= self.summary_max_tokens:
+                if not keep_user:
+                    break
+                # Still looking for the newest user message.
+                continue
+            if role == "user" or role == "assistant":
+                text = item_text(item) if text is None else text
+                if text:
+                    line = f"{role.capitalize()}: {text.strip()}"
+                    summary_tokens += estimator(line)
+                    summary_lines.append(line)
+
+        kept.reverse()
+        if summary_lines:
+            summary_lines.reverse()
+            kept.insert(
+                0,
+                {
+                    "role": "system",
+                    "content": "Summary of the earlier conversation:\n" + "\n".join(summary_lines),
+                },
+            )
+
+        return dataclasses.replace(
+            data,
+            input_history=tuple(kept),
+            pre_handoff_items=self._filter_run_items(data.pre_handoff_items),
+            new_items=self._filter_run_items(data.new_items),
+        )
+
+    def _filter_run_items(self, items: tuple[RunItem, ...]) -> tuple[RunItem, ...]:
+        if self.drop_handoff_items:
+            dropped = _TOOL_RUN_ITEMS + _HANDOFF_RUN_ITEMS
+        elif self.drop_tool_calls:
+            dropped = _TOOL_RUN_ITEMS
+        else:
+            return items
+        return tuple(item for item in items if not isinstance(item, dropped))
@@ -8,6 +8,9 @@ from agents.extensions import handoff_filters
 from agents.run import RunConfig
 import asyncio
 
+from compaction import HandoffCompactor
+from routing import PreRouter, keyword_classifier
+
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
 
@@ -28,58 +31,10 @@ def random_number_tool(max: int) -> int:
     return random.randint(0, max)
 
 
-def spanish_handoff_message_filter(handoff_message_data: HandoffInputData) -> HandoffInputData:
-    # Summarize the input_history
-    history = handoff_message_data.input_history
-    summary = []
-
-    # Create a summary of the conversation
-    for message in history:
-        if isinstance(message, dict) and "content" in message and "role" in message:
-            if message["role"] == "user":
-                summary.append(f"User: {message['content']}")
-            elif message["role"] == "assistant":
-                # Extract text from assistant's content if it's a list with 'text' field
-                content = message["content"]
-                if isinstance(content, list) and len(content) > 0 and "text" in content[0]:
-                    summary.append(f"Assistant: {content[0]['text']}")
-                elif isinstance(content, str):
-                    summary.append(f"Assistant: {content}")
-
-    # Combine summary into a single string
-    summary_text = "Summary: " + " | ".join(summary) if summary else "No relevant history."
-
-    # Replace input_history with the summary as a single message
-    summarized_history = [{"role": "system", "content": summary_text}]
-
-    # Create the new HandoffInputData object
-    result = HandoffInputData(
-        input_history=tuple(summarized_history),
-        pre_handoff_items=tuple(handoff_message_data.pre_handoff_items),
-        new_items=tuple(handoff_message_data.new_items),
-    )
-
-# Convert new_items to a JSON-serializable format for printing
-    serializable_new_items = []
-    for item in handoff_message_data.new_items:
-        if hasattr(item, '__dict__'):  # Check if item is a custom object
-            # Convert HandoffCallItem to a dictionary with relevant fields
-            serializable_item = {
-                "content": getattr(item, "content", None),
-                "role": getattr(item, "role", None),
-                # Add other relevant fields if needed
-            }
-            serializable_new_items.append(serializable_item)
-        else:
-            serializable_new_items.append(item)
-
-    # Print the contents for debugging
-    print("\n=== HandoffInputData Contents ===")
-    print("input_history:", json.dumps(summarized_history, indent=2))
-    print("pre_handoff_items:", json.dumps(handoff_message_data.pre_handoff_items, indent=2))
-    print("new_items:", json.dumps(serializable_new_items, indent=2))
-
-    return result
+# Replaces the history with a summary of its user and assistant messages, except the newest user
+# message, which the Spanish agent answers. Drops tool calls but keeps the handoff itself, in one
+# pass and without printing anything on the handoff path.
+spanish_handoff_message_filter = HandoffCompactor(drop_tool_calls = True, max_tokens = 0, summarize = True)
 
 
 first_agent = Agent(
@@ -104,6 +59,14 @@ second_agent = Agent(
     model = model
 )
 
+# Messages that are obviously Spanish go straight to the Spanish assistant, skipping the triage
+# model call. Anything else still goes through `second_agent`.
+router = PreRouter(
+    triage = second_agent,
+    classifiers = [keyword_classifier([(r"\b(español|espanol|spanish|por favor|habla)\b|[¿¡ñ]", spanish_agent)])],
+    input_filters = {spanish_agent.name: spanish_handoff_message_filter},
+)
+
 
 async def main():
 
@@ -122,9 +85,8 @@ async def main():
     print("Step 2 done")
 
         # 4. Cause a handoff to occur
-    result = await Runner.run(
-            second_agent,
-            input=result.to_input_list()
+    result = await router.run(
+            result.to_input_list()
             + [
                 {
                     "content": "Por favor habla en español. ¿Cuál es mi nombre y dónde vivo?",
@@ -135,6 +97,7 @@ async def main():
         )
 
     print("Step 4 done")
+    print(f"Fast-path hit rate: {router.stats.hit_rate:.0%}")
 
     print("\n===Final messages===\n")
 
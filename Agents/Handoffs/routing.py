@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import re
+import time
+import unicodedata
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, HandoffInputData, Runner, TResponseInputItem
+from agents.result import RunResult
+
+Prediction = tuple[Agent[Any] | None, float]
+"""The agent a classifier picked, or `None`, and its confidence between 0 and 1."""
+
+Classifier = Callable[[str], Prediction]
+"""Picks a target agent from the text of the user's latest message."""
+
+InputFilter = Callable[[HandoffInputData], HandoffInputData]
+
+
+def keyword_classifier(
+    routes: Sequence[tuple[str, Agent[Any]]], confidence: float = 0.9
+) -> Classifier:
+    """Picks the agent of the first case-insensitive regex that matches the text."""
+    compiled = [(re.compile(pattern, re.IGNORECASE), agent) for pattern, agent in routes]
+
+    def classify(text: str) -> Prediction:
+        for pattern, agent in compiled:
+            if pattern.search(text):
+                return agent, confidence
+        return None, 0.0
+
+    return classify
+
+
+def script_classifier(routes: Mapping[str, Agent[Any]], min_letters: int = 3) -> Classifier:
+    """Picks an agent by the writing system of the text, e.g. `{"ARABIC": urdu_agent}`.
+
+    Scripts are matched against the first word of each letter's Unicode name, such as `ARABIC`,
+    `DEVANAGARI` or `CYRILLIC`. The confidence is the share of letters in that script.
+    """
+
+    def classify(text: str) -> Prediction:
+        counts: dict[str, int] = {}
+        letters = 0
+        for char in text:
+            if not char.isalpha():
+                continue
+            letters += 1
+            script = unicodedata.name(char, "").split(" ", 1)[0]
+            if script in routes:
+                counts[script] = counts.get(script, 0) + 1
+        if letters < min_letters or not counts:
+            return None, 0.0
+        script = max(counts, key=counts.__getitem__)
+        return routes[script], counts[script] / letters
+
+    return classify
+
+
+@dataclass
+class RoutingStats:
+    fast_path: int = 0
+    """Runs that went straight to a specialist."""
+
+    fallbacks: int = 0
+    """Runs that went through the LLM triage agent."""
+
+    fast_path_seconds: float = 0.0
+    fallback_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.fast_path + self.fallbacks
+        return self.fast_path / total if total else 0.0
+
+    @property
+    def seconds_saved(self) -> float:
+        """Estimated time saved: the difference in mean run time, times the fast-path runs."""
+        if not self.fast_path or not self.fallbacks:
+            return 0.0
+        saved = self.fallback_seconds / self.fallbacks - self.fast_path_seconds / self.fast_path
+        return max(saved, 0.0) * self.fast_path
+
+
+@dataclass
+class PreRouter:
+    """Routes a run straight to a specialist when a local classifier is confident, and through
+    the LLM `triage` agent otherwise, saving the triage round-trip on the fast path.
+
+    Classifiers run in order; the first prediction at or above `threshold` wins. Only agents the
+    triage agent can hand off to are accepted, so the fast path never reaches an agent the triage
+    agent could not. An `input_filter` the triage handoff applies can be given in `input_filters`,
+    by agent name, so the specialist sees the same input either way.
+    """
+
+    triage: Agent[Any]
+    classifiers: Sequence[Classifier]
+    threshold: float = 0.8
+    input_filters: Mapping[str, InputFilter] = field(default_factory=dict)
+    stats: RoutingStats = field(default_factory=RoutingStats)
+
+    def route(self, input: str | list[TResponseInputItem]) -> Agent[Any]:
+        """Returns the agent that should handle `input`, without running anything."""
+        text = _latest_user_text(input)
+        if text:
+            targets = {_target_name(item) for item in self.triage.handoffs}
+            for classify in self.classifiers:
+                agent, confidence = classify(text)
+                if agent is not None and confidence >= self.threshold and agent.name in targets:
+                    return agent
+        return self.triage
+
+    async def run(self, input: str | list[TResponseInputItem], **kwargs: Any) -> RunResult:
+        """Runs `input` on the agent picked by `route`, passing `kwargs` on to `Runner.run`."""
+        agent = self.route(input)
+        fast = agent is not self.triage
+        if fast and agent.name in self.input_filters:
+            input = self._filtered(agent.name, input)
+
+        start = time.perf_counter()
+        result = await Runner.run(agent, input, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        if fast:
+            self.stats.fast_path += 1
+            self.stats.fast_path_seconds += elapsed
+        else:
+            self.stats.fallbacks += 1
+            self.stats.fallback_seconds += elapsed
+        return result
+
+    def _filtered(
+        self, name: str, input: str | list[TResponseInputItem]
+    ) -> str | list[TResponseInputItem]:
+        if isinstance(input, str):
+            input = [{"content": input, "role": "user"}]
+        data = HandoffInputData(input_history=tuple(input), pre_handoff_items=(), new_items=())
+        history = self.input_filters[name](data).input_history
+        return history if isinstance(history, str) else list(history)
+
+
+def _target_name(item: Any) -> str:
+    return item.name if isinstance(item, Agent) else item.agent_name
+
+
+def _latest_user_text(input: str | list[TResponseInputItem]) -> str:
+    if isinstance(input, str):
+        return input
+    for item in reversed(input):
+        if item.get("role") == "user":
+            content = item.get("content")
+            if isinstance(content, str):
+                return content
+            if isinstance(content, list):
+                return " ".join(
+                    block["text"]
+                    for block in content
+                    if isinstance(block, dict) and isinstance(block.get("text"), str)
+                )
+            return ""
+    return ""
@@ -0,0 +1,70 @@
+"""Run latency percentiles against a model with a slow tail, with and without hedging.
+
+The fake model usually answers in about `FAST` seconds, but one request in `SLOW_EVERY` takes
+`SLOW` seconds, like an endpoint that now and then queues a request behind a long completion.
+
+    python bench_hedging.py
+"""
+
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from agents import Agent, Runner
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "Load_Test"))
+from fake_model import FakeModel, FakeTurn, text
+from hedging import HedgedModel, HedgePolicy
+
+FAST = 0.05
+SLOW = 1.0
+SLOW_EVERY = 25
+RUNS = 500
+
+
+class TailModel(FakeModel):
+    """A `FakeModel` whose latency is drawn for every request."""
+
+    def __init__(self, seed: int) -> None:
+        super().__init__([text("Sunny.")])
+        self.random = random.Random(seed)
+
+    def _latency(self, turn: FakeTurn) -> float:
+        slow = self.random.randrange(SLOW_EVERY) == 0
+        return SLOW if slow else FAST * self.random.uniform(0.8, 1.2)
+
+
+async def latencies(agent: Agent) -> list[float]:
+    async def one() -> float:
+        start = time.perf_counter()
+        await Runner.run(agent, "What is the weather?")
+        return time.perf_counter() - start
+
+    results = []
+    for _ in range(RUNS // 50):
+        results += await asyncio.gather(*(one() for _ in range(50)))
+    return sorted(results)
+
+
+def row(name: str, results: list[float], extra: str = "") -> None:
+    p50 = statistics.median(results) * 1e3
+    p95 = results[int(len(results) * 0.95)] * 1e3
+    p99 = results[int(len(results) * 0.99)] * 1e3
+    print(f"{name:<10} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f}  {extra}")
+
+
+async def main() -> None:
+    print(f"{'model':<10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}")
+    row("plain", await latencies(Agent(name="Assistant", model=TailModel(seed=1))))
+
+    hedged = HedgedModel(TailModel(seed=1), HedgePolicy(initial_delay=0.2))
+    results = await latencies(Agent(name="Assistant", model=hedged))
+    stats = hedged.stats
+    row("hedged", results, f"{stats.hedged} hedges ({stats.hedged / stats.requests:.1%} extra)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from agents import (
+    AgentOutputSchemaBase,
+    Handoff,
+    Model,
+    ModelSettings,
+    ModelTracing,
+    RunConfig,
+    Tool,
+    TResponseInputItem,
+)
+from agents.exceptions import UserError
+from agents.items import ModelResponse, TResponseStreamEvent
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    quantile: float = 0.95
+    """A duplicate is sent once the first request has taken longer than this quantile of recent
+    latencies: to the whole response for `Runner.run`, to the first event when streaming."""
+
+    initial_delay: float = 2.0
+    """The hedge delay until `min_samples` latencies have been seen."""
+
+    min_samples: int = 20
+    window: int = 500
+    """How many recent latencies the quantile is taken over."""
+
+    max_extra_fraction: float = 0.1
+    """Hedges may add at most this fraction of requests on top of the ones the runner made."""
+
+    max_extra_tokens: int | None = None
+    """A cap on the estimated input tokens sent in hedges, over the model's lifetime."""
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    """Requests made by the runner; hedges not included."""
+
+    hedged: int = 0
+    """Duplicate requests sent."""
+
+    hedge_wins: int = 0
+    """Times the duplicate answered first."""
+
+    budget_denied: int = 0
+    """Times a request was slow enough to hedge but the budget was spent."""
+
+    extra_tokens: int = 0
+    """Estimated input tokens sent in hedges. The losing request is cancelled before it reports
+    its usage, so this estimate (input characters / 4) is the only record of what it cost."""
+
+
+class _Latencies:
+    def __init__(self, policy: HedgePolicy) -> None:
+        self.policy = policy
+        self.samples: deque[float] = deque(maxlen=policy.window)
+        self.threshold = policy.initial_delay
+        self._since_update = 0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self._since_update += 1
+        # Sorting the window on every request would cost more than it's worth.
+        if len(self.samples) >= self.policy.min_samples and self._since_update >= 10:
+            ordered = sorted(self.samples)
+            index = min(int(len(ordered) * self.policy.quantile), len(ordered) - 1)
+            self.threshold = ordered[index]
+            self._since_update = 0
+
+
+class HedgedModel(Model):
+    """Wraps a model so a request that is slower than usual gets a duplicate, and whichever
+    answers first wins; the other is cancelled.
+
+    "Slower than usual" is the policy's quantile of this model's recent latencies, so at the
+    default p95 about one request in twenty is hedged. The duplicate goes to `fallback` if given,
+    else to the same model. Extra requests are capped by `max_extra_fraction` and, optionally,
+    `max_extra_tokens`; `stats` counts them separately from the runner's `Usage`, which only sees
+    the winning response.
+
+    When streaming, only the first event is raced: once one stream has produced it, that stream is
+    kept and the other closed.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        policy: HedgePolicy | None = None,
+        fallback: Model | None = None,
+    ) -> None:
+        self.model = model
+        self.policy = policy or HedgePolicy()
+        self.fallback = fallback
+        self.stats = HedgeStats()
+        self._response_latency = _Latencies(self.policy)
+        self._first_event_latency = _Latencies(self.policy)
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        def request(model: Model) -> Awaitable[ModelResponse]:
+            return model.get_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                **kwargs,
+            )
+
+        self.stats.requests += 1
+        start = time.monotonic()
+        primary = asyncio.create_task(request(self.model))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self._response_latency.threshold)
+            if done or not self._allow(system_instructions, input):
+                response = await primary
+                self._response_latency.add(time.monotonic() - start)
+                return response
+
+            backup = asyncio.create_task(request(self.fallback or self.model))
+            tasks.append(backup)
+            winner = await _race(primary, backup)
+            if winner is backup:
+                self.stats.hedge_wins += 1
+            self._response_latency.add(time.monotonic() - start)
+            return winner.result()
+        finally:
+            # Nothing is left running if the caller is cancelled, or a request fails.
+            await _cancel(tasks)
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        def request(model: Model) -> AsyncIterator[TResponseStreamEvent]:
+            return model.stream_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                **kwargs,
+            )
+
+        self.stats.requests += 1
+        start = time.monotonic()
+        streams: dict[asyncio.Task[Any], AsyncIterator[TResponseStreamEvent]] = {}
+        winner: asyncio.Task[Any] | None = None
+        try:
+            primary_stream = request(self.model)
+            primary = asyncio.create_task(_first_event(primary_stream))
+            streams[primary] = primary_stream
+            done, _ = await asyncio.wait({primary}, timeout=self._first_event_latency.threshold)
+            if done or not self._allow(system_instructions, input):
+                await primary
+                winner = primary
+            else:
+                backup_stream = request(self.fallback or self.model)
+                backup = asyncio.create_task(_first_event(backup_stream))
+                streams[backup] = backup_stream
+                winner = await _race(primary, backup)
+                if winner is backup:
+                    self.stats.hedge_wins += 1
+            self._first_event_latency.add(time.monotonic() - start)
+        finally:
+            # A stream can only be closed once the task reading from it has stopped.
+            await _cancel(streams)
+            for task, stream in streams.items():
+                if task is not winner:
+                    await stream.aclose()
+        stream = streams[winner]
+        try:
+            first = winner.result()
+            if first is None:
+                return
+            yield first
+            async for event in stream:
+                yield event
+        finally:
+            await stream.aclose()
+
+    def _allow(
+        self, system_instructions: str | None, input: str | list[TResponseInputItem]
+    ) -> bool:
+        """Whether the budget has room for one more hedge, which it is then charged for."""
+        policy = self.policy
+        if self.stats.hedged + 1 > self.stats.requests * policy.max_extra_fraction:
+            self.stats.budget_denied += 1
+            return False
+        text = input if isinstance(input, str) else json.dumps(input, default=str)
+        tokens = (len(text) + len(system_instructions or "")) // 4
+        if policy.max_extra_tokens is not None and (
+            self.stats.extra_tokens + tokens > policy.max_extra_tokens
+        ):
+            self.stats.budget_denied += 1
+            return False
+        self.stats.hedged += 1
+        self.stats.extra_tokens += tokens
+        return True
+
+
+async def _first_event(
+    stream: AsyncIterator[TResponseStreamEvent],
+) -> TResponseStreamEvent | None:
+    async for event in stream:
+        return event
+    return None
+
+
+async def _race(*tasks: asyncio.Task[Any]) -> asyncio.Task[Any]:
+    """Returns the first task to succeed and cancels the others. If every task fails, the first
+    task's error is raised."""
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    return task
+        for task in tasks:
+            task.result()
+        raise AssertionError("unreachable")
+    finally:
+        await _cancel(pending)
+
+
+async def _cancel(tasks: Iterable[asyncio.Task[Any]]) -> None:
+    """Cancels the tasks that haven't finished and waits until they have."""
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+
+def hedge_run_config(
+    config: RunConfig,
+    policy: HedgePolicy | None = None,
+    fallback: Model | None = None,
+) -> RunConfig:
+    """A copy of `config` whose `model` is hedged. `config.model` must be a `Model` instance."""
+    if not isinstance(config.model, Model):
+        raise UserError("hedge_run_config needs RunConfig.model to be a Model instance")
+    return dataclasses.replace(config, model=HedgedModel(config.model, policy, fallback))
@@ -0,0 +1,45 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from hedging import HedgePolicy, hedge_run_config
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+# A slow request is raced against gemini-2.0-flash-lite.
+fallback = OpenAIChatCompletionsModel(model="gemini-2.0-flash-lite", openai_client=client)
+
+config = hedge_run_config(RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   ), HedgePolicy(quantile = 0.95, max_extra_fraction = 0.1), fallback = fallback)
+
+agent = Agent(
+    name = "Assistant",
+    instructions = "You answer in one short sentence.",
+)
+
+questions = [f"Give me fun fact number {i} about space." for i in range(1, 31)]
+
+
+async def main():
+    for question in questions:
+        result = await Runner.run(agent, question, run_config = config)
+        print(result.final_output)
+
+    stats = config.model.stats
+    print("\n=== Hedging ===")
+    print(f"Requests: {stats.requests}, hedged: {stats.hedged}, hedges that won: {stats.hedge_wins}")
+    print(f"Denied by budget: {stats.budget_denied}, estimated extra input tokens: {stats.extra_tokens}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import inspect
+import time
+from collections.abc import AsyncIterator, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import (
+    Agent,
+    AgentOutputSchema,
+    AgentOutputSchemaBase,
+    FunctionTool,
+    Handoff,
+    Model,
+    RunConfig,
+    Runner,
+    TResponseInputItem,
+)
+from agents.items import ItemHelpers, ModelResponse, TResponseStreamEvent
+from agents.result import RunResult
+
+from metrics import MetricsRegistry
+
+PHASES = (
+    "instructions",
+    "input_preparation",
+    "model_request",
+    "tool",
+    "output_validation",
+    "handoff_filter",
+)
+"""The phases timed inside a run. `run` and `framework` are recorded per run on top of them."""
+
+
+@dataclass
+class _RunTimings:
+    intervals: list[tuple[float, float]] = field(default_factory=list)
+    """The start and end of every phase timed in the run. Calls of one turn can overlap."""
+
+    preparing_since: float | None = None
+    """When the runner started building the input of the next model request."""
+
+
+_run_timings: ContextVar[_RunTimings | None] = ContextVar("_run_timings", default=None)
+
+
+def _record(
+    registry: MetricsRegistry, phase: str, start: float, end: float, **labels: str
+) -> None:
+    registry.observe(phase, end - start, **labels)
+    timings = _run_timings.get()
+    if timings is not None:
+        timings.intervals.append((start, end))
+
+
+def _covered(intervals: list[tuple[float, float]]) -> float:
+    """The seconds covered by at least one interval, so overlapping calls count once."""
+    total = 0.0
+    covered_until = float("-inf")
+    for start, end in sorted(intervals):
+        if end > covered_until:
+            total += end - max(start, covered_until)
+            covered_until = end
+    return total
+
+
+def _input_preparation_timer(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wraps `ItemHelpers.input_to_new_input_list`, which the runner calls first when it builds
+    the input of a model request. The request's `InstrumentedModel` records when that ends."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        timings = _run_timings.get()
+        if timings is not None:
+            timings.preparing_since = time.perf_counter()
+        return func(*args, **kwargs)
+
+    wrapper._instrumented = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _instrument_input_preparation() -> None:
+    if not getattr(ItemHelpers.input_to_new_input_list, "_instrumented", False):
+        ItemHelpers.input_to_new_input_list = staticmethod(  # type: ignore[method-assign]
+            _input_preparation_timer(ItemHelpers.input_to_new_input_list)
+        )
+
+
+def _record_input_preparation(registry: MetricsRegistry, end: float, **labels: str) -> None:
+    timings = _run_timings.get()
+    if timings is not None and timings.preparing_since is not None:
+        _record(registry, "input_preparation", timings.preparing_since, end, **labels)
+        timings.preparing_since = None
+
+
+class InstrumentedModel(Model):
+    """Times each model request, and the time to the first streamed delta."""
+
+    def __init__(self, model: Model, registry: MetricsRegistry, name: str = "model") -> None:
+        self.model = model
+        self.registry = registry
+        self.name = name
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        if not self.registry.enabled:
+            return await self.model.get_response(*args, **kwargs)
+        start = time.perf_counter()
+        _record_input_preparation(self.registry, start, model=self.name)
+        try:
+            return await self.model.get_response(*args, **kwargs)
+        finally:
+            _record(self.registry, "model_request", start, time.perf_counter(), model=self.name)
+
+    async def stream_response(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        if not self.registry.enabled:
+            async for event in self.model.stream_response(*args, **kwargs):
+                yield event
+            return
+        start = time.perf_counter()
+        _record_input_preparation(self.registry, start, model=self.name)
+        first_delta = True
+        try:
+            async for event in self.model.stream_response(*args, **kwargs):
+                if first_delta and event.type.endswith(".delta"):
+                    first_delta = False
+                    self.registry.observe(
+                        "time_to_first_token", time.perf_counter() - start, model=self.name
+                    )
+                yield event
+        finally:
+            _record(self.registry, "model_request", start, time.perf_counter(), model=self.name)
+
+
+class InstrumentedOutputSchema(AgentOutputSchemaBase):
+    """Times `validate_json` of the wrapped output schema."""
+
+    def __init__(
+        self, schema: AgentOutputSchemaBase, registry: MetricsRegistry, agent: str
+    ) -> None:
+        self.schema = schema
+        self.registry = registry
+        self.agent = agent
+
+    def is_plain_text(self) -> bool:
+        return self.schema.is_plain_text()
+
+    def name(self) -> str:
+        return self.schema.name()
+
+    def json_schema(self) -> dict[str, Any]:
+        return self.schema.json_schema()
+
+    def is_strict_json_schema(self) -> bool:
+        return self.schema.is_strict_json_schema()
+
+    def validate_json(self, json_str: str) -> Any:
+        if not self.registry.enabled:
+            return self.schema.validate_json(json_str)
+        start = time.perf_counter()
+        try:
+            return self.schema.validate_json(json_str)
+        finally:
+            _record(
+                self.registry, "output_validation", start, time.perf_counter(), agent=self.agent
+            )
+
+
+def instrument_agent(
+    agent: Agent[Any], registry: MetricsRegistry, *agents: Agent[Any]
+) -> Agent[Any]:
+    """Wraps the model, tools, dynamic instructions, output schema and handoff input filters of
+    `agent` and every agent it can hand off to, in place, so each records its phase timings.
+
+    Handoffs made with `handoff()` do not record their target agent; pass those targets in
+    `agents` to instrument them too. Returns `agent`.
+
+    The first call also wraps `ItemHelpers.input_to_new_input_list`, process-wide, to time input
+    preparation. It only records inside `run`.
+    """
+    _instrument_input_preparation()
+    seen: set[int] = set()
+    pending = [agent, *agents]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        _instrument_one(current, registry)
+        pending.extend(item for item in current.handoffs if isinstance(item, Agent))
+    return agent
+
+
+def instrument_run_config(config: RunConfig, registry: MetricsRegistry) -> RunConfig:
+    """Returns a copy of `config` whose model, which overrides every agent's, is instrumented."""
+    if isinstance(config.model, Model) and not isinstance(config.model, InstrumentedModel):
+        return dataclasses.replace(
+            config, model=InstrumentedModel(config.model, registry, _model_name(config.model))
+        )
+    return config
+
+
+async def run(
+    registry: MetricsRegistry,
+    agent: Agent[Any],
+    input: str | list[TResponseInputItem],
+    **kwargs: Any,
+) -> RunResult:
+    """`Runner.run` that also records the whole run and the framework's share of it.
+
+    `framework` is the run time not spent in any timed phase: processing responses, running hooks
+    and guardrails, and the runner's own bookkeeping. Phases that overlap, such as the tool calls
+    of one turn, count once, for the wall-clock time they cover together.
+    `framework_per_turn` divides it by the number of model responses.
+    """
+    if not registry.enabled:
+        return await Runner.run(agent, input, **kwargs)
+    _instrument_input_preparation()
+    timings = _RunTimings()
+    token = _run_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        result = await Runner.run(agent, input, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        _run_timings.reset(token)
+        registry.observe("run", elapsed, agent=agent.name)
+    framework = max(elapsed - _covered(timings.intervals), 0.0)
+    registry.observe("framework", framework, agent=agent.name)
+    registry.observe(
+        "framework_per_turn", framework / max(len(result.raw_responses), 1), agent=agent.name
+    )
+    return result
+
+
+def _instrument_one(agent: Agent[Any], registry: MetricsRegistry) -> None:
+    if isinstance(agent.model, Model) and not isinstance(agent.model, InstrumentedModel):
+        agent.model = InstrumentedModel(agent.model, registry, _model_name(agent.model))
+
+    if callable(agent.instructions) and not getattr(agent.instructions, "_instrumented", False):
+        agent.instructions = _timed_callable(
+            agent.instructions, registry, "instructions", agent=agent.name
+        )
+
+    agent.tools = [
+        _timed_tool(tool, registry) if isinstance(tool, FunctionTool) else tool
+        for tool in agent.tools
+    ]
+
+    output_type = agent.output_type
+    if output_type is not None and output_type is not str:
+        if not isinstance(output_type, AgentOutputSchemaBase):
+            output_type = AgentOutputSchema(output_type)
+        if not isinstance(output_type, InstrumentedOutputSchema):
+            agent.output_type = InstrumentedOutputSchema(output_type, registry, agent.name)
+
+    agent.handoffs = [
+        dataclasses.replace(
+            item,
+            input_filter=_timed_callable(
+                item.input_filter, registry, "handoff_filter", agent=item.agent_name
+            ),
+        )
+        if isinstance(item, Handoff)
+        and item.input_filter is not None
+        and not getattr(item.input_filter, "_instrumented", False)
+        else item
+        for item in agent.handoffs
+    ]
+
+
+def _timed_tool(tool: FunctionTool, registry: MetricsRegistry) -> FunctionTool:
+    if getattr(tool.on_invoke_tool, "_instrumented", False):
+        return tool
+    return dataclasses.replace(
+        tool,
+        on_invoke_tool=_timed_callable(tool.on_invoke_tool, registry, "tool", tool=tool.name),
+    )
+
+
+def _timed_callable(
+    func: Callable[..., Any], registry: MetricsRegistry, phase: str, **labels: str
+) -> Callable[..., Any]:
+    # Keep the function sync or async, and its signature, since the SDK inspects both.
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any) -> Any:
+            if not registry.enabled:
+                return await func(*args)
+            start = time.perf_counter()
+            try:
+                return await func(*args)
+            finally:
+                _record(registry, phase, start, time.perf_counter(), **labels)
+
+        wrapper: Callable[..., Any] = async_wrapper
+    else:
+
+        @functools.wraps(func)
+        def sync_wrapper(*args: Any) -> Any:
+            if not registry.enabled:
+                return func(*args)
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                _record(registry, phase, start, time.perf_counter(), **labels)
+
+        wrapper = sync_wrapper
+
+    wrapper._instrumented = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _model_name(model: Model) -> str:
+    return str(getattr(model, "model", None) or type(model).__name__)
@@ -0,0 +1,60 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, function_tool
+from agents.run import RunConfig
+import asyncio
+
+from instrument import instrument_agent, instrument_run_config, run
+from metrics import MetricsRegistry
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+# Set `enabled = False` to turn every measurement into a no-op.
+registry = MetricsRegistry(enabled = True)
+
+config = instrument_run_config(RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   ), registry)
+
+@function_tool
+def get_weather_tool():
+    return ("FAisalabad weather is sunny!")
+
+@function_tool
+def get_time_tool():
+    return ("Current time is 3:45 PM!")
+
+@function_tool
+def get_date_tool():
+    return ("Today's date is December 15, 2024!")
+
+agent = instrument_agent(Agent(
+    name = "Multi-tool agent",
+    instructions="You are a helpful assistant that can provide weather, time and date information.",
+    tools=[get_weather_tool, get_time_tool, get_date_tool],
+    model = model
+), registry)
+
+async def main():
+    # Scrape http://127.0.0.1:9464/metrics while the script runs.
+    server = registry.serve(port = 9464)
+
+    result = await run(registry, agent, "What is the weather, current time and today's date?", run_config = config)
+    print("Final output:", result.final_output)
+
+    print("\n=== Phase timings ===")
+    print(registry.summary())
+
+    registry.write("metrics.txt")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
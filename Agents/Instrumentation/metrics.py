@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+"""Histogram bucket bounds in seconds, from sub-millisecond framework work to slow model calls."""
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Histogram:
+    """A cumulative-bucket histogram of durations, as in OpenMetrics."""
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    """Observations per bucket; the last entry counts those above every bound."""
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """An upper bound for the `q` quantile: the bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """In-process histograms of phase durations, keyed by metric name and labels.
+
+    Set `enabled` to false to turn every `observe` and `time` into a no-op.
+    """
+
+    def __init__(self, prefix: str = "agents", enabled: bool = True) -> None:
+        self.prefix = prefix
+        self.enabled = enabled
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        return self._histograms.get(name, {}).get(tuple(sorted(labels.items())))
+
+    def summary(self) -> str:
+        """One line per series: count, mean, and bucket bounds for p50 and p99."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                for labels, histogram in sorted(series.items()):
+                    label_text = ",".join(f"{k}={v}" for k, v in labels)
+                    mean = histogram.sum / histogram.count * 1e3
+                    lines.append(
+                        f"{name}{{{label_text}}} count={histogram.count} mean={mean:.2f}ms "
+                        f"p50<={histogram.quantile(0.5) * 1e3:g}ms "
+                        f"p99<={histogram.quantile(0.99) * 1e3:g}ms"
+                    )
+        return "\n".join(lines)
+
+    def to_openmetrics(self) -> str:
+        """Renders every histogram in the OpenMetrics text format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                metric = f"{self.prefix}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                lines.append(f"# UNIT {metric} seconds")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f"{metric}_bucket{_labels(labels, le=repr(bound))} {cumulative}"
+                        )
+                    lines.append(f"{metric}_bucket{_labels(labels, le='+Inf')} {histogram.count}")
+                    lines.append(f"{metric}_count{_labels(labels)} {histogram.count}")
+                    lines.append(f"{metric}_sum{_labels(labels)} {histogram.sum}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> None:
+        """Writes `to_openmetrics()` to a file, e.g. for a node exporter's textfile collector."""
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.to_openmetrics())
+        tmp.replace(path)
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serves `to_openmetrics()` at `/metrics` from a daemon thread. Returns the server, so
+        it can be stopped with `shutdown()`."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_openmetrics().encode()
+                self.send_response(200)
+                self.send_header(
+                    "Content-Type",
+                    "application/openmetrics-text; version=1.0.0; charset=utf-8",
+                )
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _labels(labels: Labels, **extra: str) -> str:
+    pairs = [*labels, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
@@ -0,0 +1,60 @@
+"""Per-turn cost of preparing the chat history for `Runner.run`.
+
+Compares resending a plain `history` list (deep copied by `ItemHelpers.input_to_new_input_list`
+on every run) with an `InputHistory`, which is shallow copied instead. Both grow with the
+history; the shallow copy grows far more slowly.
+
+`items.py` mirrors `agents/items.py`, so run this with that module installed in its place:
+
+    python bench_history.py
+"""
+
+import time
+
+from agents.items import InputHistory, ItemHelpers
+
+TURNS = 1_000
+CHECKPOINTS = (10, 100, 1_000)
+REPEAT = 20
+
+
+def user_message(turn: int):
+    return {"role": "user", "content": f"Question number {turn}, please answer briefly."}
+
+
+def assistant_message(turn: int):
+    return {
+        "id": f"msg_{turn}",
+        "content": [{"annotations": [], "text": f"Answer number {turn}.", "type": "output_text"}],
+        "role": "assistant",
+        "status": "completed",
+        "type": "message",
+    }
+
+
+def time_turn(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main() -> None:
+    plain: list = []
+    history = InputHistory()
+    print(f"{'turn':>6} {'list + deepcopy (us)':>22} {'InputHistory (us)':>19}")
+    for turn in range(1, TURNS + 1):
+        plain.append(user_message(turn))
+        history = history.append(user_message(turn))
+
+        if turn in CHECKPOINTS:
+            plain_us = time_turn(lambda: ItemHelpers.input_to_new_input_list(plain))
+            history_us = time_turn(lambda: ItemHelpers.input_to_new_input_list(history))
+            print(f"{turn:>6} {plain_us:>22.1f} {history_us:>19.1f}")
+
+        plain.append(assistant_message(turn))
+        history = history.append(assistant_message(turn))
+
+
+if __name__ == "__main__":
+    main()
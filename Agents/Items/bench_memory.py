@@ -0,0 +1,81 @@
+"""Bytes per item for a 100k-item transcript of message output items.
+
+Columns:
+- unslotted: the previous `@dataclass` layout, with a per-instance `__dict__`.
+- slotted: `MessageOutputItem` as it is now, `@dataclass(slots=True)`.
+- cached: a slotted item after `to_input_item()`, with `set_input_item_caching(True)`, so it
+  also holds its converted input item.
+- compact: `CompactRunItem`, with the raw item kept as JSON bytes and parsed on demand.
+
+Each figure includes the raw item the run item holds, and is measured with `tracemalloc`.
+
+`items.py` mirrors `agents/items.py`, so run this with that module installed in its place:
+
+    python bench_memory.py
+"""
+
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+from agents import Agent
+from agents.items import CompactRunItem, MessageOutputItem, set_input_item_caching
+
+ITEMS = 100_000
+
+agent = Agent(name="Assistant")
+
+
+@dataclass
+class UnslottedMessageOutputItem:
+    agent: Any
+    raw_item: Any
+    _input_item_cache: Any = None
+    type: str = "message_output_item"
+
+
+def raw_message(n: int) -> ResponseOutputMessage:
+    text = ResponseOutputText(annotations=[], text=f"Answer number {n}.", type="output_text")
+    return ResponseOutputMessage(
+        id=f"msg_{n}", content=[text], role="assistant", status="completed", type="message"
+    )
+
+
+def bytes_per_item(build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [build(n) for n in range(ITEMS)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / ITEMS
+
+
+def cached_item(n: int) -> MessageOutputItem:
+    item = MessageOutputItem(agent=agent, raw_item=raw_message(n))
+    item.to_input_item()
+    return item
+
+
+def main() -> None:
+    unslotted = bytes_per_item(lambda n: UnslottedMessageOutputItem(agent, raw_message(n)))
+    slotted = bytes_per_item(lambda n: MessageOutputItem(agent=agent, raw_item=raw_message(n)))
+    set_input_item_caching(True)
+    cached = bytes_per_item(cached_item)
+    set_input_item_caching(False)
+    compact = bytes_per_item(
+        lambda n: CompactRunItem(MessageOutputItem(agent=agent, raw_item=raw_message(n)))
+    )
+    print(f"{'layout':<10} {'bytes/item':>10}")
+    print(f"{'unslotted':<10} {unslotted:>10.0f}")
+    print(f"{'slotted':<10} {slotted:>10.0f}")
+    print(f"{'cached':<10} {cached:>10.0f}")
+    print(f"{'compact':<10} {compact:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
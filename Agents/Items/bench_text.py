@@ -0,0 +1,93 @@
+"""Cost of aggregating the text of a streamed transcript with 50k message fragments.
+
+Rows:
+- one pass: the text of all fragments at once, with the previous `text += ...` loops and with
+  `ItemHelpers.text_message_outputs` as it is now (one list comprehension, one `"".join`). Best
+  of `REPEATS` runs.
+- per item: the transcript grows one item at a time and the text is followed after every item,
+  as a streaming UI does. Rescanning with `text_message_outputs` reads the whole transcript each
+  time; `TextAccumulator.update` only reads the new items, and the full text is joined once.
+
+`items.py` mirrors `agents/items.py`, so run this with that module installed in its place:
+
+    python bench_text.py
+"""
+
+import time
+
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+from agents import Agent
+from agents.items import ItemHelpers, MessageOutputItem, TextAccumulator
+
+FRAGMENTS = 50_000
+FRAGMENTS_PER_ITEM = 10
+REPEATS = 5
+
+agent = Agent(name="Assistant")
+
+
+def message_item(n: int) -> MessageOutputItem:
+    content = [
+        ResponseOutputText(annotations=[], text=f"chunk {n}.{i} ", type="output_text")
+        for i in range(FRAGMENTS_PER_ITEM)
+    ]
+    message = ResponseOutputMessage(
+        id=f"msg_{n}", content=content, role="assistant", status="completed", type="message"
+    )
+    return MessageOutputItem(agent=agent, raw_item=message)
+
+
+def concat_text_message_outputs(items) -> str:
+    text = ""
+    for item in items:
+        if isinstance(item, MessageOutputItem):
+            for content in item.raw_item.content:
+                if isinstance(content, ResponseOutputText):
+                    text += content.text
+    return text
+
+
+def timed(fn, repeats: int = 1) -> float:
+    """The best of `repeats` runs, in ms."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    items = [message_item(n) for n in range(FRAGMENTS // FRAGMENTS_PER_ITEM)]
+
+    concat_ms = timed(lambda: concat_text_message_outputs(items), REPEATS)
+    join_ms = timed(lambda: ItemHelpers.text_message_outputs(items), REPEATS)
+
+    # The transcript grows by one item at a time, as `result.new_items` does while streaming.
+    def rescan() -> None:
+        transcript: list = []
+        for item in items:
+            transcript.append(item)
+            ItemHelpers.text_message_outputs(transcript)
+
+    def accumulate() -> None:
+        transcript: list = []
+        accumulator = TextAccumulator()
+        for item in items:
+            transcript.append(item)
+            accumulator.update(transcript)
+        accumulator.text
+
+    rescan_ms = timed(rescan)
+    accumulate_ms = timed(accumulate, REPEATS)
+
+    print(f"{FRAGMENTS} fragments in {len(items)} items")
+    print(f"one pass, text += ...        {concat_ms:>10.1f} ms")
+    print(f"one pass, join               {join_ms:>10.1f} ms")
+    print(f"per item, rescan             {rescan_ms:>10.1f} ms")
+    print(f"per item, TextAccumulator    {accumulate_ms:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
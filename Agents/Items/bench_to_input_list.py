@@ -0,0 +1,64 @@
+"""Per-turn cost of converting a transcript of run items back into input items.
+
+Columns:
+- uncached: what `to_input_list()` did before, `model_dump` on every output item every turn.
+- cached: the same full conversion with `set_input_item_caching(True)`.
+- incremental: `InputHistory.extend_run_items`, which only converts the items added this turn.
+
+`items.py` mirrors `agents/items.py`, so run this with that module installed in its place:
+
+    python bench_to_input_list.py
+"""
+
+import time
+
+from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+from agents import Agent
+from agents.items import InputHistory, MessageOutputItem, set_input_item_caching
+
+TURNS = 1_000
+CHECKPOINTS = (10, 100, 1_000)
+REPEAT = 5
+
+agent = Agent(name="Assistant")
+
+
+def message_item(turn: int) -> MessageOutputItem:
+    text = ResponseOutputText(annotations=[], text=f"Answer number {turn}.", type="output_text")
+    message = ResponseOutputMessage(
+        id=f"msg_{turn}", content=[text], role="assistant", status="completed", type="message"
+    )
+    return MessageOutputItem(agent=agent, raw_item=message)
+
+
+def time_turn(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main() -> None:
+    set_input_item_caching(True)
+    items: list[MessageOutputItem] = []
+    history = InputHistory()
+    print(f"{'turn':>6} {'uncached (us)':>15} {'cached (us)':>13} {'incremental (us)':>18}")
+    for turn in range(1, TURNS + 1):
+        new_item = message_item(turn)
+        items.append(new_item)
+
+        start = time.perf_counter()
+        history = history.extend_run_items([new_item])
+        incremental_us = (time.perf_counter() - start) * 1e6
+
+        if turn in CHECKPOINTS:
+            uncached_us = time_turn(
+                lambda: [item.raw_item.model_dump(exclude_unset=True) for item in items]
+            )
+            cached_us = time_turn(lambda: [item.to_input_item() for item in items])
+            print(f"{turn:>6} {uncached_us:>15.1f} {cached_us:>13.1f} {incremental_us:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
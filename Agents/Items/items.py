@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import abc
 import copy
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, Union
+import dataclasses
+import itertools
+import json
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, Union, overload
 
 from openai.types.responses import (
     Response,
@@ -35,7 +39,7 @@ from openai.types.responses.response_output_item import (
     McpListTools,
 )
 from openai.types.responses.response_reasoning_item import ResponseReasoningItem
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing_extensions import TypeAlias
 
 from .exceptions import AgentsException, ModelBehaviorError
@@ -59,7 +63,89 @@ TResponseStreamEvent = ResponseStreamEvent
 T = TypeVar("T", bound=Union[TResponseOutputItem, TResponseInputItem])
 
 
-@dataclass
+def _readonly(*args: Any, **kwargs: Any) -> Any:
+    raise TypeError("input items are read-only; copy.deepcopy() one to change it")
+
+
+class _FrozenDict(dict):  # type: ignore[type-arg]
+    """A read-only dict. Still a `dict`, so the runner, converters and JSON encoders take it as is.
+    Copying it gives a plain, mutable dict."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[Any, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> Any:
+        return dict, (dict(self),)
+
+
+class _FrozenList(list):  # type: ignore[type-arg]
+    """A read-only list, such as a message's `content`. Copying it gives a plain, mutable list."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> Any:
+        return list, (list(self),)
+
+
+def _freeze(value: Any) -> Any:
+    """A read-only deep copy of a JSON-like value: dicts and lists are frozen, other values that
+    aren't immutable scalars are deep copied."""
+    if isinstance(value, (_FrozenDict, _FrozenList, str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, dict):
+        return _FrozenDict({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return _FrozenList([_freeze(item) for item in value])
+    return copy.deepcopy(value)
+
+
+_cache_input_items = False
+
+
+def set_input_item_caching(enabled: bool) -> None:
+    """Turns caching of converted output items on or off for the whole process.
+
+    When on, `RunItemBase.to_input_item()` and `ModelResponse.to_input_items()` keep the converted
+    dict of each output item, so converting a transcript again every turn only dumps new or
+    changed items. Each cached dict is a second copy of its item, roughly doubling the memory a
+    transcript of output items takes, so it is off by default.
+    """
+    global _cache_input_items
+    _cache_input_items = enabled
+
+
+def _dump_output_item(
+    output_item: BaseModel, cached: tuple[BaseModel, tuple[Any, ...], TResponseInputItem] | None
+) -> tuple[BaseModel, tuple[Any, ...], TResponseInputItem]:
+    """Returns the cached `(item, field values, input item)` entry for an output item, dumping it
+    again only if the item was replaced or one of its fields was reassigned since it was cached.
+    """
+    values = tuple(output_item.__dict__.values())
+    # Tuple comparison checks identity before equality, so unchanged fields are compared cheaply.
+    if cached is not None and cached[0] is output_item and cached[1] == values:
+        return cached
+    # Frozen, so callers can't corrupt the cached input item that later calls hand out again.
+    return output_item, values, _freeze(output_item.model_dump(exclude_unset=True))
+
+
+@dataclass(slots=True)
 class RunItemBase(Generic[T], abc.ABC):
     agent: Agent[Any]
     """The agent whose run caused this item to be generated."""
@@ -70,19 +156,36 @@ class RunItemBase(Generic[T], abc.ABC):
     (i.e. `openai.types.responses.ResponseInputItemParam`).
     """
 
+    _input_item_cache: tuple[BaseModel, tuple[Any, ...], TResponseInputItem] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def to_input_item(self) -> TResponseInputItem:
-        """Converts this item into an input item suitable for passing to the model."""
+        """Converts this item into an input item suitable for passing to the model.
+
+        With `set_input_item_caching(True)`, the converted form of an output item is cached, and
+        recomputed if `raw_item` or one of its fields is reassigned. Call
+        `clear_input_item_cache()` after mutating nested content. The cached dict is read-only
+        and raises `TypeError` if changed; `copy.deepcopy()` it for a mutable copy.
+        """
         if isinstance(self.raw_item, dict):
             # We know that input items are dicts, so we can ignore the type error
             return self.raw_item  # type: ignore
         elif isinstance(self.raw_item, BaseModel):
             # All output items are Pydantic models that can be converted to input items.
-            return self.raw_item.model_dump(exclude_unset=True)  # type: ignore
+            if not _cache_input_items:
+                return self.raw_item.model_dump(exclude_unset=True)  # type: ignore
+            self._input_item_cache = _dump_output_item(self.raw_item, self._input_item_cache)
+            return self._input_item_cache[2]  # type: ignore
         else:
             raise AgentsException(f"Unexpected raw item type: {type(self.raw_item)}")
 
+    def clear_input_item_cache(self) -> None:
+        """Drops the cached result of `to_input_item()`."""
+        self._input_item_cache = None
 
-@dataclass
+
+@dataclass(slots=True)
 class MessageOutputItem(RunItemBase[ResponseOutputMessage]):
     """Represents a message from the LLM."""
 
@@ -92,7 +195,7 @@ class MessageOutputItem(RunItemBase[ResponseOutputMessage]):
     type: Literal["message_output_item"] = "message_output_item"
 
 
-@dataclass
+@dataclass(slots=True)
 class HandoffCallItem(RunItemBase[ResponseFunctionToolCall]):
     """Represents a tool call for a handoff from one agent to another."""
 
@@ -102,7 +205,7 @@ class HandoffCallItem(RunItemBase[ResponseFunctionToolCall]):
     type: Literal["handoff_call_item"] = "handoff_call_item"
 
 
-@dataclass
+@dataclass(slots=True)
 class HandoffOutputItem(RunItemBase[TResponseInputItem]):
     """Represents the output of a handoff."""
 
@@ -131,7 +234,7 @@ ToolCallItemTypes: TypeAlias = Union[
 """A type that represents a tool call item."""
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallItem(RunItemBase[ToolCallItemTypes]):
     """Represents a tool call e.g. a function call or computer action call."""
 
@@ -141,7 +244,7 @@ class ToolCallItem(RunItemBase[ToolCallItemTypes]):
     type: Literal["tool_call_item"] = "tool_call_item"
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallOutputItem(
     RunItemBase[Union[FunctionCallOutput, ComputerCallOutput, LocalShellCallOutput]]
 ):
@@ -158,7 +261,7 @@ class ToolCallOutputItem(
     type: Literal["tool_call_output_item"] = "tool_call_output_item"
 
 
-@dataclass
+@dataclass(slots=True)
 class ReasoningItem(RunItemBase[ResponseReasoningItem]):
     """Represents a reasoning item."""
 
@@ -168,7 +271,7 @@ class ReasoningItem(RunItemBase[ResponseReasoningItem]):
     type: Literal["reasoning_item"] = "reasoning_item"
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPListToolsItem(RunItemBase[McpListTools]):
     """Represents a call to an MCP server to list tools."""
 
@@ -178,7 +281,7 @@ class MCPListToolsItem(RunItemBase[McpListTools]):
     type: Literal["mcp_list_tools_item"] = "mcp_list_tools_item"
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPApprovalRequestItem(RunItemBase[McpApprovalRequest]):
     """Represents a request for MCP approval."""
 
@@ -188,7 +291,7 @@ class MCPApprovalRequestItem(RunItemBase[McpApprovalRequest]):
     type: Literal["mcp_approval_request_item"] = "mcp_approval_request_item"
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPApprovalResponseItem(RunItemBase[McpApprovalResponse]):
     """Represents a response to an MCP approval request."""
 
@@ -211,6 +314,84 @@ RunItem: TypeAlias = Union[
 ]
 """An item generated by an agent."""
 
+_RAW_MODEL_TYPES: dict[type[Any], Any] = {
+    MessageOutputItem: ResponseOutputMessage,
+    HandoffCallItem: ResponseFunctionToolCall,
+    ToolCallItem: ToolCallItemTypes,
+    ReasoningItem: ResponseReasoningItem,
+    MCPListToolsItem: McpListTools,
+    MCPApprovalRequestItem: McpApprovalRequest,
+}
+"""The Pydantic type of `raw_item` for each run item class. Classes not listed hold plain dicts."""
+
+_raw_adapters: dict[type[Any], TypeAdapter[Any]] = {}
+
+_BASE_FIELDS = frozenset(("agent", "raw_item", "type", "_input_item_cache"))
+
+_extra_field_names: dict[type[Any], tuple[str, ...]] = {}
+
+
+def _extra_fields(item_type: type[Any]) -> tuple[str, ...]:
+    names = _extra_field_names.get(item_type)
+    if names is None:
+        names = tuple(
+            f.name for f in dataclasses.fields(item_type) if f.name not in _BASE_FIELDS
+        )
+        _extra_field_names[item_type] = names
+    return names
+
+
+class CompactRunItem:
+    """A run item with its raw item stored as JSON bytes, for transcripts kept in memory for a
+    long time.
+
+    The raw item is only parsed back into its Pydantic model when `raw_item` is first read, and
+    `materialize()` rebuilds the original run item. The agent is kept by reference, so every item
+    of a transcript shares the same few `Agent` objects.
+    """
+
+    __slots__ = ("item_type", "agent", "extra", "raw_json", "_raw_item")
+
+    item_type: type[RunItemBase[Any]]
+    agent: Agent[Any]
+    extra: tuple[Any, ...]
+    """Values of the item's own fields, e.g. `output` or `source_agent` and `target_agent`."""
+    raw_json: bytes
+    _raw_item: Any
+
+    def __init__(self, item: RunItem) -> None:
+        self.item_type = type(item)
+        self.agent = item.agent
+        self.extra = tuple(getattr(item, name) for name in _extra_fields(self.item_type))
+        self.raw_json = json.dumps(item.to_input_item(), separators=(",", ":")).encode()
+        self._raw_item = None
+
+    @property
+    def raw_item(self) -> Any:
+        """The raw item, parsed from `raw_json` on first access."""
+        if self._raw_item is None:
+            model_type = _RAW_MODEL_TYPES.get(self.item_type)
+            if model_type is None:
+                self._raw_item = json.loads(self.raw_json)
+            else:
+                adapter = _raw_adapters.get(self.item_type)
+                if adapter is None:
+                    adapter = _raw_adapters[self.item_type] = TypeAdapter(model_type)
+                self._raw_item = adapter.validate_json(self.raw_json)
+        return self._raw_item
+
+    def release(self) -> None:
+        """Drops the parsed raw item, keeping only the JSON bytes."""
+        self._raw_item = None
+
+    def to_input_item(self) -> TResponseInputItem:
+        return json.loads(self.raw_json)  # type: ignore
+
+    def materialize(self) -> RunItem:
+        """Rebuilds the original run item."""
+        extra = dict(zip(_extra_fields(self.item_type), self.extra))
+        return self.item_type(agent=self.agent, raw_item=self.raw_item, **extra)  # type: ignore
+
 
 @dataclass
 class ModelResponse:
@@ -227,12 +408,173 @@ class ModelResponse:
     be passed to `Runner.run`.
     """
 
+    _input_items_cache: list[tuple[BaseModel, tuple[Any, ...], TResponseInputItem]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
     def to_input_items(self) -> list[TResponseInputItem]:
         """Convert the output into a list of input items suitable for passing to the model."""
         # We happen to know that the shape of the Pydantic output items are the same as the
         # equivalent TypedDict input items, so we can just convert each one.
         # This is also tested via unit tests.
-        return [it.model_dump(exclude_unset=True) for it in self.output]  # type: ignore
+        if not _cache_input_items:
+            return [it.model_dump(exclude_unset=True) for it in self.output]  # type: ignore
+        # Each converted item is cached by position, so only new or changed outputs are dumped.
+        # The cached items are read-only, like those of `RunItemBase.to_input_item()`.
+        cache = self._input_items_cache
+        del cache[len(self.output) :]
+        for index, output_item in enumerate(self.output):
+            cached = cache[index] if index < len(cache) else None
+            entry = _dump_output_item(output_item, cached)
+            if index < len(cache):
+                cache[index] = entry
+            else:
+                cache.append(entry)
+        return [entry[2] for entry in cache]  # type: ignore
+
+
+class InputHistory(Sequence[TResponseInputItem]):
+    """An immutable, append-only sequence of input items.
+
+    `append` and `extend` return a new history rather than mutating this one. A history and the
+    histories derived from it share one backing list, so adding items only costs copying the new
+    items. Items are copied once when they are added, into read-only dicts and lists that raise
+    `TypeError` if changed, so every history, and every list taken from one, can share them. That
+    lets the runner shallow copy a history every run instead of deep copying it. `copy.deepcopy()`
+    an item for a mutable copy.
+    """
+
+    __slots__ = ("_items", "_length")
+
+    _items: list[TResponseInputItem]
+    _length: int
+
+    def __init__(self, items: Iterable[TResponseInputItem] = ()) -> None:
+        self._items = [_freeze(item) for item in items]
+        self._length = len(self._items)
+
+    @classmethod
+    def _view(cls, items: list[TResponseInputItem], length: int) -> InputHistory:
+        history = cls.__new__(cls)
+        history._items = items
+        history._length = length
+        return history
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> TResponseInputItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TResponseInputItem]: ...
+
+    def __getitem__(self, index: int | slice) -> TResponseInputItem | list[TResponseInputItem]:
+        if isinstance(index, slice):
+            return self.to_list()[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("InputHistory index out of range")
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[TResponseInputItem]:
+        return itertools.islice(self._items, self._length)
+
+    def __repr__(self) -> str:
+        return f"InputHistory({self.to_list()!r})"
+
+    def __copy__(self) -> InputHistory:
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> InputHistory:
+        # Immutable all the way down, so the runner's defensive deep copies can share it.
+        return self
+
+    def append(self, item: TResponseInputItem) -> InputHistory:
+        """Returns a new history with the item added to the end."""
+        return self.extend((item,))
+
+    def extend(self, items: Iterable[TResponseInputItem]) -> InputHistory:
+        """Returns a new history with the items added to the end."""
+        new_items = [_freeze(item) for item in items]
+        if self._length == len(self._items):
+            # This is the newest history on the backing list, so it can grow in place without
+            # affecting older histories, which only see their own prefix.
+            items_list = self._items
+        else:
+            # A newer history already extended the backing list, so branch off a copy.
+            items_list = self._items[: self._length]
+        items_list.extend(new_items)
+        return self._view(items_list, len(items_list))
+
+    def extend_run_items(self, items: Iterable[RunItem]) -> InputHistory:
+        """Returns a new history with the run items added as input items.
+
+        Use this instead of `result.to_input_list()` to carry a conversation into the next turn:
+        the previous turn's items are shared rather than converted and copied again.
+        """
+        return self.extend(item.to_input_item() for item in items)
+
+    def to_list(self) -> list[TResponseInputItem]:
+        """Returns a new list containing the items. The items are the history's read-only ones,
+        not copies, so this is a shallow copy: cheap, but still linear in the length."""
+        return self._items[: self._length]
+
+
+class TextAccumulator:
+    """Collects text fragments in a list and joins them only when the text is read.
+
+    `update` takes a growing list of run items, such as `result.new_items` during a streamed run,
+    only reads the items added since the previous call, and returns just their text, so following
+    a stream costs the size of what's new. Reading `text` joins the fragments once and caches the
+    result until more text arrives; read it when the whole text is needed, not after every update.
+    """
+
+    __slots__ = ("_fragments", "_consumed", "_text")
+
+    _fragments: list[str]
+    _consumed: int
+    _text: str | None
+
+    def __init__(self) -> None:
+        self._fragments = []
+        self._consumed = 0
+        self._text = ""
+
+    def append(self, fragment: str) -> None:
+        """Adds a fragment of text, e.g. the delta of a `ResponseTextDeltaEvent`."""
+        if fragment:
+            self._fragments.append(fragment)
+            self._text = None
+
+    def update(self, items: Sequence[RunItem]) -> str:
+        """Adds the text of the message output items in `items` that were not seen before, and
+        returns that new text. `items` must only ever grow between calls."""
+        start = len(self._fragments)
+        # Indexed rather than `islice`d, which would step through every item already consumed.
+        for index in range(self._consumed, len(items)):
+            item = items[index]
+            if isinstance(item, MessageOutputItem):
+                for content in item.raw_item.content:
+                    if isinstance(content, ResponseOutputText):
+                        self.append(content.text)
+        self._consumed = max(self._consumed, len(items))
+        return "".join(self._fragments[start:])
+
+    @property
+    def text(self) -> str:
+        """All the text so far."""
+        if self._text is None:
+            self._text = "".join(self._fragments)
+            # Keep the joined text as the only fragment, so the next join starts from it.
+            self._fragments = [self._text]
+        return self._text
+
+    def clear(self) -> None:
+        self._fragments = []
+        self._consumed = 0
+        self._text = ""
 
 
 class ItemHelpers:
@@ -262,7 +604,7 @@ class ItemHelpers:
 
     @classmethod
     def input_to_new_input_list(
-        cls, input: str | list[TResponseInputItem]
+        cls, input: str | list[TResponseInputItem] | InputHistory
     ) -> list[TResponseInputItem]:
         """Converts a string or list of input items into a list of input items."""
         if isinstance(input, str):
@@ -272,25 +614,30 @@ class ItemHelpers:
                     "role": "user",
                 }
             ]
+        if isinstance(input, InputHistory):
+            # History items are read-only, so a shallow copy is safe.
+            return input.to_list()
         return copy.deepcopy(input)
 
     @classmethod
     def text_message_outputs(cls, items: list[RunItem]) -> str:
         """Concatenates all the text content from a list of message output items."""
-        text = ""
-        for item in items:
-            if isinstance(item, MessageOutputItem):
-                text += cls.text_message_output(item)
-        return text
+        return "".join(
+            [
+                content.text
+                for item in items
+                if isinstance(item, MessageOutputItem)
+                for content in item.raw_item.content
+                if isinstance(content, ResponseOutputText)
+            ]
+        )
 
     @classmethod
     def text_message_output(cls, message: MessageOutputItem) -> str:
         """Extracts all the text content from a single message output item."""
-        text = ""
-        for item in message.raw_item.content:
-            if isinstance(item, ResponseOutputText):
-                text += item.text
-        return text
+        return "".join(
+            [item.text for item in message.raw_item.content if isinstance(item, ResponseOutputText)]
+        )
 
     @classmethod
     def tool_call_output_item(
@@ -0,0 +1,110 @@
+"""Runner latency with 0, 1 and 10 hook subscribers, awaited inline or dispatched.
+
+Each subscriber formats a `Usage` string for every event and then waits `HOOK_SECONDS`, like a
+hook that prints or logs somewhere slow. The model is a fake with no latency, so the numbers are
+the runner plus whatever the hooks put on its critical path.
+
+    python bench_hooks.py
+"""
+
+import asyncio
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from agents import Agent, RunHooks, Runner, function_tool, set_tracing_disabled
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "Load_Test"))
+from dispatcher import DispatchingRunHooks
+from fake_model import FakeModel, text, tool_call
+
+HOOK_SECONDS = 0.002
+RUNS = 50
+
+
+@function_tool
+def random_number(max: int) -> int:
+    """Generate a random number up to the provided max."""
+    return 101
+
+
+def make_agent() -> Agent:
+    """An agent whose model calls `random_number` once, then answers."""
+    model = FakeModel([tool_call("random_number", max=250), text("101")])
+    return Agent(name="Start Agent", tools=[random_number], model=model)
+
+
+class SlowHooks(RunHooks):
+    def __init__(self) -> None:
+        self.out = io.StringIO()
+
+    async def _log(self, context, message: str) -> None:
+        usage = context.usage
+        self.out.write(f"{message}. Usage: {usage.requests} requests, {usage.total_tokens} tokens\n")
+        await asyncio.sleep(HOOK_SECONDS)
+
+    async def on_agent_start(self, context, agent) -> None:
+        await self._log(context, f"Agent {agent.name} started")
+
+    async def on_agent_end(self, context, agent, output) -> None:
+        await self._log(context, f"Agent {agent.name} ended with {output}")
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        await self._log(context, f"Tool {tool.name} started")
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        await self._log(context, f"Tool {tool.name} ended with {result}")
+
+
+class InlineHooks(RunHooks):
+    """Awaits every subscriber in turn, as a plain `RunHooks` fan-out would."""
+
+    def __init__(self, subscribers) -> None:
+        self.subscribers = subscribers
+
+    async def on_agent_start(self, context, agent) -> None:
+        for s in self.subscribers:
+            await s.on_agent_start(context, agent)
+
+    async def on_agent_end(self, context, agent, output) -> None:
+        for s in self.subscribers:
+            await s.on_agent_end(context, agent, output)
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        for s in self.subscribers:
+            await s.on_tool_start(context, agent, tool)
+
+    async def on_tool_end(self, context, agent, tool, result) -> None:
+        for s in self.subscribers:
+            await s.on_tool_end(context, agent, tool, result)
+
+
+async def median_ms(make_hooks) -> float:
+    latencies = []
+    for _ in range(RUNS):
+        # A new model per run, since a `FakeModel` replays its script once.
+        agent = make_agent()
+        hooks = make_hooks()
+        start = time.perf_counter()
+        await Runner.run(agent, "Generate a random number.", hooks=hooks)
+        latencies.append(time.perf_counter() - start)
+        if isinstance(hooks, DispatchingRunHooks):
+            await hooks.aclose()
+    return statistics.median(latencies) * 1e3
+
+
+async def main() -> None:
+    set_tracing_disabled(True)
+    print(f"{'subscribers':>11} {'inline (ms)':>12} {'fire-and-forget (ms)':>21} {'batched (ms)':>13}")
+    for count in (0, 1, 10):
+        subscribers = [SlowHooks() for _ in range(count)]
+        inline = await median_ms(lambda: InlineHooks(subscribers))
+        fire = await median_ms(lambda: DispatchingRunHooks(subscribers))
+        batched = await median_ms(lambda: DispatchingRunHooks(subscribers, mode="batched"))
+        print(f"{count:>11} {inline:>12.2f} {fire:>21.2f} {batched:>13.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
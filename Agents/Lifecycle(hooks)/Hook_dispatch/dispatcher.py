@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from agents import Agent, AgentHooks, RunContextWrapper, RunHooks, Tool
+
+logger = logging.getLogger(__name__)
+
+DispatchMode = Literal["fire_and_forget", "batched"]
+DropPolicy = Literal["block", "drop_newest", "drop_oldest"]
+
+
+@dataclass(frozen=True)
+class HookEvent:
+    """One hook call, queued for delivery: the method name and the arguments after `self`."""
+
+    method: str
+    args: tuple[Any, ...]
+
+
+@dataclass
+class DispatchStats:
+    queued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    """Events discarded because the queue was full, under a `drop_*` policy."""
+    errors: int = 0
+    """Hook calls that raised. They are logged and do not stop delivery."""
+
+
+class _Dispatcher:
+    def __init__(
+        self,
+        subscribers: Sequence[Any],
+        base: type,
+        methods: Sequence[str],
+        mode: DispatchMode,
+        max_queue: int,
+        drop_policy: DropPolicy,
+        batch_size: int,
+        flush_interval: float,
+    ) -> None:
+        self.mode = mode
+        self.drop_policy = drop_policy
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = DispatchStats()
+        # Only subscribers that override a method receive it; methods nobody overrides are not
+        # even queued.
+        self.targets: dict[str, tuple[Any, ...]] = {
+            method: tuple(
+                subscriber
+                for subscriber in subscribers
+                if getattr(type(subscriber), method) is not getattr(base, method)
+            )
+            for method in methods
+        }
+        self.batch_subscribers = tuple(s for s in subscribers if hasattr(s, "on_batch"))
+        self._queue: asyncio.Queue[HookEvent] | None = None
+        self._max_queue = max_queue
+        self._consumer: asyncio.Task[None] | None = None
+
+    def wants(self, method: str) -> bool:
+        return bool(self.targets[method]) or bool(self.batch_subscribers)
+
+    async def emit(self, method: str, args: tuple[Any, ...]) -> None:
+        queue = self._ensure_consumer()
+        event = HookEvent(method, args)
+        if self.drop_policy == "block":
+            await queue.put(event)
+        else:
+            if queue.full():
+                if self.drop_policy == "drop_newest":
+                    self.stats.dropped += 1
+                    return
+                queue.get_nowait()
+                queue.task_done()
+                self.stats.dropped += 1
+            queue.put_nowait(event)
+        self.stats.queued += 1
+
+    async def flush(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        await self.flush()
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+
+    def _ensure_consumer(self) -> asyncio.Queue[HookEvent]:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_queue)
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.get_running_loop().create_task(self._consume())
+        return self._queue
+
+    async def _consume(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            events = [await queue.get()]
+            if self.mode == "batched":
+                deadline = asyncio.get_running_loop().time() + self.flush_interval
+                while len(events) < self.batch_size:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        events.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            try:
+                await self._deliver(events)
+            finally:
+                for _ in events:
+                    queue.task_done()
+
+    async def _deliver(self, events: list[HookEvent]) -> None:
+        for subscriber in self.batch_subscribers:
+            await self._call(subscriber.on_batch, (events,))
+        for event in events:
+            for subscriber in self.targets[event.method]:
+                if subscriber in self.batch_subscribers:
+                    continue
+                await self._call(getattr(subscriber, event.method), event.args)
+            self.stats.delivered += 1
+
+    async def _call(self, method: Any, args: tuple[Any, ...]) -> None:
+        try:
+            await method(*args)
+        except Exception:
+            self.stats.errors += 1
+            logger.exception("Hook %s failed", getattr(method, "__qualname__", method))
+
+
+class DispatchingRunHooks(RunHooks[Any]):
+    """`RunHooks` that hand every event to a background task instead of awaiting the subscribers
+    on the run's critical path.
+
+    - `fire_and_forget` delivers events one at a time, as soon as the consumer gets to them.
+    - `batched` collects up to `batch_size` events, or whatever arrived within `flush_interval`
+      seconds, and delivers them together. Subscribers with an `on_batch(events)` method get the
+      whole chunk in one call instead of one call per event.
+
+    The queue holds `max_queue` events. When it is full, `drop_policy` decides: `block` waits
+    for room (backpressure on the run), `drop_newest` discards the new event and `drop_oldest`
+    the oldest queued one.
+
+    Subscribers see the run context as it is when the event is delivered, not when it was
+    queued, so values like `context.usage` may already include later requests. Call
+    `await hooks.flush()` to wait for every queued event, e.g. before printing a summary.
+    """
+
+    _METHODS = ("on_agent_start", "on_agent_end", "on_handoff", "on_tool_start", "on_tool_end")
+
+    def __init__(
+        self,
+        subscribers: Sequence[RunHooks[Any]],
+        mode: DispatchMode = "fire_and_forget",
+        max_queue: int = 1000,
+        drop_policy: DropPolicy = "block",
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self._dispatcher = _Dispatcher(
+            subscribers, RunHooks, self._METHODS, mode, max_queue, drop_policy, batch_size,
+            flush_interval,
+        )
+        self._wants = {method: self._dispatcher.wants(method) for method in self._METHODS}
+
+    @property
+    def stats(self) -> DispatchStats:
+        return self._dispatcher.stats
+
+    async def flush(self) -> None:
+        await self._dispatcher.flush()
+
+    async def aclose(self) -> None:
+        await self._dispatcher.aclose()
+
+    async def on_agent_start(self, context: RunContextWrapper[Any], agent: Agent[Any]) -> None:
+        if self._wants["on_agent_start"]:
+            await self._dispatcher.emit("on_agent_start", (context, agent))
+
+    async def on_agent_end(
+        self, context: RunContextWrapper[Any], agent: Agent[Any], output: Any
+    ) -> None:
+        if self._wants["on_agent_end"]:
+            await self._dispatcher.emit("on_agent_end", (context, agent, output))
+
+    async def on_handoff(
+        self, context: RunContextWrapper[Any], from_agent: Agent[Any], to_agent: Agent[Any]
+    ) -> None:
+        if self._wants["on_handoff"]:
+            await self._dispatcher.emit("on_handoff", (context, from_agent, to_agent))
+
+    async def on_tool_start(
+        self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool
+    ) -> None:
+        if self._wants["on_tool_start"]:
+            await self._dispatcher.emit("on_tool_start", (context, agent, tool))
+
+    async def on_tool_end(
+        self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool, result: str
+    ) -> None:
+        if self._wants["on_tool_end"]:
+            await self._dispatcher.emit("on_tool_end", (context, agent, tool, result))
+
+
+class DispatchingAgentHooks(AgentHooks[Any]):
+    """The `AgentHooks` counterpart of `DispatchingRunHooks`, for `agent.hooks`."""
+
+    _METHODS = ("on_start", "on_end", "on_handoff", "on_tool_start", "on_tool_end")
+
+    def __init__(
+        self,
+        subscribers: Sequence[AgentHooks[Any]],
+        mode: DispatchMode = "fire_and_forget",
+        max_queue: int = 1000,
+        drop_policy: DropPolicy = "block",
+        batch_size: int = 64,
+        flush_interval: float = 0.05,
+    ) -> None:
+        self._dispatcher = _Dispatcher(
+            subscribers, AgentHooks, self._METHODS, mode, max_queue, drop_policy, batch_size,
+            flush_interval,
+        )
+        self._wants = {method: self._dispatcher.wants(method) for method in self._METHODS}
+
+    @property
+    def stats(self) -> DispatchStats:
+        return self._dispatcher.stats
+
+    async def flush(self) -> None:
+        await self._dispatcher.flush()
+
+    async def aclose(self) -> None:
+        await self._dispatcher.aclose()
+
+    async def on_start(self, context: RunContextWrapper[Any], agent: Agent[Any]) -> None:
+        if self._wants["on_start"]:
+            await self._dispatcher.emit("on_start", (context, agent))
+
+    async def on_end(self, context: RunContextWrapper[Any], agent: Agent[Any], output: Any) -> None:
+        if self._wants["on_end"]:
+            await self._dispatcher.emit("on_end", (context, agent, output))
+
+    async def on_handoff(
+        self, context: RunContextWrapper[Any], agent: Agent[Any], source: Agent[Any]
+    ) -> None:
+        if self._wants["on_handoff"]:
+            await self._dispatcher.emit("on_handoff", (context, agent, source))
+
+    async def on_tool_start(
+        self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool
+    ) -> None:
+        if self._wants["on_tool_start"]:
+            await self._dispatcher.emit("on_tool_start", (context, agent, tool))
+
+    async def on_tool_end(
+        self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool, result: str
+    ) -> None:
+        if self._wants["on_tool_end"]:
+            await self._dispatcher.emit("on_tool_end", (context, agent, tool, result))
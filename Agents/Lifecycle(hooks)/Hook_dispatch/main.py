@@ -0,0 +1,117 @@
+import asyncio
+import random
+from typing import Any
+import os
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, RunHooks, Runner, Tool, Usage, function_tool
+
+from dispatcher import DispatchingRunHooks
+
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   )
+
+
+class ExampleHooks(RunHooks):
+    def __init__(self):
+        self.event_counter = 0
+
+    def _usage_to_str(self, usage: Usage) -> str:
+        return f"{usage.requests} requests, {usage.input_tokens} input tokens, {usage.output_tokens} output tokens, {usage.total_tokens} total tokens"
+
+    async def on_agent_start(self, context: RunContextWrapper, agent: Agent) -> None:
+        self.event_counter += 1
+        print(
+            f"### {self.event_counter}: Agent {agent.name} started. Usage: {self._usage_to_str(context.usage)}"
+        )
+
+    async def on_agent_end(self, context: RunContextWrapper, agent: Agent, output: Any) -> None:
+        self.event_counter += 1
+        print(
+            f"### {self.event_counter}: Agent {agent.name} ended with output {output}. Usage: {self._usage_to_str(context.usage)}"
+        )
+
+    async def on_tool_start(self, context: RunContextWrapper, agent: Agent, tool: Tool) -> None:
+        self.event_counter += 1
+        print(
+            f"### {self.event_counter}: Tool {tool.name} started. Usage: {self._usage_to_str(context.usage)}"
+        )
+
+    async def on_tool_end(
+        self, context: RunContextWrapper, agent: Agent, tool: Tool, result: str
+    ) -> None:
+        self.event_counter += 1
+        print(
+            f"### {self.event_counter}: Tool {tool.name} ended with result {result}. Usage: {self._usage_to_str(context.usage)}"
+        )
+
+
+# ExampleHooks no longer runs inline: its printing happens on a background task. It does not
+# override `on_handoff`, so handoff events are never even queued.
+hooks = DispatchingRunHooks([ExampleHooks()], mode = "fire_and_forget", max_queue = 100, drop_policy = "block")
+
+###
+
+
+@function_tool
+def random_number(max: int) -> int:
+    """Generate a random number up to the provided max."""
+    return random.randint(0, max)
+
+
+@function_tool
+def multiply_by_two(x: int) -> int:
+    """Return x times two."""
+    return x * 2
+
+
+class FinalResult(BaseModel):
+    number: int
+
+
+multiply_agent = Agent(
+    name="Multiply Agent",
+    instructions="Multiply the number by 2 and then return the final result.",
+    tools=[multiply_by_two],
+    output_type=FinalResult,
+    model = model
+)
+
+start_agent = Agent(
+    name="Start Agent",
+    instructions="Generate a random number. If it's even, stop. If it's odd, hand off to the multiplier agent.",
+    tools=[random_number],
+    output_type=FinalResult,
+    handoffs=[multiply_agent],
+    model = model
+)
+
+
+async def main() -> None:
+    user_input = input("Enter a max number: ")
+    await Runner.run(
+        start_agent,
+        hooks=hooks,
+        input=f"Generate a random number between 0 and {user_input}.",
+        run_config = config
+    )
+
+    # Wait for the queued hook events before finishing.
+    await hooks.aclose()
+    print("Done!")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, ModelResponse, TResponseInputItem, Usage
+from agents.handoffs import Handoff
+from agents.items import TResponseOutputItem, TResponseStreamEvent
+from agents.models.interface import Model
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+
+
+@dataclass
+class FakeTurn:
+    """One scripted model response: some text, some tool calls, or both."""
+
+    text: str | None = None
+    """The assistant message. For agents with an `output_type`, the JSON of the output."""
+
+    tool_calls: list[tuple[str, dict[str, Any]]] = field(default_factory=list)
+    """`(tool name, arguments)` pairs, called in one turn."""
+
+    latency: float | None = None
+    """Seconds before the response (or its first delta) arrives. Defaults to the model's."""
+
+
+def text(value: str | dict[str, Any], latency: float | None = None) -> FakeTurn:
+    """A turn that answers with text, or with the JSON of `value` if it is a dict."""
+    return FakeTurn(text=value if isinstance(value, str) else json.dumps(value), latency=latency)
+
+
+def tool_call(name: str, latency: float | None = None, **arguments: Any) -> FakeTurn:
+    return FakeTurn(tool_calls=[(name, arguments)], latency=latency)
+
+
+def handoff_call(agent: Agent[Any], latency: float | None = None) -> FakeTurn:
+    """A turn that hands off to `agent` through its default handoff tool."""
+    return FakeTurn(tool_calls=[(Handoff.default_tool_name(agent), {})], latency=latency)
+
+
+class FakeModel(Model):
+    """A `Model` that replays a script instead of calling a provider.
+
+    Each call returns the next `FakeTurn` of `turns`; once the script runs out, the last turn is
+    repeated. Give every agent, and every concurrent session, its own `FakeModel`, since the
+    position in the script is per instance.
+
+    Streamed calls emit the text in `chunk_size` character deltas, `chunk_delay` seconds apart,
+    followed by a `response.completed` event, the way the Responses API does.
+    """
+
+    def __init__(
+        self,
+        turns: list[FakeTurn],
+        latency: float = 0.0,
+        chunk_size: int = 8,
+        chunk_delay: float = 0.0,
+        name: str = "fake-model",
+    ) -> None:
+        if not turns:
+            raise ValueError("FakeModel needs at least one turn")
+        self.turns = turns
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.name = name
+        self.calls = 0
+        self.time_in_model = 0.0
+        """Seconds spent in simulated latency, so callers can subtract it from wall time."""
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        *args: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        turn = self._next_turn()
+        await self._sleep(self._latency(turn))
+        output = self._output(turn)
+        return ModelResponse(output=output, usage=self._usage(input, turn), response_id=None)
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        turn = self._next_turn()
+        output = self._output(turn)
+        sequence = 0
+
+        yield ResponseCreatedEvent(
+            type="response.created", response=self._response([]), sequence_number=sequence
+        )
+        await self._sleep(self._latency(turn))
+
+        if turn.text is not None:
+            for start in range(0, len(turn.text), self.chunk_size):
+                if start:
+                    await self._sleep(self.chunk_delay)
+                sequence += 1
+                yield ResponseTextDeltaEvent(
+                    type="response.output_text.delta",
+                    item_id=output[0].id,
+                    output_index=0,
+                    content_index=0,
+                    delta=turn.text[start : start + self.chunk_size],
+                    logprobs=[],
+                    sequence_number=sequence,
+                )
+
+        sequence += 1
+        yield ResponseCompletedEvent(
+            type="response.completed", response=self._response(output), sequence_number=sequence
+        )
+
+    def _next_turn(self) -> FakeTurn:
+        turn = self.turns[min(self.calls, len(self.turns) - 1)]
+        self.calls += 1
+        return turn
+
+    def _latency(self, turn: FakeTurn) -> float:
+        return self.latency if turn.latency is None else turn.latency
+
+    async def _sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            start = time.perf_counter()
+            await asyncio.sleep(seconds)
+            self.time_in_model += time.perf_counter() - start
+
+    def _output(self, turn: FakeTurn) -> list[TResponseOutputItem]:
+        output: list[TResponseOutputItem] = []
+        if turn.text is not None:
+            output.append(
+                ResponseOutputMessage(
+                    id=f"msg_{self.calls}",
+                    content=[ResponseOutputText(text=turn.text, type="output_text", annotations=[])],
+                    role="assistant",
+                    status="completed",
+                    type="message",
+                )
+            )
+        for index, (name, arguments) in enumerate(turn.tool_calls):
+            output.append(
+                ResponseFunctionToolCall(
+                    id=f"fc_{self.calls}_{index}",
+                    call_id=f"call_{self.calls}_{index}",
+                    name=name,
+                    arguments=json.dumps(arguments),
+                    type="function_call",
+                    status="completed",
+                )
+            )
+        return output
+
+    def _response(self, output: list[TResponseOutputItem]) -> Response:
+        return Response(
+            id=f"resp_{self.calls}",
+            created_at=time.time(),
+            model=self.name,
+            object="response",
+            output=output,
+            tool_choice="auto",
+            tools=[],
+            top_p=None,
+            parallel_tool_calls=False,
+        )
+
+    @staticmethod
+    def _usage(input: str | list[TResponseInputItem], turn: FakeTurn) -> Usage:
+        # About four characters per token, so token counts scale with the conversation.
+        input_tokens = len(input if isinstance(input, str) else json.dumps(input, default=str)) // 4
+        output_tokens = len(turn.text or "") // 4 + 10 * len(turn.tool_calls)
+        return Usage(
+            requests=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
@@ -0,0 +1,233 @@
+"""The agent graphs of `Agents/Handoffs`, `Agents/Max_turns` and `Agents/Lifecycle(hooks)/Run_hook`,
+rebuilt on `FakeModel`.
+
+Those scripts create a Gemini client at import time, so they cannot be imported without a key.
+The agents, tools and handoffs here match them; the model's decisions are scripted. Each
+function builds a fresh graph, since a `FakeModel` keeps its place in the script.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, RunContextWrapper, RunHooks, Runner, Tool, function_tool, handoff
+from agents.extensions import handoff_filters
+from pydantic import BaseModel
+
+from fake_model import FakeModel, handoff_call, text, tool_call
+
+
+@dataclass
+class Session:
+    """One load-test session: `run` drives the graph's agents with `Runner`."""
+
+    run: Callable[[], Awaitable[None]]
+    models: list[FakeModel] = field(default_factory=list)
+
+    @property
+    def turns(self) -> int:
+        return sum(model.calls for model in self.models)
+
+    @property
+    def time_in_model(self) -> float:
+        return sum(model.time_in_model for model in self.models)
+
+
+def handoffs_graph(latency: float, stream: bool) -> Session:
+    """Greets, generates a random number, then hands off to the Spanish assistant."""
+
+    @function_tool
+    def random_number_tool(max: int) -> int:
+        """Return a random integer between 0 and the given maximum."""
+        return random.randint(0, max)
+
+    first_model = FakeModel(
+        [
+            text("Hi Sora!"),
+            tool_call("random_number_tool", max=100),
+            text("Here is a random number: 42."),
+        ],
+        latency=latency,
+    )
+    spanish_model = FakeModel([text("Te llamas Sora.")], latency=latency)
+
+    first_agent = Agent(
+        name="Assistant",
+        instructions="Be extremely concise.",
+        tools=[random_number_tool],
+        model=first_model,
+    )
+    spanish_agent = Agent(
+        name="Spanish Assistant",
+        instructions="You only speak Spanish and are extremely concise.",
+        handoff_description="A Spanish-speaking assistant.",
+        model=spanish_model,
+    )
+    second_model = FakeModel([handoff_call(spanish_agent)], latency=latency)
+    second_agent = Agent(
+        name="Assistant",
+        instructions=(
+            "Be a helpful assistant. If the user speaks Spanish, handoff to the Spanish assistant."
+        ),
+        handoffs=[handoff(spanish_agent, input_filter=handoff_filters.remove_all_tools)],
+        model=second_model,
+    )
+
+    async def run() -> None:
+        result = await _run(first_agent, "Hi, my name is Sora.", stream)
+        result = await _run(
+            first_agent,
+            result.to_input_list()
+            + [{"content": "Can you generate a random number between 0 and 100?", "role": "user"}],
+            stream,
+        )
+        await _run(
+            second_agent,
+            result.to_input_list()
+            + [{"content": "Por favor habla en español. ¿Cuál es mi nombre?", "role": "user"}],
+            stream,
+        )
+
+    return Session(run=run, models=[first_model, spanish_model, second_model])
+
+
+def max_turns_graph(latency: float, stream: bool) -> Session:
+    """Calls the weather, time, date and user id tools one per turn, then answers."""
+
+    @function_tool
+    def get_weather_tool():
+        return "FAisalabad weather is sunny!"
+
+    @function_tool
+    def get_time_tool():
+        return "Current time is 3:45 PM!"
+
+    @function_tool
+    def get_date_tool():
+        return "Today's date is December 15, 2024!"
+
+    @function_tool
+    def get_user_id():
+        return "User ID is 1234"
+
+    model = FakeModel(
+        [
+            tool_call("get_weather_tool"),
+            tool_call("get_time_tool"),
+            tool_call("get_date_tool"),
+            tool_call("get_user_id"),
+            text("It is sunny, 3:45 PM on December 15, 2024, and your user ID is 1234."),
+        ],
+        latency=latency,
+    )
+    agent = Agent(
+        name="Multi-tool agent",
+        instructions="You are a helpful assistant that can provide weather, time, date, and user information.",
+        tools=[get_weather_tool, get_time_tool, get_date_tool, get_user_id],
+        model=model,
+    )
+
+    async def run() -> None:
+        await _run(
+            agent,
+            "What is the weather, current time, today's date, and give me user details?",
+            stream,
+            max_turns=10,
+        )
+
+    return Session(run=run, models=[model])
+
+
+class FinalResult(BaseModel):
+    number: int
+
+
+class CountingHooks(RunHooks):
+    """`Run_hook`'s `ExampleHooks`, counting events instead of printing them."""
+
+    def __init__(self) -> None:
+        self.event_counter = 0
+
+    async def on_agent_start(self, context: RunContextWrapper, agent: Agent) -> None:
+        self.event_counter += 1
+
+    async def on_agent_end(self, context: RunContextWrapper, agent: Agent, output: Any) -> None:
+        self.event_counter += 1
+
+    async def on_tool_start(self, context: RunContextWrapper, agent: Agent, tool: Tool) -> None:
+        self.event_counter += 1
+
+    async def on_tool_end(
+        self, context: RunContextWrapper, agent: Agent, tool: Tool, result: str
+    ) -> None:
+        self.event_counter += 1
+
+    async def on_handoff(
+        self, context: RunContextWrapper, from_agent: Agent, to_agent: Agent
+    ) -> None:
+        self.event_counter += 1
+
+
+def run_hook_graph(latency: float, stream: bool) -> Session:
+    """Generates an odd number, hands off to the multiplier, and returns the doubled number."""
+
+    @function_tool
+    def random_number(max: int) -> int:
+        """Generate a random number up to the provided max."""
+        return 101
+
+    @function_tool
+    def multiply_by_two(x: int) -> int:
+        """Return x times two."""
+        return x * 2
+
+    multiply_model = FakeModel(
+        [tool_call("multiply_by_two", x=101), text({"number": 202})], latency=latency
+    )
+    multiply_agent = Agent(
+        name="Multiply Agent",
+        instructions="Multiply the number by 2 and then return the final result.",
+        tools=[multiply_by_two],
+        output_type=FinalResult,
+        model=multiply_model,
+    )
+    start_model = FakeModel(
+        [tool_call("random_number", max=250), handoff_call(multiply_agent)], latency=latency
+    )
+    start_agent = Agent(
+        name="Start Agent",
+        instructions="Generate a random number. If it's even, stop. If it's odd, hand off to the multiplier agent.",
+        tools=[random_number],
+        output_type=FinalResult,
+        handoffs=[multiply_agent],
+        model=start_model,
+    )
+
+    async def run() -> None:
+        await _run(
+            start_agent,
+            "Generate a random number between 0 and 250.",
+            stream,
+            hooks=CountingHooks(),
+        )
+
+    return Session(run=run, models=[start_model, multiply_model])
+
+
+GRAPHS: dict[str, Callable[[float, bool], Session]] = {
+    "handoffs": handoffs_graph,
+    "max_turns": max_turns_graph,
+    "run_hook": run_hook_graph,
+}
+
+
+async def _run(agent: Agent[Any], input: Any, stream: bool, **kwargs: Any) -> Any:
+    if not stream:
+        return await Runner.run(agent, input, **kwargs)
+    result = Runner.run_streamed(agent, input, **kwargs)
+    async for _ in result.stream_events():
+        pass
+    return result
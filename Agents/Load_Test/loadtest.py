@@ -0,0 +1,83 @@
+"""Drives concurrent `Runner.run` sessions through the repo's agent graphs on a fake model.
+
+    python loadtest.py --graph all --sessions 500 --concurrency 50 --latency 0.05
+
+Reports, per graph: throughput, p50/p99 session latency, framework overhead per model turn
+(wall time minus simulated model latency) and the process's peak RSS.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import statistics
+import sys
+import time
+
+from agents import set_tracing_disabled
+
+from graphs import GRAPHS
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def load_test(
+    graph: str, sessions: int, concurrency: int, latency: float, stream: bool
+) -> None:
+    build = GRAPHS[graph]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    overheads: list[float] = []
+
+    async def one_session() -> None:
+        session = build(latency, stream)
+        async with semaphore:
+            start = time.perf_counter()
+            await session.run()
+            elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        overheads.append((elapsed - session.time_in_model) / max(session.turns, 1))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_session() for _ in range(sessions)))
+    wall = time.perf_counter() - start
+
+    print(
+        f"{graph:<10} {sessions / wall:>10.1f} {percentile(latencies, 50) * 1e3:>9.1f} "
+        f"{percentile(latencies, 99) * 1e3:>9.1f} {statistics.mean(overheads) * 1e3:>14.3f} "
+        f"{peak_rss_mb():>13.1f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--graph", choices=[*GRAPHS, "all"], default="all")
+    parser.add_argument("--sessions", type=int, default=200, help="sessions per graph")
+    parser.add_argument("--concurrency", type=int, default=20, help="sessions running at once")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per model call")
+    parser.add_argument("--stream", action="store_true", help="use Runner.run_streamed")
+    args = parser.parse_args()
+
+    set_tracing_disabled(True)
+    graphs = list(GRAPHS) if args.graph == "all" else [args.graph]
+    print(
+        f"{'graph':<10} {'sessions/s':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+        f"{'overhead/turn':>14} {'peak RSS (MB)':>13}"
+    )
+    for graph in graphs:
+        await load_test(graph, args.sessions, args.concurrency, args.latency, args.stream)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Bytes on the wire and memory for image inputs, before and after `MediaCache`.
+
+Runs over the images in `media/` plus a generated 4000x3000 photo, since the bison is small.
+The first table is the peak Python memory and time to get an image's data URL: reading and
+encoding the whole file as `main.py` used to, then from `MediaCache` on first use (streamed from
+a memory map to disk), on later turns, and from disk in a new process. The second is the image
+bytes sent over a `TURNS`-turn conversation that attaches the image to every question and keeps
+the history: resent inline every turn, deduplicated to one inline copy, and downscaled for
+`detail="low"` as well.
+
+    python bench_media.py
+"""
+
+import base64
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from media import MediaCache
+
+TURNS = 10
+MEDIA = Path(__file__).parent / "media"
+
+
+def whole_file(path: Path) -> str:
+    with open(path, "rb") as image_file:
+        encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
+    return f"data:image/jpeg;base64,{encoded_string}"
+
+
+def measure(fn) -> tuple[str, float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    url = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return url, peak / 1e6, seconds * 1e3
+
+
+def photo(path: Path) -> None:
+    image = Image.effect_noise((4000, 3000), 40).convert("RGB")
+    draw = ImageDraw.Draw(image, "RGBA")
+    for i in range(0, 4000, 250):
+        draw.ellipse((i, i * 0.6, i + 900, i * 0.6 + 700), fill=(i % 255, 120, 200, 90))
+    image.filter(ImageFilter.GaussianBlur(2)).save(path, quality=92)
+
+
+def conversation_bytes(cache: MediaCache, path: Path, detail: str, dedupe: bool) -> int:
+    """Image bytes in the requests of a conversation with the image attached to every turn."""
+    history, sent = [], 0
+    for turn in range(TURNS):
+        history.append({"role": "user", "content": [cache.input_image(path, detail)]})
+        history.append({"role": "user", "content": f"Question {turn}"})
+        request = cache.dedupe(history) if dedupe else history
+        sent += sum(
+            len(part.get("image_url", ""))
+            for item in request
+            if isinstance(item["content"], list)
+            for part in item["content"]
+        )
+        history = request + [{"role": "assistant", "content": "An answer."}]
+    return sent
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        images = sorted(MEDIA.glob("*.jp*g")) + [Path(directory) / "photo.jpeg"]
+        photo(images[-1])
+        cache = MediaCache(Path(directory) / "cache")
+
+        print(f"{'image':<22} {'data URL':<20} {'peak MB':>8} {'ms':>8}")
+        for path in images:
+            rows = {
+                "whole-file read": lambda: whole_file(path),
+                "cache, first use": lambda: cache.data_url(path, "high"),
+                "cache, later turns": lambda: cache.data_url(path, "high"),
+                "cache, next process": lambda: MediaCache(cache.directory).data_url(path, "high"),
+            }
+            for name, fn in rows.items():
+                _, peak, ms = measure(fn)
+                print(f"{path.name:<22} {name:<20} {peak:>8.2f} {ms:>8.2f}")
+
+        print()
+        print(f"{'image':<22} {f'image MB sent over {TURNS} turns':<36} {'MB':>8}")
+        for path in images:
+            rows = {
+                "inline every turn": conversation_bytes(cache, path, "high", dedupe=False),
+                "deduplicated": conversation_bytes(cache, path, "high", dedupe=True),
+                "deduplicated, detail=low": conversation_bytes(cache, path, "low", dedupe=True),
+            }
+            for name, sent in rows.items():
+                print(f"{path.name:<22} {name:<36} {sent / 1e6:>8.2f}")
+
+        print()
+        on_disk = sum(file.stat().st_size for file in cache.directory.iterdir())
+        print(cache.stats)
+        print(f"cache on disk: {on_disk / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
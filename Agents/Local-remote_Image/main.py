@@ -1,10 +1,11 @@
 import asyncio
-import base64
 import os
 from dotenv import load_dotenv
 from agents import Agent, Runner, AsyncOpenAI, ModelSettings, OpenAIChatCompletionsModel
 from agents.run import RunConfig
 
+from media import MediaCache
+
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
 
@@ -21,17 +22,11 @@ config = RunConfig(model = model,
 
 FILEPATH = os.path.join(os.path.dirname(__file__), "media/image_bison.jpeg")
 
-
-def image_to_base64(image_path):
-    with open(image_path, "rb") as image_file:
-        encoded_string = base64.b64encode(image_file.read()).decode("utf-8")
-    return encoded_string
+# Encoded images, keyed by content hash, so the image is encoded once rather than on every run.
+media_cache = MediaCache(os.path.join(os.path.dirname(__file__), ".media_cache"))
 
 
 async def main():
-    # Print base64-encoded image
-    b64_image = image_to_base64(FILEPATH)
-
     agent = Agent(
         name="Assistant",
         instructions="You are a helpful assistant.",
@@ -39,19 +34,14 @@ async def main():
     )
     
     while True:
-
+        # Each question is asked on its own, with the image attached. The cache encodes the image
+        # once, and every later question reuses the same data URL.
         result = await Runner.run(
             agent,
             [
                 {
                     "role": "user",
-                    "content": [
-                        {
-                            "type": "input_image",
-                            "detail": "auto",
-                            "image_url": f"data:image/jpeg;base64,{b64_image}",
-                        }
-                    ],
+                    "content": [media_cache.input_image(FILEPATH, detail = "auto")],
                 },
                 {
                     "role": "user",
@@ -60,7 +50,7 @@ async def main():
             ],
             run_config = config
         )
-        print(result.to_input_list()[-1]['content'][0]['text'].strip())
+        print(str(result.final_output).strip())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import mimetypes
+import mmap
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from PIL import Image, ImageOps
+
+Detail = Literal["low", "high", "auto"]
+
+# The largest side each detail level is sent at. OpenAI models scale "low" images to fit 512x512
+# and others to fit 2048x2048, so pixels beyond that are paid for on the wire and then dropped.
+MAX_SIDE: dict[str, int | None] = {"low": 512, "auto": 2048, "high": None}
+
+# A multiple of 3, so every chunk encodes to whole base64 quads and they can be concatenated.
+_CHUNK = 3 * 256 * 1024
+
+
+@dataclass
+class MediaStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    encodes: int = 0
+    """Variants encoded because they weren't cached."""
+
+    evictions: int = 0
+    source_bytes: int = 0
+    """Size of the image files asked for."""
+
+    url_bytes: int = 0
+    """Size of the data URLs handed out for them."""
+
+    deduped: int = 0
+    """Repeated inline images replaced with a reference by `dedupe`."""
+
+    deduped_bytes: int = 0
+
+
+def file_digest(path: str | os.PathLike[str]) -> str:
+    """The SHA-256 of a file, hashed straight from a memory map rather than read into memory."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return hashlib.sha256(data).hexdigest()
+
+
+def write_data_url(
+    source: str | os.PathLike[str], mime: str, target: str | os.PathLike[str]
+) -> None:
+    """Writes `source` to `target` as a `data:` URL, base64-encoding it from a memory map a chunk
+    at a time, so neither the file nor its encoding is ever held in memory whole."""
+    with open(source, "rb") as file, open(target, "wb") as out:
+        out.write(f"data:{mime};base64,".encode("ascii"))
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(0, len(data), _CHUNK):
+                out.write(base64.b64encode(data[start : start + _CHUNK]))
+
+
+class MediaCache:
+    """Image inputs as `data:` URLs, encoded once per image and detail level and kept on disk.
+
+    Images are keyed by the SHA-256 of their content, so a file that is renamed, copied or sent
+    again is not encoded again. For `detail="low"` and `"auto"`, an image larger than the model
+    would use (`MAX_SIDE`) is downscaled and re-encoded first, unless that doesn't make it smaller.
+
+    Encoded URLs are files in `directory`, evicted least recently used first once they total more
+    than `max_bytes`; the `memory_entries` most recently used are also kept in memory, so asking
+    for the same image every turn returns the same string rather than a new copy.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int = 256 * 1024 * 1024,
+        memory_entries: int = 8,
+        quality: int = 85,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.quality = quality
+        self.stats = MediaStats()
+        # Oldest first, from the files' modification times, which `_touch` keeps up to date.
+        files = sorted(self.directory.glob("*.url"), key=lambda file: file.stat().st_mtime_ns)
+        self._files: OrderedDict[str, int] = OrderedDict(
+            (file.name, file.stat().st_size) for file in files
+        )
+        self._size = sum(self._files.values())
+        self._urls: OrderedDict[str, str] = OrderedDict()
+        # One `(size, mtime, digest)` per path, replaced when the file changes.
+        self._digests: dict[str, tuple[int, int, str]] = {}
+        self._url_digests: dict[str, str] = {}
+
+    def data_url(self, path: str | os.PathLike[str], detail: Detail = "auto") -> str:
+        digest = self.digest(path)
+        name = f"{digest}.{detail if MAX_SIDE[detail] else 'high'}.url"
+        self.stats.source_bytes += os.path.getsize(path)
+
+        url = self._urls.get(name)
+        if url is not None:
+            self.stats.memory_hits += 1
+            self._urls.move_to_end(name)
+            self._touch(name)
+        else:
+            if name in self._files:
+                self.stats.disk_hits += 1
+                self._touch(name)
+            else:
+                self.stats.encodes += 1
+                self._encode(path, detail, name)
+            url = _read_ascii(self.directory / name)
+            self._urls[name] = url
+            self._url_digests[url] = digest
+            while len(self._urls) > self.memory_entries:
+                self._url_digests.pop(self._urls.popitem(last=False)[1], None)
+        self.stats.url_bytes += len(url)
+        return url
+
+    def input_image(self, path: str | os.PathLike[str], detail: Detail = "auto") -> dict[str, Any]:
+        """An `input_image` content part for the image at `path`."""
+        return {"type": "input_image", "detail": detail, "image_url": self.data_url(path, detail)}
+
+    def digest(self, path: str | os.PathLike[str]) -> str:
+        """The SHA-256 of the file at `path`, hashed again only when its size or mtime changes."""
+        stat = os.stat(path)
+        key = os.fspath(path)
+        cached = self._digests.get(key)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = file_digest(path)
+        self._digests[key] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def dedupe(self, items: list[Any]) -> list[Any]:
+        """A copy of the input items `items` where every inline image after the first copy of it
+        is replaced with a short text reference to that first copy.
+
+        Keeping the first copy leaves the start of the history unchanged from turn to turn, which
+        is what providers' prompt caches match on. Items that aren't changed are not copied.
+        """
+        seen: set[str] = set()
+        deduped = []
+        for item in items:
+            content = item.get("content") if isinstance(item, dict) else None
+            if not isinstance(content, list):
+                deduped.append(item)
+                continue
+            parts = []
+            for part in content:
+                url = _inline_image_url(part)
+                if url is None:
+                    parts.append(part)
+                    continue
+                digest = self._url_digests.get(url) or hashlib.sha256(url.encode()).hexdigest()
+                if digest not in seen:
+                    seen.add(digest)
+                    parts.append(part)
+                    continue
+                self.stats.deduped += 1
+                self.stats.deduped_bytes += len(url)
+                parts.append({"type": "input_text", "text": f"[Image {digest[:12]}, as above.]"})
+            changed = any(new is not old for new, old in zip(parts, content))
+            deduped.append({**item, "content": parts} if changed else item)
+        return deduped
+
+    def clear(self) -> None:
+        for name in self._files:
+            (self.directory / name).unlink(missing_ok=True)
+        self._files.clear()
+        self._size = 0
+        self._urls.clear()
+        self._url_digests.clear()
+
+    def _encode(self, path: str | os.PathLike[str], detail: Detail, name: str) -> None:
+        target = self.directory / name
+        partial = target.with_suffix(".part")
+        scaled = self._downscale(path, MAX_SIDE[detail], target.with_suffix(".img"))
+        try:
+            if scaled is not None:
+                write_data_url(scaled[0], scaled[1], partial)
+            else:
+                mime = mimetypes.guess_type(os.fspath(path))[0] or "application/octet-stream"
+                write_data_url(path, mime, partial)
+        finally:
+            if scaled is not None:
+                scaled[0].unlink(missing_ok=True)
+        # Renamed into place, so a crash never leaves a partial URL behind under a real name.
+        os.replace(partial, target)
+
+        size = target.stat().st_size
+        self._files[name] = size
+        self._size += size
+        while self._size > self.max_bytes and len(self._files) > 1:
+            evicted, evicted_size = self._files.popitem(last=False)
+            (self.directory / evicted).unlink(missing_ok=True)
+            self._size -= evicted_size
+            self.stats.evictions += 1
+            url = self._urls.pop(evicted, None)
+            if url is not None:
+                self._url_digests.pop(url, None)
+
+    def _downscale(
+        self, path: str | os.PathLike[str], max_side: int | None, target: Path
+    ) -> tuple[Path, str] | None:
+        """Writes a copy of the image that fits in `max_side` to `target`. Returns it and its MIME
+        type, or `None` if the original should be sent as it is."""
+        if max_side is None:
+            return None
+        with Image.open(path) as original:
+            if max(original.size) <= max_side:
+                return None
+            # Saving drops the EXIF Orientation tag, so rotate the pixels upright first.
+            image = ImageOps.exif_transpose(original)
+            image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            if image.mode in ("RGBA", "LA", "P"):
+                image.save(target, "PNG", optimize=True)
+                mime = "image/png"
+            else:
+                image.convert("RGB").save(target, "JPEG", quality=self.quality, optimize=True)
+                mime = "image/jpeg"
+        if target.stat().st_size >= os.path.getsize(path):
+            target.unlink()
+            return None
+        return target, mime
+
+    def _touch(self, name: str) -> None:
+        self._files.move_to_end(name)
+        # Keeps the order across restarts, which rebuild it from modification times.
+        os.utime(self.directory / name)
+
+
+def _read_ascii(path: Path) -> str:
+    """Decodes a file straight from a memory map, so there is no `bytes` copy next to the `str`."""
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return str(data, "ascii")
+
+
+def _inline_image_url(part: Any) -> str | None:
+    """The `data:` URL of an `input_image` content part, or `None` for any other part."""
+    if not isinstance(part, dict) or part.get("type") != "input_image":
+        return None
+    url = part.get("image_url")
+    return url if isinstance(url, str) and url.startswith("data:") else None
@@ -0,0 +1,95 @@
+"""Per-turn cost of model settings on a triage -> English/Spanish handoff graph.
+
+Every model request resolves the agent's settings over the run's `RunConfig.model_settings`, and
+turns the result into a JSON dict for the trace span. "before" does that the way `ModelSettings`
+used to, rebuilding everything on every turn; "after" uses the memoized `resolve` and the cached
+`to_json_dict`.
+
+    python bench_settings.py
+"""
+
+import dataclasses
+import time
+from dataclasses import fields, replace
+from typing import Any
+
+from openai.types.shared import Reasoning
+from pydantic import BaseModel
+
+from modelSetting import ModelSettings
+
+TURNS = 100_000
+
+
+def resolve_before(settings: ModelSettings, override: ModelSettings | None) -> ModelSettings:
+    if override is None:
+        return settings
+    changes = {
+        field.name: getattr(override, field.name)
+        for field in fields(settings)
+        if getattr(override, field.name) is not None
+    }
+    if settings.extra_args is not None or override.extra_args is not None:
+        merged_args = {}
+        if settings.extra_args:
+            merged_args.update(settings.extra_args)
+        if override.extra_args:
+            merged_args.update(override.extra_args)
+        changes["extra_args"] = merged_args if merged_args else None
+    return replace(settings, **changes)
+
+
+def to_json_dict_before(settings: ModelSettings) -> dict[str, Any]:
+    json_dict: dict[str, Any] = {}
+    for field_name, value in dataclasses.asdict(settings).items():
+        if isinstance(value, BaseModel):
+            json_dict[field_name] = value.model_dump(mode="json")
+        else:
+            json_dict[field_name] = value
+    return json_dict
+
+
+# Triage hands off to one of two language agents; each run is three turns.
+graph = {
+    "Triage agent": ModelSettings(temperature=0.0, tool_choice="required", max_tokens=256),
+    "Spanish Assistant": ModelSettings(temperature=0.7, metadata={"lang": "es"}),
+    "English Assistant": ModelSettings(
+        temperature=0.7,
+        metadata={"lang": "en"},
+        reasoning=Reasoning(effort="low"),
+        extra_args={"seed": 7},
+    ),
+}
+run_override = ModelSettings(top_p=0.9, include_usage=True, extra_args={"user": "bench"})
+turns = ["Triage agent", "Spanish Assistant", "English Assistant"]
+
+
+def before() -> float:
+    start = time.perf_counter()
+    for i in range(TURNS):
+        resolved = resolve_before(graph[turns[i % 3]], run_override)
+        to_json_dict_before(resolved)
+    return (time.perf_counter() - start) / TURNS * 1e6
+
+
+def after() -> float:
+    start = time.perf_counter()
+    for i in range(TURNS):
+        resolved = graph[turns[i % 3]].resolve(run_override)
+        resolved.to_json_dict()
+    return (time.perf_counter() - start) / TURNS * 1e6
+
+
+def main() -> None:
+    print(f"{'':<8} {'us per turn':>12}")
+    slow = before()
+    fast = after()
+    print(f"{'before':<8} {slow:>12.2f}")
+    print(f"{'after':<8} {fast:>12.2f}   {slow / fast:.0f}x faster")
+    again = graph["Spanish Assistant"].resolve(run_override)
+    equal = replace(graph["Spanish Assistant"]).resolve(run_override)
+    print(f"resolving again returns the same object: {again is equal}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,23 @@
-from dataclasses import dataclass
-from typing import Literal, Any
+from __future__ import annotations
+
+import dataclasses
+import threading
+import weakref
+from dataclasses import dataclass, fields, replace
+from typing import Any, Literal
+
+from openai._types import Body, Headers, Query
+from openai.types.responses import ResponseIncludable
+from openai.types.shared import Reasoning
 from pydantic import BaseModel
-from agents.agent import ModelSetting
 
-@dataclass
+_interned: weakref.WeakValueDictionary[Any, ModelSettings] = weakref.WeakValueDictionary()
+_resolved: dict[tuple[int, int], tuple[ModelSettings, ModelSettings, ModelSettings]] = {}
+_lock = threading.Lock()
+_MAX_RESOLVED = 1024
+
+
+@dataclass(frozen=True)
 class ModelSettings:
     """Settings to use when calling an LLM.
 
@@ -12,6 +26,9 @@ class ModelSettings:
 
     Not all models/providers support all of these parameters, so please check the API documentation
     for the specific model and provider you are using.
+
+    Settings are immutable: use `dataclasses.replace` to derive new ones. Don't mutate the dicts
+    and lists they hold either, since resolved settings and their JSON forms are cached.
     """
 
     temperature: float | None = None
@@ -83,10 +100,18 @@ class ModelSettings:
 
     def resolve(self, override: ModelSettings | None) -> ModelSettings:
         """Produce a new ModelSettings by overlaying any non-None values from the
-        override on top of this instance."""
+        override on top of this instance.
+
+        The result is interned, so equal settings resolve to the same object, and memoized per
+        `(self, override)` pair, so resolving on every turn costs a dict lookup."""
         if override is None:
             return self
 
+        key = (id(self), id(override))
+        cached = _resolved.get(key)
+        if cached is not None and cached[0] is self and cached[1] is override:
+            return cached[2]
+
         changes = {
             field.name: getattr(override, field.name)
             for field in fields(self)
@@ -102,17 +127,65 @@ class ModelSettings:
                 merged_args.update(override.extra_args)
             changes["extra_args"] = merged_args if merged_args else None
 
-        return replace(self, **changes)
+        resolved = replace(self, **changes).interned()
+        with _lock:
+            if len(_resolved) >= _MAX_RESOLVED:
+                _resolved.clear()
+            # The entry holds `self` and `override`, so their ids can't be reused while it exists.
+            _resolved[key] = (self, override, resolved)
+        return resolved
+
+    def interned(self) -> ModelSettings:
+        """The canonical instance equal to these settings. Settings holding values that can't be
+        hashed are returned as they are."""
+        try:
+            key = _freeze(self)
+            hash(key)
+        except TypeError:
+            return self
+        with _lock:
+            canonical = _interned.get(key)
+            if canonical is None:
+                _interned[key] = canonical = self
+        return canonical
 
     def to_json_dict(self) -> dict[str, Any]:
-        dataclass_dict = dataclasses.asdict(self)
-
-        json_dict: dict[str, Any] = {}
-
-        for field_name, value in dataclass_dict.items():
-            if isinstance(value, BaseModel):
-                json_dict[field_name] = value.model_dump(mode="json")
-            else:
-                json_dict[field_name] = value
-
-        return json_dict
\ No newline at end of file
+        """The settings as JSON-compatible values, e.g. for trace spans. Computed once per
+        instance; each call returns a fresh copy, nested dicts and lists included."""
+        cached = self.__dict__.get("_json_dict")
+        if cached is None:
+            dataclass_dict = dataclasses.asdict(self)
+
+            cached = {}
+
+            for field_name, value in dataclass_dict.items():
+                if isinstance(value, BaseModel):
+                    cached[field_name] = value.model_dump(mode="json")
+                else:
+                    cached[field_name] = value
+
+            object.__setattr__(self, "_json_dict", cached)
+        return _copy_json(cached)
+
+
+def _copy_json(value: Any) -> Any:
+    """A deep copy of a JSON-compatible value, much cheaper than `copy.deepcopy`."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    """A hashable key for `value`, equal for equal settings."""
+    if isinstance(value, ModelSettings):
+        return tuple(_freeze(getattr(value, field.name)) for field in fields(value))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(_freeze(item) for item in value))
+    if isinstance(value, BaseModel):
+        return (type(value).__name__, value.model_dump_json())
+    # Tagged with the type, so that `True`, `1` and `1.0` don't intern to one another.
+    return (type(value).__name__, value)
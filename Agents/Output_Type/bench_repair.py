@@ -0,0 +1,83 @@
+"""How many broken structured outputs are repaired locally, and what a repair costs.
+
+A corpus of `OutputType` outputs with the mistakes non-strict models make: code fences and
+chatter around the JSON, trailing commas, documents cut off mid-way, and keys that don't match
+the schema, including a missing `{"response": ...}` wrapper. Each is validated by a
+`RepairingOutputSchema`; every output it repairs is a request that didn't have to be sent again.
+The costs are per output, against a plain `AgentOutputSchema` validating the same output without
+mistakes.
+
+    python bench_repair.py
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+
+from agents import AgentOutputSchema
+from agents.exceptions import ModelBehaviorError
+
+from repair import RepairingOutputSchema
+
+REPEATS = 2000
+
+# The SDK warns about every invalid output it sees outside a trace.
+logging.getLogger("openai.agents").setLevel(logging.ERROR)
+
+
+@dataclass
+class OutputType:
+    jokes: dict[int, str]
+    """A list of jokes, indexed by joke number."""
+
+
+# `AgentOutputSchema` asks for dataclasses wrapped in `{"response": ...}`.
+valid = json.dumps({"response": {"jokes": {"1": "Why?", "2": "Because.", "3": "Knock knock."}}})
+
+corpus = {
+    "valid": valid,
+    "code fence": f"Here are your jokes:\n```json\n{valid}\n```",
+    "trailing commas": '{"response": {"jokes": {"1": "Why?", "2": "Because.", "3": "Knock.",},},}',
+    "truncated": '{"response": {"jokes": {"1": "Why?", "2": "Because.", "3": "Knock kn',
+    "key case": '{"response": {"Jokes": {"1": "Why?", "2": "Because.", "3": "Knock knock."}}}',
+    "no wrapper": '{"jokes": {"1": "Why?", "2": "Because.", "3": "Knock knock."}}',
+    "all of them": '```json\n{"JOKES": {"1": "Why?", "2": "Because.",\n```',
+    "not JSON": "Sorry, I can't tell jokes.",
+}
+
+
+def cost_us(schema, text: str) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        try:
+            schema.validate_json(text)
+        except ModelBehaviorError:
+            pass
+    return (time.perf_counter() - start) / REPEATS * 1e6
+
+
+def main() -> None:
+    schema = RepairingOutputSchema(OutputType, strict_json_schema=False)
+    timed = RepairingOutputSchema(OutputType, strict_json_schema=False)
+    print(f"{'output':<16} {'result':<44} {'us':>8}")
+    for name, text in corpus.items():
+        repaired = schema.stats.repairs.copy()
+        try:
+            schema.validate_json(text)
+            result = ", ".join(sorted(schema.stats.repairs - repaired)) or "valid as is"
+        except ModelBehaviorError:
+            result = "unrepairable: re-ask"
+        print(f"{name:<16} {result:<44} {cost_us(timed, text):>8.1f}")
+    plain = AgentOutputSchema(OutputType, strict_json_schema=False)
+    print(f"{'valid, no repair stage':<61} {cost_us(plain, valid):>8.1f}")
+
+    stats = schema.stats
+    print()
+    print(f"repair rate: {stats.repair_rate:.0%} of invalid outputs")
+    print(f"requests saved: {stats.saved_requests} in {stats.validations} validations")
+    print(f"repairs needed: {dict(stats.repairs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""When the first joke of a streamed structured output becomes usable, and what parsing costs.
+
+A `OutputType` with `JOKES` jokes is split into deltas of a few characters, arriving every
+`DELTA_SECONDS` like a model streaming it. Waiting for the whole response gives the first joke
+only after the last delta; `StructuredOutputStream` hands it over as soon as it has streamed.
+The second table is the CPU cost of each approach, without the delays.
+
+    python bench_streaming.py
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+
+from agents import AgentOutputSchema
+
+from streaming import StructuredOutputStream, cached_output_schema
+
+JOKES = 20
+DELTA_CHARS = 4
+DELTA_SECONDS = 0.002
+REPEATS = 200
+
+
+@dataclass
+class OutputType:
+    jokes: dict[int, str]
+    """A list of jokes, indexed by joke number."""
+
+
+# `AgentOutputSchema` asks for dataclasses wrapped in `{"response": ...}`.
+jokes = {str(i): f"Joke {i}: why did the chicken cross?" for i in range(1, JOKES + 1)}
+document = json.dumps({"response": {"jokes": jokes}})
+deltas = [document[i : i + DELTA_CHARS] for i in range(0, len(document), DELTA_CHARS)]
+
+
+async def first_joke_latency() -> tuple[float, float]:
+    start = time.perf_counter()
+    stream = StructuredOutputStream(OutputType)
+    first = None
+    for delta in deltas:
+        await asyncio.sleep(DELTA_SECONDS)
+        parts = stream.feed(delta)
+        if first is None and parts:
+            first = time.perf_counter() - start
+    whole = time.perf_counter() - start
+    AgentOutputSchema(OutputType, strict_json_schema=False).validate_json(document)
+    return first * 1e3, whole * 1e3
+
+
+def cpu_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS * 1e6
+
+
+def incremental() -> None:
+    stream = StructuredOutputStream(OutputType)
+    for delta in deltas:
+        stream.feed(delta)
+    cached_output_schema(OutputType, strict_json_schema=False).validate_json(stream.parser.text)
+
+
+async def main() -> None:
+    first, whole = await first_joke_latency()
+    print(f"{len(deltas)} deltas of {DELTA_CHARS} characters, {DELTA_SECONDS * 1e3:.0f} ms apart")
+    print(f"{'first joke, streamed (ms)':<40} {first:>9.1f}")
+    print(f"{'first joke, after the whole output (ms)':<40} {whole:>9.1f}")
+    print()
+    print(f"{'parsing':<36} {'us per output':>13}")
+    rows = {
+        "validate once, new schema per run": lambda: AgentOutputSchema(
+            OutputType, strict_json_schema=False
+        ).validate_json(document),
+        "validate once, cached schema": lambda: cached_output_schema(
+            OutputType, strict_json_schema=False
+        ).validate_json(document),
+        "incremental parts + cached schema": incremental,
+    }
+    for name, fn in rows.items():
+        print(f"{name:<36} {cpu_us(fn):>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
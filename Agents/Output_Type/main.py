@@ -7,6 +7,9 @@ import os
 from dotenv import load_dotenv
 from agents.run import RunConfig
 
+from repair import RepairingOutputSchema, run_with_repair
+from streaming import cached_output_schema, stream_structured
+
 
 """This example demonstrates how to use an output type that is not in strict mode. Strict mode
 allows us to guarantee valid JSON output, but some schemas are not strict-compatible.
@@ -90,6 +93,25 @@ async def main():
     result = await Runner.run(agent, input, run_config = config)
     print(result.final_output)
 
+    # The same, but an invalid JSON object is repaired locally (code fences, trailing commas,
+    # a truncated object, mis-cased keys) and, failing that, sent back to the model once on its
+    # own, instead of failing the run.
+    schema = RepairingOutputSchema(OutputType, strict_json_schema=False)
+    agent.output_type = schema
+    repaired = await run_with_repair(agent, input, run_config = config)
+    print(repaired.final_output)
+    stats = schema.stats
+    print(f"Repair rate: {stats.repair_rate:.0%}, requests saved: {stats.saved_requests}")
+
+    # The same, streamed: each joke is printed as soon as it has streamed, before the model has
+    # finished the rest. The schema is built once and reused by every run.
+    agent.output_type = cached_output_schema(OutputType, strict_json_schema=False)
+    result = Runner.run_streamed(agent, input, run_config = config)
+    async for event in stream_structured(result, OutputType):
+        if event.type == "partial_output_event" and len(event.path) == 2:
+            print(f"Joke {event.key}: {event.value}")
+    print(result.final_output)
+
     # Finally, let's try a custom output type.
     agent.output_type = CustomOutputSchema()
     result = await Runner.run(agent, input,run_config = config)
@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import (
+    Agent,
+    AgentOutputSchema,
+    AgentOutputSchemaBase,
+    ItemHelpers,
+    Model,
+    ModelTracing,
+    RunConfig,
+    Runner,
+    RunResult,
+    Usage,
+)
+from agents.exceptions import ModelBehaviorError, UserError
+
+# What output schemas raise for bad output: `AgentOutputSchema` raises `ModelBehaviorError`,
+# while custom schemas usually let `json.JSONDecodeError` or pydantic's `ValidationError` through.
+_INVALID_OUTPUT = (ModelBehaviorError, ValueError)
+
+_FENCE = re.compile(r"```[a-zA-Z]*\s*(.*?)\s*```", re.DOTALL)
+
+
+def strip_fences(text: str) -> str:
+    """The JSON inside a Markdown code fence, or between the first and last bracket of `text`."""
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return text
+    start = min(starts)
+    end = max(text.rfind("}"), text.rfind("]"))
+    # A truncated document has no closer yet: keep everything after the opener.
+    return text[start : end + 1] if end > start else text[start:]
+
+
+def balance(text: str) -> tuple[str, list[str]]:
+    """Drops trailing commas and stray closers, then closes a truncated string, key and the
+    containers left open. Returns the text and the kinds of repair it made."""
+    out: list[str] = []
+    repairs: set[str] = set()
+    # One entry per open container: its closer and, for objects, what comes next.
+    stack: list[list[str]] = []
+    in_string = escape = False
+    for c in text:
+        if in_string:
+            out.append(c)
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+                if stack and stack[-1][1] == "key":
+                    stack[-1][1] = "colon"
+            continue
+        if c == '"':
+            in_string = True
+        elif c == "{" or c == "[":
+            stack.append(["}", "key"] if c == "{" else ["]", "value"])
+        elif c == "}" or c == "]":
+            if _drop_trailing_comma(out):
+                repairs.add("trailing_commas")
+            if not stack or stack[-1][0] != c:
+                repairs.add("closers")
+                continue
+            stack.pop()
+        elif c == ":" and stack:
+            stack[-1][1] = "value"
+        elif c == "," and stack and stack[-1][0] == "}":
+            stack[-1][1] = "key"
+        out.append(c)
+
+    if in_string or stack:
+        repairs.add("closers")
+    if in_string:
+        out.append("\\" if escape else "")
+        out.append('"')
+        if stack and stack[-1][1] == "key":
+            stack[-1][1] = "colon"
+    while stack:
+        closer, state = stack.pop()
+        last = "".join(out).rstrip()[-1:]
+        if closer == "}" and state == "colon":
+            out.append(": null")
+        elif last == ":":
+            out.append(" null")
+        elif last == ",":
+            _drop_trailing_comma(out)
+        out.append(closer)
+    return "".join(out), sorted(repairs)
+
+
+def _drop_trailing_comma(out: list[str]) -> bool:
+    i = len(out) - 1
+    while i >= 0 and out[i] in " \t\r\n":
+        i -= 1
+    if i >= 0 and out[i] == ",":
+        del out[i]
+        return True
+    return False
+
+
+def coerce_keys(data: Any, schema: dict[str, Any], root: dict[str, Any] | None = None) -> Any:
+    """Renames object keys that match a property of `schema` except for case, `_` or `-`, e.g.
+    `"Jokes"` or `"joke-list"` to `"jokes"` and `"jokeList"` to `"joke_list"`. A bare value is
+    wrapped in `{"response": ...}` when that's the only property, as `AgentOutputSchema` does for
+    types that aren't objects."""
+    root = root or schema
+    schema = _resolve(schema, root)
+    properties = schema.get("properties")
+    if isinstance(properties, dict):
+        if set(properties) == {"response"} and not (isinstance(data, dict) and "response" in data):
+            data = {"response": data}
+        if isinstance(data, dict):
+            names = {_normalize(name): name for name in properties}
+            coerced = {}
+            for key, value in data.items():
+                name = key if key in properties else names.get(_normalize(key), key)
+                sub = properties.get(name)
+                coerced[name] = coerce_keys(value, sub, root) if isinstance(sub, dict) else value
+            return coerced
+    items = schema.get("items")
+    if isinstance(items, dict) and isinstance(data, list):
+        return [coerce_keys(item, items, root) for item in data]
+    extra = schema.get("additionalProperties")
+    if isinstance(extra, dict) and isinstance(data, dict):
+        return {key: coerce_keys(value, extra, root) for key, value in data.items()}
+    return data
+
+
+def _resolve(schema: dict[str, Any], root: dict[str, Any]) -> dict[str, Any]:
+    ref = schema.get("$ref")
+    if not isinstance(ref, str) or not ref.startswith("#/"):
+        return schema
+    target: Any = root
+    for part in ref[2:].split("/"):
+        target = target.get(part, {}) if isinstance(target, dict) else {}
+    return target if isinstance(target, dict) else schema
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+@dataclass
+class RepairStats:
+    validations: int = 0
+    valid: int = 0
+    """Outputs that were valid as the model wrote them."""
+
+    repaired: int = 0
+    """Outputs made valid locally. Each one saves a request: the re-ask or re-run it would need."""
+
+    repairs: Counter[str] = field(default_factory=Counter)
+    """How often each kind of repair was needed by an output it fixed."""
+
+    reasks: int = 0
+    reasks_repaired: int = 0
+    """Re-asks that produced a valid output, each saving a full re-run of the agent."""
+
+    failed: int = 0
+    """Outputs that stayed invalid: local repairs failed, and so did the re-ask if there was one."""
+
+    @property
+    def repair_rate(self) -> float:
+        """The share of invalid outputs fixed, locally or by a re-ask."""
+        invalid = self.validations - self.valid
+        return (self.repaired + self.reasks_repaired) / invalid if invalid else 0.0
+
+    @property
+    def saved_requests(self) -> int:
+        return self.repaired
+
+
+class UnrepairableOutputError(ModelBehaviorError):
+    """The final output was invalid and local repairs couldn't fix it."""
+
+    def __init__(self, text: str, error: Exception) -> None:
+        super().__init__(f"Invalid final output, and local repairs failed: {error}")
+        self.text = text
+        self.error = error
+
+
+class RepairingOutputSchema(AgentOutputSchemaBase):
+    """Wraps an output schema so that an invalid final output is repaired locally before the run
+    fails.
+
+    When the wrapped schema rejects the model's JSON, these are tried in turn, each on top of the
+    last: taking the JSON out of a code fence or surrounding text; dropping trailing commas and
+    closing a truncated document; and renaming keys to the schema's property names. The first
+    version the wrapped schema accepts is the final output. If none is, `UnrepairableOutputError`
+    is raised with the original text, which `run_with_repair` uses for a targeted re-ask.
+    """
+
+    def __init__(
+        self, schema: AgentOutputSchemaBase | type[Any], strict_json_schema: bool = True
+    ) -> None:
+        if not isinstance(schema, AgentOutputSchemaBase):
+            schema = AgentOutputSchema(schema, strict_json_schema=strict_json_schema)
+        self.schema = schema
+        self.stats = RepairStats()
+
+    def is_plain_text(self) -> bool:
+        return self.schema.is_plain_text()
+
+    def name(self) -> str:
+        return self.schema.name()
+
+    def json_schema(self) -> dict[str, Any]:
+        return self.schema.json_schema()
+
+    def is_strict_json_schema(self) -> bool:
+        return self.schema.is_strict_json_schema()
+
+    def validate_json(self, json_str: str) -> Any:
+        self.stats.validations += 1
+        try:
+            output = self.schema.validate_json(json_str)
+        except _INVALID_OUTPUT:
+            pass
+        else:
+            self.stats.valid += 1
+            return output
+        try:
+            output, repairs = self.recover(json_str)
+        except UnrepairableOutputError:
+            self.stats.failed += 1
+            raise
+        self.stats.repaired += 1
+        self.stats.repairs.update(repairs)
+        return output
+
+    def recover(self, json_str: str) -> tuple[Any, list[str]]:
+        """Validates `json_str`, repairing it if needed, without counting it in `stats`. Returns
+        the output and the kinds of repair it needed."""
+        try:
+            return self.schema.validate_json(json_str), []
+        except _INVALID_OUTPUT as error:
+            first_error = error
+        output, repairs = self._repair(json_str)
+        if repairs is None:
+            raise UnrepairableOutputError(json_str, first_error) from first_error
+        return output, repairs
+
+    def _repair(self, text: str) -> tuple[Any, list[str] | None]:
+        applied: list[str] = []
+        candidate = strip_fences(text)
+        if candidate != text.strip():
+            applied.append("code_fence")
+            output = self._try(candidate)
+            if output is not _INVALID:
+                return output, applied
+
+        balanced, repairs = balance(candidate)
+        if repairs:
+            applied += repairs
+            candidate = balanced
+            output = self._try(candidate)
+            if output is not _INVALID:
+                return output, applied
+
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            return None, None
+        coerced = coerce_keys(data, self.schema.json_schema())
+        if coerced != data:
+            output = self._try(json.dumps(coerced))
+            if output is not _INVALID:
+                return output, applied + ["keys"]
+        return None, None
+
+    def _try(self, text: str) -> Any:
+        try:
+            return self.schema.validate_json(text)
+        except _INVALID_OUTPUT:
+            return _INVALID
+
+
+_INVALID = object()
+
+REASK_INSTRUCTIONS = (
+    "Your previous answer was not valid JSON for the required schema. Reply with only the "
+    "corrected JSON, with no other text."
+)
+
+
+@dataclass
+class RepairedRun:
+    final_output: Any
+    result: RunResult | None
+    """The run's result, or `None` if the output came from a re-ask."""
+
+    usage: Usage
+    """The run's usage plus, after a re-ask, the re-ask's."""
+
+    reasked: bool
+
+
+async def run_with_repair(
+    agent: Agent[Any],
+    input: Any,
+    *,
+    run_config: RunConfig | None = None,
+    **kwargs: Any,
+) -> RepairedRun:
+    """`Runner.run`, where an output that `RepairingOutputSchema` couldn't fix locally is sent
+    back to the model once, on its own with the validation error, instead of re-running the
+    agent. The re-ask has no history or tools, so it costs one small request.
+
+    `agent.output_type` must be a `RepairingOutputSchema`.
+    """
+    schema = agent.output_type
+    if not isinstance(schema, RepairingOutputSchema):
+        raise UserError("run_with_repair needs agent.output_type to be a RepairingOutputSchema")
+    config = run_config or RunConfig()
+    try:
+        result = await Runner.run(agent, input, run_config=config, **kwargs)
+    except UnrepairableOutputError as error:
+        failed = error
+    else:
+        return RepairedRun(result.final_output, result, result.context_wrapper.usage, False)
+
+    run_data = getattr(failed, "run_data", None)
+    usage = run_data.context_wrapper.usage if run_data is not None else Usage()
+    model = _model_for(agent, config)
+    response = await model.get_response(
+        system_instructions=REASK_INSTRUCTIONS,
+        input=[{"role": "user", "content": f"Error: {failed.error}\n\nAnswer:\n{failed.text}"}],
+        model_settings=agent.model_settings.resolve(config.model_settings),
+        tools=[],
+        output_schema=schema,
+        handoffs=[],
+        tracing=ModelTracing.DISABLED,
+        previous_response_id=None,
+    )
+    usage.add(response.usage)
+    schema.stats.reasks += 1
+    text = ItemHelpers.extract_last_text(response.output[-1]) if response.output else None
+    output, _ = schema.recover(text or "")
+    schema.stats.reasks_repaired += 1
+    # `validate_json` counted the output as failed; the re-ask fixed it after all.
+    schema.stats.failed -= 1
+    return RepairedRun(output, None, usage, True)
+
+
+def _model_for(agent: Agent[Any], config: RunConfig) -> Model:
+    model = config.model if config.model is not None else agent.model
+    if isinstance(model, Model):
+        return model
+    return config.model_provider.get_model(model)
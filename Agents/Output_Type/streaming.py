@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import bisect
+import functools
+import json
+import typing
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from agents import AgentOutputSchema
+from agents.exceptions import UserError
+from agents.result import RunResultStreaming
+from agents.stream_events import StreamEvent
+from openai.types.responses import ResponseCreatedEvent, ResponseTextDeltaEvent
+from pydantic import BaseModel, TypeAdapter
+
+_WHITESPACE = " \t\r\n"
+_SCALAR_END = ",}]" + _WHITESPACE
+
+
+@dataclass(slots=True)
+class _Frame:
+    kind: Literal["object", "array"]
+    path: tuple[str | int, ...]
+    start: int
+    key: str | None = None
+    index: int = 0
+    expect_key: bool = True
+
+
+class IncrementalJSONParser:
+    """Parses a JSON document as it arrives, reporting each value near the top as soon as it is
+    complete.
+
+    `feed` scans only the new characters, tracking strings, escapes and nesting, and returns
+    `(path, value)` for every value completed at a depth of 1 to `emit_depth`: with the default of
+    2, each field of the top-level object and each entry of a field that is an object or array.
+    Only those values are decoded, from their own slice of the text, so a document is decoded
+    about `emit_depth` times in total however it is split into deltas. Deltas are kept as a list
+    rather than joined into one growing string, which would copy the whole text on every delta.
+
+    Text before the top-level object or array, such as "Sure!" or a code fence, is skipped, and
+    `done` is set once that object or array closes.
+    """
+
+    def __init__(self, emit_depth: int = 2) -> None:
+        self.emit_depth = emit_depth
+        self.done = False
+        self._chunks: list[str] = []
+        self._offsets: list[int] = []
+        self._length = 0
+        self._stack: list[_Frame] = []
+        self._string: tuple[int, bool, tuple[str | int, ...]] | None = None
+        self._escape = False
+        self._scalar: tuple[int, tuple[str | int, ...]] | None = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far. Joins the deltas, so read it once the stream is over."""
+        return "".join(self._chunks)
+
+    def feed(self, delta: str) -> list[tuple[tuple[str | int, ...], Any]]:
+        completed: list[tuple[tuple[str | int, ...], Any]] = []
+        if not delta:
+            return completed
+        self._chunks.append(delta)
+        self._offsets.append(self._length)
+        for i, c in enumerate(delta, self._length):
+            if self._string is not None:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    start, is_key, path = self._string
+                    self._string = None
+                    if is_key:
+                        self._stack[-1].key = json.loads(self._slice(start, i + 1))
+                    else:
+                        self._complete(path, start, i + 1, completed)
+                continue
+            if self._scalar is not None:
+                if c not in _SCALAR_END:
+                    continue
+                start, path = self._scalar
+                self._scalar = None
+                self._complete(path, start, i, completed)
+            if c in _WHITESPACE:
+                continue
+
+            frame = self._stack[-1] if self._stack else None
+            if frame is None and (self.done or c not in "{["):
+                # Not the document, e.g. a preamble or a code fence around it: skip it.
+                continue
+            if c == '"':
+                is_key = frame is not None and frame.kind == "object" and frame.expect_key
+                self._string = (i, is_key, () if is_key else self._child_path(frame))
+            elif c == "{" or c == "[":
+                kind = "object" if c == "{" else "array"
+                self._stack.append(_Frame(kind, self._child_path(frame), i))
+            elif c == "}" or c == "]":
+                closed = self._stack.pop()
+                self._complete(closed.path, closed.start, i + 1, completed)
+            elif c == ":":
+                frame.expect_key = False
+            elif c == ",":
+                if frame.kind == "object":
+                    frame.expect_key = True
+                    frame.key = None
+                else:
+                    frame.index += 1
+            else:
+                self._scalar = (i, self._child_path(frame))
+        self._length += len(delta)
+        return completed
+
+    def _slice(self, start: int, end: int) -> str:
+        """The text from `start` to `end`, joining only the deltas it spans."""
+        first = bisect.bisect_right(self._offsets, start) - 1
+        last = bisect.bisect_left(self._offsets, end)
+        base = self._offsets[first]
+        return "".join(self._chunks[first:last])[start - base : end - base]
+
+    def _child_path(self, frame: _Frame | None) -> tuple[str | int, ...]:
+        if frame is None:
+            return ()
+        return frame.path + ((frame.key,) if frame.kind == "object" else (frame.index,))
+
+    def _complete(
+        self,
+        path: tuple[str | int, ...],
+        start: int,
+        end: int,
+        completed: list[tuple[tuple[str | int, ...], Any]],
+    ) -> None:
+        if not path:
+            self.done = True
+        elif len(path) <= self.emit_depth:
+            try:
+                completed.append((path, json.loads(self._slice(start, end))))
+            except ValueError:
+                pass
+
+
+@functools.cache
+def cached_output_schema(
+    output_type: type[Any], strict_json_schema: bool = True
+) -> AgentOutputSchema:
+    """One `AgentOutputSchema` per output type, built once.
+
+    Given a plain type, the runner wraps it in a new `AgentOutputSchema` for every run, which
+    builds a pydantic `TypeAdapter` and a JSON schema each time. Setting `agent.output_type` to
+    this cached schema instead compiles them once per type for the whole process.
+    """
+    return AgentOutputSchema(output_type, strict_json_schema=strict_json_schema)
+
+
+@functools.cache
+def _adapter(annotation: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(annotation)
+
+
+@functools.cache
+def _field_types(output_type: type[Any]) -> dict[str, Any]:
+    if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+        return {name: info.annotation for name, info in output_type.model_fields.items()}
+    return typing.get_type_hints(output_type)
+
+
+def _is_wrapped(output_type: type[Any]) -> bool:
+    """Whether `AgentOutputSchema` asks for this type wrapped in `{"response": ...}`, as it does for
+    every type that isn't a pydantic model or a dict."""
+    return not issubclass(typing.get_origin(output_type) or output_type, (BaseModel, dict))
+
+
+@dataclass
+class PartialOutputEvent:
+    """A part of the structured output that finished streaming, validated against its type."""
+
+    path: tuple[str | int, ...]
+    """Where the part sits, e.g. `("jokes", "2")` for joke number 2 of `OutputType`."""
+
+    value: Any
+    """The validated value: the joke's text at `("jokes", "2")`, the whole dict at `("jokes",)`."""
+
+    key: Any = None
+    """For an entry of a dict field, its key validated against the key type (`2`, not `"2"`)."""
+
+    type: Literal["partial_output_event"] = field(default="partial_output_event", init=False)
+
+
+class StructuredOutputStream:
+    """Validates the parts reported by an `IncrementalJSONParser` against an output type.
+
+    Top-level fields are validated against their annotations, and entries of `dict`, `list`,
+    `tuple` and `set` fields against the item types. For types that `AgentOutputSchema` wraps in
+    `{"response": ...}`, such as dataclasses, the fields are looked for inside the wrapper and
+    reported without it. Validators are compiled once per annotation
+    and shared by every stream. Parts that fail validation are skipped: the run still validates
+    the complete output at the end.
+    """
+
+    def __init__(self, output_type: type[Any]) -> None:
+        self.output_type = output_type
+        self.fields = _field_types(output_type)
+        self.prefix: tuple[str, ...] = ("response",) if _is_wrapped(output_type) else ()
+        self.parser = IncrementalJSONParser(emit_depth=2 + len(self.prefix))
+
+    def reset(self) -> None:
+        self.parser = IncrementalJSONParser(emit_depth=2 + len(self.prefix))
+
+    def feed(self, delta: str) -> list[PartialOutputEvent]:
+        events = []
+        depth = len(self.prefix)
+        for path, value in self.parser.feed(delta):
+            if path[:depth] != self.prefix or len(path) == depth:
+                continue
+            event = self._validate(path[depth:], value)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _validate(self, path: tuple[str | int, ...], value: Any) -> PartialOutputEvent | None:
+        annotation = self.fields.get(path[0])
+        if annotation is None:
+            return None
+        try:
+            if len(path) == 1:
+                return PartialOutputEvent(path, _adapter(annotation).validate_python(value))
+            origin = typing.get_origin(annotation)
+            args = typing.get_args(annotation)
+            if origin is dict and len(args) == 2:
+                key = _adapter(args[0]).validate_python(path[1], strict=False)
+                return PartialOutputEvent(path, _adapter(args[1]).validate_python(value), key)
+            if origin in (list, set, frozenset) and args:
+                return PartialOutputEvent(path, _adapter(args[0]).validate_python(value))
+            if origin is tuple and args:
+                item = args[0] if args[-1] is Ellipsis else args[min(path[1], len(args) - 1)]
+                return PartialOutputEvent(path, _adapter(item).validate_python(value))
+        except ValueError:
+            return None
+        return None
+
+
+async def stream_structured(
+    result: RunResultStreaming, output_type: type[Any] | None = None
+) -> AsyncIterator[StreamEvent | PartialOutputEvent]:
+    """Yields the events of `result.stream_events()`, plus a `PartialOutputEvent` for each part of
+    the structured output as soon as it has streamed, so work on the first parts can start before
+    the model has finished writing the rest.
+
+    `output_type` defaults to the one of the agent that is running; pass it when the agent's
+    `output_type` is an `AgentOutputSchema` or other schema object. The parser starts over with
+    every model response, so only the final one's parts are reported as the run goes on.
+    """
+    output_type = output_type or result.current_agent.output_type
+    if not isinstance(output_type, type):
+        raise UserError(f"stream_structured needs an output type, got {output_type!r}")
+    structured = StructuredOutputStream(output_type)
+    async for event in result.stream_events():
+        yield event
+        if event.type != "raw_response_event":
+            continue
+        if isinstance(event.data, ResponseCreatedEvent):
+            structured.reset()
+        elif isinstance(event.data, ResponseTextDeltaEvent):
+            for partial in structured.feed(event.data.delta):
+                yield partial
@@ -0,0 +1,73 @@
+"""Turns and wall-clock time for a four-tool request, with a fake model and no network.
+
+Each tool blocks for `TOOL_SECONDS` and each model call takes `MODEL_SECONDS`. Compares:
+
+- sequential: one tool call per turn, as in `Agents/Max_turns/main.py`
+- parallel: four tool calls in one turn, with plain `@function_tool` tools
+- parallel + scheduler: the same, with tools from `ToolScheduler.tool`
+- batch: one `run_tools` call, for providers that reject parallel tool calls
+
+    python bench_parallel.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from agents import Agent, Runner, function_tool
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "Load_Test"))
+from fake_model import FakeModel, FakeTurn, text, tool_call
+from scheduler import ToolScheduler
+
+TOOL_SECONDS = 0.2
+MODEL_SECONDS = 0.1
+FACTS = ["weather", "time", "date", "user_id"]
+ANSWER = text("Here is everything you asked for.")
+BATCH = [{"name": f"get_{fact}", "arguments": "{}"} for fact in FACTS]
+
+# The model's turns in each mode; the last one answers once every tool output is in.
+SCRIPTS = {
+    "sequential": [tool_call(f"get_{fact}") for fact in FACTS] + [ANSWER],
+    "parallel": [FakeTurn(tool_calls=[(f"get_{fact}", {}) for fact in FACTS]), ANSWER],
+    "batch": [tool_call("run_tools", calls=BATCH), ANSWER],
+}
+
+
+def make_tools(decorator):
+    def make(fact: str):
+        def tool() -> str:
+            time.sleep(TOOL_SECONDS)
+            return f"The {fact} is fine."
+
+        tool.__name__ = f"get_{fact}"
+        return decorator(tool)
+
+    return [make(fact) for fact in FACTS]
+
+
+async def run(label: str, mode: str, tools) -> None:
+    model = FakeModel(SCRIPTS[mode], latency=MODEL_SECONDS)
+    agent = Agent(name="Multi-tool agent", tools=tools, model=model)
+    start = time.perf_counter()
+    result = await Runner.run(agent, "What is the weather, time, date and my user id?")
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {len(result.raw_responses):>5} {elapsed:>10.2f}")
+
+
+async def main() -> None:
+    scheduler = ToolScheduler(max_workers=len(FACTS))
+    plain = make_tools(function_tool)
+    scheduled = make_tools(scheduler.tool)
+
+    print(f"{'':<24} {'turns':>5} {'seconds':>10}")
+    await run("sequential", "sequential", plain)
+    await run("parallel", "parallel", plain)
+    await run("parallel + scheduler", "parallel", scheduled)
+    await run("batch", "batch", [scheduler.batch_tool(scheduled)])
+    scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
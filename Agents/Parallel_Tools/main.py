@@ -0,0 +1,60 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from scheduler import ToolLimits, ToolScheduler
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   )
+
+scheduler = ToolScheduler(max_workers = 4, default_limits = ToolLimits(timeout = 10))
+
+@scheduler.tool(max_concurrency = 2)
+def get_weather_tool():
+    return ("FAisalabad weather is sunny!")
+
+@scheduler.tool
+def get_time_tool():
+    return ("Current time is 3:45 PM!")
+
+@scheduler.tool
+def get_date_tool():
+    return ("Today's date is December 15, 2024!")
+
+@scheduler.tool
+def get_user_id():
+    return ("User ID is 1234")
+
+tools = [get_weather_tool, get_time_tool, get_date_tool, get_user_id]
+
+# Gemini rejects `parallel_tool_calls`, so instead of one tool per turn the agent gets a single
+# `run_tools` tool and plans every call in one turn.
+agent = Agent(
+    name = "Multi-tool agent",
+    instructions="You are a helpful assistant that can provide weather, time, date, and user information. When asked for multiple pieces of information, request all of them at once with run_tools.",
+    tools=[scheduler.batch_tool(tools)],
+    model = model
+)
+
+input = "What is the weather, current time, today's date, and give me user details?"
+
+async def main():
+    result = await Runner.run(agent, input, max_turns = 3, run_config = config)
+    print("Final output:", result.final_output)
+    print("Turns used:", len(result.raw_responses))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
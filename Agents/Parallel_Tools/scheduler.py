@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import functools
+import inspect
+import json
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from agents import FunctionTool, RunContextWrapper, function_tool
+
+
+@dataclass(frozen=True)
+class ToolLimits:
+    max_concurrency: int | None = None
+    """The most calls of this tool that run at once. Unlimited if `None`."""
+
+    timeout: float | None = None
+    """Seconds a call may take before the model is told it timed out. No limit if `None`."""
+
+
+class ToolScheduler:
+    """Runs function tools concurrently, within per-tool limits.
+
+    The runner already starts every tool call of one turn at the same time, but a sync tool such as
+    `get_weather_tool` runs on the event loop and blocks the others until it returns. Tools made
+    with `scheduler.tool` run sync functions in a bounded thread pool instead, and async functions
+    on the loop, so the calls of one turn really overlap.
+
+    For providers that reject `parallel_tool_calls`, `batch_tool` builds a single tool that takes a
+    list of calls and runs them all through the scheduler, so the model can plan every call it
+    needs in one turn.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        default_limits: ToolLimits | None = None,
+    ) -> None:
+        self.default_limits = default_limits or ToolLimits()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._limits: dict[str, ToolLimits] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._tools: dict[str, FunctionTool] = {}
+        self._running: set[asyncio.Task[Any]] = set()
+
+    def tool(
+        self,
+        func: Callable[..., Any] | None = None,
+        *,
+        name_override: str | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """Like `@function_tool`, but the tool runs through this scheduler."""
+
+        def decorator(real_func: Callable[..., Any]) -> FunctionTool:
+            if not inspect.iscoroutinefunction(real_func):
+                real_func = self._offload(real_func)
+            tool = function_tool(real_func, name_override=name_override)
+            limits = ToolLimits(
+                max_concurrency=max_concurrency or self.default_limits.max_concurrency,
+                timeout=timeout or self.default_limits.timeout,
+            )
+            return self.add(tool, limits)
+
+        if func is not None:
+            return decorator(func)
+        return decorator
+
+    def add(self, tool: FunctionTool, limits: ToolLimits | None = None) -> FunctionTool:
+        """Applies this scheduler's limits to an existing tool. Returns the scheduled tool."""
+        self._limits[tool.name] = limits or self.default_limits
+        original = tool.on_invoke_tool
+
+        async def on_invoke_tool(ctx: RunContextWrapper[Any], arguments: str) -> Any:
+            return await self._run(tool.name, original, ctx, arguments)
+
+        scheduled = dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+        self._tools[tool.name] = scheduled
+        return scheduled
+
+    def batch_tool(self, tools: list[FunctionTool], name: str = "run_tools") -> FunctionTool:
+        """Returns a tool that runs several calls of `tools` concurrently and returns all their
+        outputs as a JSON list, in the order the calls were given."""
+        by_name = {tool.name: self._tools.get(tool.name) or self.add(tool) for tool in tools}
+        descriptions = "\n".join(f"- {tool.name}: {tool.description}" for tool in tools)
+
+        async def on_invoke_tool(ctx: RunContextWrapper[Any], arguments: str) -> str:
+            calls = json.loads(arguments)["calls"]
+
+            async def invoke(call: dict[str, Any]) -> dict[str, Any]:
+                tool = by_name.get(call["name"])
+                if tool is None:
+                    return {"name": call["name"], "error": f"Unknown tool: {call['name']}"}
+                output = await tool.on_invoke_tool(ctx, call.get("arguments") or "{}")
+                return {"name": call["name"], "output": str(output)}
+
+            results = await asyncio.gather(*(invoke(call) for call in calls))
+            return json.dumps(results)
+
+        return FunctionTool(
+            name=name,
+            description=(
+                "Runs several tool calls at once. Put every call you need in `calls` instead of "
+                "calling the tools one per turn. Available tools:\n" + descriptions
+            ),
+            params_json_schema={
+                "type": "object",
+                "properties": {
+                    "calls": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string", "enum": list(by_name)},
+                                "arguments": {
+                                    "type": "string",
+                                    "description": "The tool's arguments as a JSON object.",
+                                },
+                            },
+                            "required": ["name", "arguments"],
+                            "additionalProperties": False,
+                        },
+                    }
+                },
+                "required": ["calls"],
+                "additionalProperties": False,
+            },
+            on_invoke_tool=on_invoke_tool,
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(
+        self,
+        name: str,
+        invoke: Callable[[RunContextWrapper[Any], str], Any],
+        ctx: RunContextWrapper[Any],
+        arguments: str,
+    ) -> Any:
+        limits = self._limits[name]
+        semaphore = self._semaphore(name, limits)
+        if semaphore is not None:
+            await semaphore.acquire()
+        # The permit is released when the call finishes, not when the caller stops waiting for it:
+        # a sync tool that timed out keeps running on its thread until it returns.
+        task = asyncio.ensure_future(invoke(ctx, arguments))
+        self._running.add(task)
+        task.add_done_callback(functools.partial(self._finished, semaphore))
+        try:
+            done, _ = await asyncio.wait({task}, timeout=limits.timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if task in done:
+            return task.result()
+        task.cancel()
+        return f"Tool '{name}' timed out after {limits.timeout} seconds."
+
+    def _finished(self, semaphore: asyncio.Semaphore | None, task: asyncio.Task[Any]) -> None:
+        self._running.discard(task)
+        if semaphore is not None:
+            semaphore.release()
+        if not task.cancelled():
+            # Marks the error of a call nobody waited for as seen.
+            task.exception()
+
+    def _semaphore(self, name: str, limits: ToolLimits) -> asyncio.Semaphore | None:
+        if limits.max_concurrency is None:
+            return None
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(limits.max_concurrency)
+        return semaphore
+
+    def _offload(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The thread can't be stopped, so the call isn't over until it returns.
+                await asyncio.wait({future})
+                raise
+
+        return wrapper
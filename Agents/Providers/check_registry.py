@@ -0,0 +1,98 @@
+"""Checks `ProviderRegistry` against the local stub server in `stub_server.py`.
+
+Agents run through registry models to one base URL, under two API keys, and the checks compare
+what the registry reports with what the server saw: clients and models are shared per key,
+connections are reused across requests and capped at `max_connections` per client, `stats()`
+counts every request and reports the true peak of the base URL, and `aclose` leaves a registry
+that still works. Exits with an `AssertionError` at the first check that fails.
+
+    python check_registry.py
+"""
+
+import asyncio
+
+from agents import Agent, RunConfig, Runner
+
+from registry import PoolSettings, ProviderRegistry
+from stub_server import StubServer
+
+MAX_CONNECTIONS = 4
+REQUESTS = 12
+
+
+async def run(registry: ProviderRegistry, base_url: str, api_key: str, count: int) -> None:
+    model = registry.model("stub", base_url=base_url, api_key=api_key)
+    agent = Agent(name="Assistant", instructions="Answer briefly.", model=model)
+    config = RunConfig(tracing_disabled=True)
+    results = await asyncio.gather(
+        *(Runner.run(agent, "What's the weather?", run_config=config) for _ in range(count))
+    )
+    assert all(result.final_output == "The weather is sunny." for result in results)
+
+
+def check(name: str, condition: bool, detail: object = "") -> None:
+    assert condition, f"{name}: {detail}"
+    print(f"ok  {name}")
+
+
+async def main() -> None:
+    server = StubServer(latency=0.05).start()
+    base_url = server.base_url
+    registry = ProviderRegistry(PoolSettings(max_connections=MAX_CONNECTIONS, max_retries=0))
+
+    check("no clients before first use", registry.stats() == {}, registry.stats())
+    check(
+        "one client per base URL and key",
+        registry.client(base_url, "a") is registry.client(base_url, "a")
+        and registry.client(base_url, "a") is not registry.client(base_url, "b"),
+    )
+    check(
+        "one model per name, base URL and key",
+        registry.model("stub", base_url, "a") is registry.model("stub", base_url, "a")
+        and registry.model("stub", base_url, "a")._client is registry.client(base_url, "a"),
+    )
+
+    await run(registry, base_url, "a", REQUESTS)
+    stats = registry.stats()[base_url]
+    check("every request counted", stats.requests == REQUESTS, stats)
+    check("nothing left in flight", stats.in_flight == 0, stats)
+    # Requests waiting for a connection are in flight too, so the registry's peak is every request
+    # of the run, while the server never sees more than one per connection.
+    check("peak counts queued requests", stats.peak_in_flight == REQUESTS, stats)
+    check("connections capped", server.peak_in_flight == MAX_CONNECTIONS, server.peak_in_flight)
+    check("connections kept open", stats.connections == stats.idle_connections > 0, stats)
+    check("connections reused", server.connections == MAX_CONNECTIONS, server.connections)
+
+    opened = server.connections
+    await run(registry, base_url, "a", REQUESTS)
+    check("no new connections for later runs", server.connections == opened, server.connections)
+
+    # Key "b" runs after key "a" has finished, so the base URL never has more than one key's
+    # requests in flight at once, and its peak isn't the sum of the keys' peaks.
+    await run(registry, base_url, "b", REQUESTS)
+    stats = registry.stats()[base_url]
+    check("requests summed over keys", stats.requests == 3 * REQUESTS, stats)
+    check("peak of the base URL, not a sum", stats.peak_in_flight == REQUESTS, stats)
+    check("max_connections summed over keys", stats.max_connections == 2 * MAX_CONNECTIONS, stats)
+
+    await asyncio.gather(
+        run(registry, base_url, "a", REQUESTS), run(registry, base_url, "b", REQUESTS)
+    )
+    stats = registry.stats()[base_url]
+    check("peak over keys running at once", stats.peak_in_flight == 2 * REQUESTS, stats)
+    check("server agrees", server.peak_in_flight == 2 * MAX_CONNECTIONS, server.peak_in_flight)
+
+    client = registry.client(base_url, "a")
+    await registry.aclose()
+    check("aclose closes clients", client.is_closed(), client)
+    check("aclose forgets clients", registry.stats() == {}, registry.stats())
+    await run(registry, base_url, "a", 2)
+    check("usable after aclose", registry.stats()[base_url].requests == 2, registry.stats())
+    check("new client after aclose", registry.client(base_url, "a") is not client)
+
+    await registry.aclose()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
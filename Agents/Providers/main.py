@@ -0,0 +1,43 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner
+from agents.run import RunConfig
+import asyncio
+
+from registry import get_client, get_model, registry
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+# Both agents share one client, and so one connection pool, instead of building their own.
+model = get_model("gemini-2.0-flash", api_key = api_key)
+
+config = RunConfig(model = model,
+                   model_provider = get_client(api_key = api_key),
+                   tracing_disabled = True
+                   )
+
+poet = Agent(name="Poet", instructions="Answer in a short rhyme.", model = model)
+teacher = Agent(name="Teacher", instructions="Answer in one plain sentence.", model = model)
+
+async def main():
+    while True:
+
+        user_input = input ("How may I help you today: " )
+
+        results = await asyncio.gather(
+            Runner.run(poet, input = user_input, run_config = config),
+            Runner.run(teacher, input = user_input, run_config = config),
+        )
+
+        for result in results:
+            print(f"{result.last_agent.name}: ", str(result.final_output).strip())
+
+        for base_url, stats in registry.stats().items():
+            print(f"({base_url}: {stats.requests} requests, {stats.connections} connections, "
+                  f"peak {stats.peak_in_flight} in flight)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
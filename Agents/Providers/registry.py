@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+
+import httpx
+from agents import AsyncOpenAI, OpenAIChatCompletionsModel
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """HTTP settings for the clients created by a `ProviderRegistry`."""
+
+    max_connections: int = 100
+    """The most connections open to one base URL at a time."""
+
+    max_keepalive_connections: int = 20
+    """The most idle connections kept open for reuse."""
+
+    keepalive_expiry: float = 30.0
+    """Seconds an idle connection is kept open."""
+
+    http2: bool = False
+    """Multiplexes requests over HTTP/2 connections. Requires the `h2` package."""
+
+    connect_timeout: float = 5.0
+    """Seconds to wait for a connection to be established."""
+
+    read_timeout: float = 60.0
+    """Seconds to wait for each chunk of a response."""
+
+    max_retries: int = 2
+    """Passed to `AsyncOpenAI`."""
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """A snapshot of one client's connection pool."""
+
+    requests: int
+    """Requests sent since the client was created."""
+
+    in_flight: int
+    """Requests whose response has not been fully read yet."""
+
+    peak_in_flight: int
+    """The highest `in_flight` seen so far."""
+
+    connections: int
+    """Connections currently open."""
+
+    idle_connections: int
+    """Open connections that are not serving a request."""
+
+    max_connections: int
+
+    @property
+    def utilization(self) -> float:
+        """The share of `max_connections` busy with a request."""
+        busy = self.connections - self.idle_connections
+        return busy / self.max_connections if self.max_connections else 0.0
+
+
+class _InFlight:
+    """Requests in flight, and the most there have been at once."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.peak = 0
+
+    def enter(self) -> None:
+        self.count += 1
+        self.peak = max(self.peak, self.count)
+
+    def exit(self) -> None:
+        self.count -= 1
+
+
+class _MeteredStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]) -> None:
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class _MeteredTransport(httpx.AsyncHTTPTransport):
+    """Counts requests until their response body is closed, which is when the connection is
+    freed."""
+
+    def __init__(self, max_connections: int, base_url_in_flight: _InFlight, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.max_connections = max_connections
+        self.requests = 0
+        self.in_flight = _InFlight()
+        # Shared by every transport to the same base URL: the base URL's peak isn't the sum of
+        # their peaks.
+        self.base_url_in_flight = base_url_in_flight
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        self.in_flight.enter()
+        self.base_url_in_flight.enter()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+        response.stream = _MeteredStream(response.stream, self._release)
+        return response
+
+    def _release(self) -> None:
+        self.in_flight.exit()
+        self.base_url_in_flight.exit()
+
+    def stats(self) -> PoolStats:
+        connections = self._pool.connections
+        return PoolStats(
+            requests=self.requests,
+            in_flight=self.in_flight.count,
+            peak_in_flight=self.in_flight.peak,
+            connections=len(connections),
+            idle_connections=sum(1 for connection in connections if connection.is_idle()),
+            max_connections=self.max_connections,
+        )
+
+
+class ProviderRegistry:
+    """Hands out one shared `AsyncOpenAI` client per base URL and API key, and one shared
+    `OpenAIChatCompletionsModel` per model name on top of it.
+
+    Clients are created on first use, so importing a module that defines agents opens no
+    connections. Every agent that uses the same provider shares its connection pool, so
+    connections and TLS sessions are reused across agents instead of set up once per module.
+    """
+
+    def __init__(self, settings: PoolSettings | None = None) -> None:
+        self.settings = settings or PoolSettings()
+        self._lock = threading.Lock()
+        self._clients: dict[tuple[str, str | None], AsyncOpenAI] = {}
+        self._transports: dict[tuple[str, str | None], _MeteredTransport] = {}
+        self._in_flight: dict[str, _InFlight] = {}
+        self._models: dict[tuple[str, str, str | None], OpenAIChatCompletionsModel] = {}
+
+    def client(self, base_url: str = GEMINI_BASE_URL, api_key: str | None = None) -> AsyncOpenAI:
+        key = (base_url, api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._create_client(base_url, api_key)
+            return client
+
+    def model(
+        self,
+        model: str = "gemini-2.0-flash",
+        base_url: str = GEMINI_BASE_URL,
+        api_key: str | None = None,
+    ) -> OpenAIChatCompletionsModel:
+        key = (model, base_url, api_key)
+        client = self.client(base_url, api_key)
+        with self._lock:
+            instance = self._models.get(key)
+            if instance is None:
+                instance = self._models[key] = OpenAIChatCompletionsModel(
+                    model=model, openai_client=client
+                )
+            return instance
+
+    def stats(self) -> dict[str, PoolStats]:
+        """Returns the pool stats of each base URL, summed over the API keys that use it.
+        `peak_in_flight` is the most requests that were in flight to the base URL at once."""
+        with self._lock:
+            transports = list(self._transports.items())
+            in_flight = dict(self._in_flight)
+        result: dict[str, PoolStats] = {}
+        for (base_url, _), transport in transports:
+            stats = transport.stats()
+            previous = result.get(base_url)
+            if previous is not None:
+                stats = _merge(previous, stats)
+            result[base_url] = stats
+        return {
+            base_url: dataclasses.replace(stats, peak_in_flight=in_flight[base_url].peak)
+            for base_url, stats in result.items()
+        }
+
+    async def aclose(self) -> None:
+        """Closes every client. The registry can be used again afterwards."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._transports.clear()
+            self._in_flight.clear()
+            self._models.clear()
+        for client in clients:
+            await client.close()
+
+    def _create_client(self, base_url: str, api_key: str | None) -> AsyncOpenAI:
+        settings = self.settings
+        transport = _MeteredTransport(
+            max_connections=settings.max_connections,
+            base_url_in_flight=self._in_flight.setdefault(base_url, _InFlight()),
+            http2=settings.http2,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+        )
+        self._transports[(base_url, api_key)] = transport
+        http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(settings.read_timeout, connect=settings.connect_timeout),
+        )
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=settings.max_retries,
+        )
+
+
+def _merge(a: PoolStats, b: PoolStats) -> PoolStats:
+    return PoolStats(
+        requests=a.requests + b.requests,
+        in_flight=a.in_flight + b.in_flight,
+        peak_in_flight=max(a.peak_in_flight, b.peak_in_flight),
+        connections=a.connections + b.connections,
+        idle_connections=a.idle_connections + b.idle_connections,
+        max_connections=a.max_connections + b.max_connections,
+    )
+
+
+registry = ProviderRegistry()
+"""The process-wide registry used by `get_client` and `get_model`."""
+
+
+def get_client(base_url: str = GEMINI_BASE_URL, api_key: str | None = None) -> AsyncOpenAI:
+    return registry.client(base_url, api_key)
+
+
+def get_model(
+    model: str = "gemini-2.0-flash",
+    base_url: str = GEMINI_BASE_URL,
+    api_key: str | None = None,
+) -> OpenAIChatCompletionsModel:
+    return registry.model(model, base_url, api_key)
@@ -0,0 +1,44 @@
+"""Time to resume a persisted 10,000-item session with `SessionStore`.
+
+Compares opening the store from its snapshot with re-parsing every logged item, which is what
+resuming costs without snapshots.
+
+    python bench_store.py
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from store import SessionStore
+
+ITEMS = 10_000
+
+
+def message(n: int):
+    role = "user" if n % 2 == 0 else "assistant"
+    return {"role": role, "content": f"Message number {n}, with a little text in it."}
+
+
+def time_open(path: Path, snapshot_every: int) -> float:
+    start = time.perf_counter()
+    with SessionStore(path, snapshot_every=snapshot_every) as store:
+        assert len(store) == ITEMS
+    return (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshotted = Path(tmp) / "snapshotted.db"
+        log_only = Path(tmp) / "log_only.db"
+        with SessionStore(snapshotted, snapshot_every=1000) as store:
+            store.add(message(n) for n in range(ITEMS))
+        with SessionStore(log_only, snapshot_every=ITEMS + 1) as store:
+            store.add(message(n) for n in range(ITEMS))
+
+        print(f"resume {ITEMS} items, snapshot + tail: {time_open(snapshotted, 1000):.1f} ms")
+        print(f"resume {ITEMS} items, log replay:      {time_open(log_only, ITEMS + 1):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
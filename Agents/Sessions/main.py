@@ -0,0 +1,51 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from memory import SessionMemory
+from store import SessionStore
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   )
+
+agent = Agent(name="My Agent", instructions="You are a helpful assistant that can answer questions and help with tasks.", model = model)
+
+# Replaces the ever-growing `history = []` list: older turns are folded into a summary once the
+# conversation goes over 4000 (estimated) tokens.
+memory = SessionMemory(max_tokens = 4000, summary_max_tokens = 500)
+
+# Every item is also logged to disk, so restarting the script picks up the conversation.
+store = SessionStore("sessions.db", session_id = "repl")
+memory.add(store.to_input_list())
+
+async def main():
+    while True:
+
+        user_input = input ("How may I help you today: " )
+
+        memory.add_user_message(user_input)
+        store.add_user_message(user_input)
+
+        result = await Runner.run(agent, input = memory.to_input_list(), run_config = config)
+
+        memory.add_result(result)
+        store.add_result(result)
+
+        print(f"Response: ", str(result.final_output).strip())
+        print(f"(memory: ~{memory.tokens} tokens)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
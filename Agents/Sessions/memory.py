@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import TResponseInputItem
+from agents.result import RunResultBase
+
+TokenEstimator = Callable[[str], int]
+"""Counts the tokens in a piece of text."""
+
+Summarizer = Callable[[str | None, list[TResponseInputItem], int], str]
+"""Folds evicted items into the previous summary, given a token budget for the result."""
+
+
+def estimate_tokens(text: str) -> int:
+    """A rough, offline token estimate of about four characters per token."""
+    return (len(text) + 3) // 4
+
+
+def item_text(item: TResponseInputItem) -> str:
+    """Returns the text of an input item that counts towards the model's input tokens."""
+    parts: list[str] = []
+    content = item.get("content")
+    if isinstance(content, str):
+        parts.append(content)
+    elif isinstance(content, list):
+        for block in content:
+            if isinstance(block, dict):
+                text = block.get("text") or block.get("refusal")
+                if isinstance(text, str):
+                    parts.append(text)
+    for key in ("name", "arguments", "output"):
+        value = item.get(key)
+        if isinstance(value, str):
+            parts.append(value)
+    return " ".join(parts)
+
+
+def summarize_items(
+    summary: str | None,
+    items: list[TResponseInputItem],
+    max_tokens: int,
+    estimator: TokenEstimator = estimate_tokens,
+) -> str:
+    """Appends one line per user/assistant message to the summary, dropping the oldest lines
+    once it exceeds `max_tokens`. Tool calls and their outputs are left out."""
+    lines = summary.splitlines() if summary else []
+    for item in items:
+        role = item.get("role")
+        if role in ("user", "assistant"):
+            text = item_text(item).strip()
+            if text:
+                lines.append(f"{role.capitalize()}: {text}")
+
+    while len(lines) > 1 and estimator("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+@dataclass
+class _Turn:
+    items: list[TResponseInputItem]
+    tokens: int
+
+
+@dataclass
+class SessionMemory:
+    """Conversation memory for REPL loops that keeps the input sent to `Runner.run` within a
+    token budget.
+
+    The conversation is split into turns, each starting at a user message, so a tool call always
+    stays in the same turn as its output. The most recent turns are kept verbatim. When they go
+    over `max_tokens`, the oldest turns are folded into a single summary message at the start of
+    the input. The latest turn is always kept, even if it is over budget on its own.
+    """
+
+    max_tokens: int = 4000
+    """The token budget for the whole input, including the summary."""
+
+    summary_max_tokens: int = 500
+    """The token budget for the summary of evicted turns."""
+
+    estimator: TokenEstimator = estimate_tokens
+    """Counts tokens. Swap in a real tokenizer, e.g. `lambda text: len(enc.encode(text))`."""
+
+    summarizer: Summarizer | None = None
+    """Builds the summary of evicted turns. Defaults to `summarize_items`."""
+
+    summary: str | None = None
+    """The summary of all turns evicted so far."""
+
+    _turns: list[_Turn] = field(default_factory=list, init=False, repr=False)
+    _summary_tokens: int = field(default=0, init=False, repr=False)
+
+    @property
+    def tokens(self) -> int:
+        """The estimated token count of `to_input_list()`."""
+        return self._summary_tokens + sum(turn.tokens for turn in self._turns)
+
+    def add_user_message(self, content: str) -> None:
+        self.add([{"role": "user", "content": content}])
+
+    def add_result(self, result: RunResultBase) -> None:
+        """Adds the items generated by a run, i.e. everything after the input it was given."""
+        self.add(item.to_input_item() for item in result.new_items)
+
+    def add(self, items: Iterable[TResponseInputItem]) -> None:
+        for item in items:
+            if item.get("role") == "user" or not self._turns:
+                self._turns.append(_Turn(items=[], tokens=0))
+            turn = self._turns[-1]
+            turn.items.append(item)
+            turn.tokens += self.estimator(item_text(item))
+        self._evict()
+
+    def to_input_list(self) -> list[TResponseInputItem]:
+        """Returns the summary message, if any, followed by the recent turns."""
+        input_list: list[TResponseInputItem] = []
+        if self.summary:
+            input_list.append(self._summary_item(self.summary))
+        for turn in self._turns:
+            input_list.extend(turn.items)
+        return input_list
+
+    def clear(self) -> None:
+        self._turns.clear()
+        self.summary = None
+        self._summary_tokens = 0
+
+    def _evict(self) -> None:
+        evicted: list[TResponseInputItem] = []
+        while len(self._turns) > 1 and self.tokens > self.max_tokens:
+            turn = self._turns.pop(0)
+            evicted.extend(turn.items)
+            # Reserve the summary budget up front so the loop converges before it is rebuilt.
+            self._summary_tokens = max(self._summary_tokens, self.summary_max_tokens)
+
+        if evicted:
+            if self.summarizer is not None:
+                self.summary = self.summarizer(self.summary, evicted, self.summary_max_tokens)
+            else:
+                self.summary = summarize_items(
+                    self.summary, evicted, self.summary_max_tokens, self.estimator
+                )
+            self._summary_tokens = (
+                self.estimator(self._summary_item(self.summary)["content"]) if self.summary else 0
+            )
+
+    @staticmethod
+    def _summary_item(summary: str) -> dict[str, Any]:
+        return {"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}
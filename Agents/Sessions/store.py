@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+
+from agents import TResponseInputItem
+from agents.result import RunResultBase
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_session ON items (session_id, id);
+CREATE TABLE IF NOT EXISTS snapshots (
+    session_id TEXT PRIMARY KEY,
+    last_id INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+
+class SessionStore:
+    """Conversation history persisted to a SQLite file, so a REPL can resume where it left off.
+
+    Items are appended to a log table, one row per item. Every `snapshot_every` items the whole
+    history is also written as one JSON array, so opening a long session parses a single snapshot
+    plus the few items logged after it instead of one row per item.
+
+    The database runs in WAL mode: any number of readers, in this or other processes, can open the
+    same session while one of them appends. Call `refresh()` to pick up items appended elsewhere.
+    Several stores may also append to one session: each `add` loads what the others appended and
+    writes its own items in one `BEGIN IMMEDIATE` transaction, so no item is skipped.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        session_id: str = "default",
+        snapshot_every: int = 1000,
+    ) -> None:
+        self.path = Path(path)
+        self.session_id = session_id
+        self.snapshot_every = snapshot_every
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._items: list[TResponseInputItem] = []
+        self._last_id = 0
+        self._since_snapshot = 0
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add_user_message(self, content: str) -> None:
+        self.add([{"role": "user", "content": content}])
+
+    def add_result(self, result: RunResultBase) -> None:
+        """Adds the items generated by a run, i.e. everything after the input it was given."""
+        self.add(item.to_input_item() for item in result.new_items)
+
+    def add(self, items: Iterable[TResponseInputItem]) -> None:
+        items = list(items)
+        if not items:
+            return
+        with self._conn:
+            # Take the write lock before catching up, so no other writer can insert between the
+            # catch-up read and our inserts: every row below our ids is then already loaded.
+            self._conn.execute("BEGIN IMMEDIATE")
+            self.refresh()
+            last_id = self._last_id
+            for item in items:
+                cursor = self._conn.execute(
+                    "INSERT INTO items (session_id, data) VALUES (?, ?)",
+                    (self.session_id, json.dumps(item, separators=(",", ":"))),
+                )
+                last_id = cursor.lastrowid
+        # Only once the inserts are committed; a rollback leaves the store as it was.
+        self._last_id = last_id
+        self._items.extend(items)
+        self._since_snapshot += len(items)
+
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def to_input_list(self) -> list[TResponseInputItem]:
+        """Returns the whole conversation, ready to pass to `Runner.run`."""
+        return list(self._items)
+
+    def refresh(self) -> int:
+        """Loads items appended by other connections since the last load. Returns how many."""
+        rows = self._conn.execute(
+            "SELECT id, data FROM items WHERE session_id = ? AND id > ? ORDER BY id",
+            (self.session_id, self._last_id),
+        ).fetchall()
+        for row_id, data in rows:
+            self._items.append(json.loads(data))
+            self._last_id = row_id
+        self._since_snapshot += len(rows)
+        return len(rows)
+
+    def snapshot(self) -> None:
+        """Writes the current history as a single snapshot, replacing the previous one."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (session_id, last_id, data) VALUES (?, ?, ?)",
+                (
+                    self.session_id,
+                    self._last_id,
+                    json.dumps(self._items, separators=(",", ":")),
+                ),
+            )
+        self._since_snapshot = 0
+
+    def clear(self) -> None:
+        """Deletes the session from disk and memory."""
+        with self._conn:
+            self._conn.execute("DELETE FROM items WHERE session_id = ?", (self.session_id,))
+            self._conn.execute("DELETE FROM snapshots WHERE session_id = ?", (self.session_id,))
+        self._items.clear()
+        self._last_id = 0
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> SessionStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _load(self) -> None:
+        row = self._conn.execute(
+            "SELECT last_id, data FROM snapshots WHERE session_id = ?", (self.session_id,)
+        ).fetchone()
+        if row is not None:
+            self._last_id, data = row
+            self._items = json.loads(data)
+        self.refresh()
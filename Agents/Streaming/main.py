@@ -0,0 +1,43 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents.run import RunConfig
+import asyncio
+
+from printer import format_stats, print_streamed
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = True
+                   )
+
+agent = Agent(name="My Agent", instructions="You are a helpful assistant that can answer questions and help with tasks.", model = model)
+
+history = []
+
+async def main():
+    while True:
+
+        user_input = input ("How may I help you today: " )
+
+        history.append({"role": "user", "content": user_input})
+
+        result = Runner.run_streamed(agent, input = history, run_config = config)
+
+        # Prints the answer while it is generated instead of after the run.
+        turn = await print_streamed(result, prefix = "Response: ")
+        print(format_stats(turn))
+
+        history.extend(item.to_input_item() for item in result.new_items)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
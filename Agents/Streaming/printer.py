@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, TextIO
+
+from agents import ItemHelpers
+from agents.result import RunResultStreaming
+from openai.types.responses import ResponseTextDeltaEvent
+
+
+@dataclass
+class StreamedTurn:
+    """The outcome of one streamed run, as printed by `print_streamed`."""
+
+    text: str
+    """The text of the last assistant message."""
+
+    final_output: Any
+    """The run's final output, same as `RunResultStreaming.final_output`."""
+
+    time_to_first_token: float | None
+    """Seconds from the start of streaming to the first text delta, or `None` if there was none."""
+
+    duration: float
+    """Seconds from the start of streaming until the run completed."""
+
+    output_tokens: int
+    """Output tokens reported by the model, or estimated from the text if it reported none."""
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Output tokens per second, measured from the first token to the end of the run."""
+        elapsed = self.duration - (self.time_to_first_token or 0.0)
+        return self.output_tokens / elapsed if elapsed > 0 else 0.0
+
+
+async def print_streamed(
+    result: RunResultStreaming,
+    prefix: str = "Response: ",
+    file: TextIO = sys.stdout,
+) -> StreamedTurn:
+    """Prints the text deltas of a `Runner.run_streamed` result as they arrive.
+
+    The last assistant message is kept from the `message_output_created` event, so the transcript
+    is never rebuilt with `to_input_list()` just to read it.
+    """
+    start = time.perf_counter()
+    first_token: float | None = None
+    deltas: list[str] = []
+    message_text: str | None = None
+
+    print(prefix, end="", file=file, flush=True)
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            deltas.append(event.data.delta)
+            print(event.data.delta, end="", file=file, flush=True)
+        elif event.type == "run_item_stream_event" and event.name == "message_output_created":
+            message_text = ItemHelpers.text_message_output(event.item)
+            # The streamed deltas are only a fallback for runs that never emit a message item.
+            deltas.clear()
+    print(file=file, flush=True)
+    duration = time.perf_counter() - start
+
+    text = message_text if message_text is not None else "".join(deltas)
+    output_tokens = result.context_wrapper.usage.output_tokens or (len(text) + 3) // 4
+    return StreamedTurn(
+        text=text,
+        final_output=result.final_output,
+        time_to_first_token=first_token,
+        duration=duration,
+        output_tokens=output_tokens,
+    )
+
+
+def format_stats(turn: StreamedTurn) -> str:
+    ttft = f"{turn.time_to_first_token * 1000:.0f} ms" if turn.time_to_first_token is not None else "n/a"
+    return (
+        f"(first token: {ttft}, {turn.output_tokens} tokens "
+        f"at {turn.tokens_per_second:.1f} tokens/s)"
+    )
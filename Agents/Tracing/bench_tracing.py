@@ -0,0 +1,56 @@
+"""Tracing overhead per trace, and how much of it reaches the exporter.
+
+Each trace is an agent span with `SPANS` custom spans under it, roughly a short run with a few
+tool calls; one trace in a hundred records an error. Everything is exported to a
+`MemoryExporter`, so nothing leaves the process and the numbers are the processors' own cost.
+
+    python bench_tracing.py
+"""
+
+import statistics
+import time
+
+from agents.tracing import agent_span, custom_span, set_trace_processors, trace
+from agents.tracing.processors import BatchTraceProcessor
+
+from exporters import MemoryExporter
+from sampling import BatchExporter, SamplingProcessor
+
+TRACES = 2000
+SPANS = 8
+
+
+def run_traces() -> float:
+    start = time.perf_counter()
+    for i in range(TRACES):
+        with trace("Bench workflow"):
+            with agent_span("Bench agent") as parent:
+                for j in range(SPANS):
+                    with custom_span(f"tool_{j}", {"call": j}):
+                        pass
+                if i % 100 == 0:
+                    parent.set_error({"message": "tool failed", "data": None})
+    return (time.perf_counter() - start) / TRACES * 1e6
+
+
+def measure(name: str, make_processor) -> None:
+    exporter = MemoryExporter()
+    processor = make_processor(exporter) if make_processor else None
+    set_trace_processors([processor] if processor else [])
+    timings = [run_traces() for _ in range(5)]
+    if processor:
+        processor.shutdown()
+    print(f"{name:<24} {statistics.median(timings):>14.1f} {len(exporter.items):>15}")
+
+
+def main() -> None:
+    print(f"{'processor':<24} {'us per trace':>14} {'items exported':>15}")
+    measure("none", None)
+    measure("BatchTraceProcessor", BatchTraceProcessor)
+    measure("sample 100%", lambda e: SamplingProcessor(BatchExporter(e), sample_rate=1.0))
+    measure("sample 10% + errors", lambda e: SamplingProcessor(BatchExporter(e), sample_rate=0.1))
+    measure("sample 1% + errors", lambda e: SamplingProcessor(BatchExporter(e), sample_rate=0.01))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+from agents.tracing import Span, Trace
+from agents.tracing.processor_interface import TracingExporter
+
+
+class MemoryExporter(TracingExporter):
+    """Keeps exported traces and spans in a list, for tests and offline benchmarks."""
+
+    def __init__(self) -> None:
+        self.items: list[Trace | Span[Any]] = []
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        with self._lock:
+            self.items.extend(items)
+            self.batches += 1
+
+    @property
+    def traces(self) -> list[Trace]:
+        return [item for item in self.items if isinstance(item, Trace)]
+
+    @property
+    def spans(self) -> list[Span[Any]]:
+        return [item for item in self.items if isinstance(item, Span)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.items.clear()
+            self.batches = 0
+
+
+class JsonlFileExporter(TracingExporter):
+    """Appends each trace and span to a file as one line of JSON, in the SDK's own export format."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        lines = []
+        for item in items:
+            data = item.export()
+            if data is not None:
+                lines.append(json.dumps(data, separators=(",", ":"), default=str) + "\n")
+        if lines:
+            with self.path.open("a", encoding="utf-8") as file:
+                file.writelines(lines)
+
+
+class OTLPExporter(TracingExporter):
+    """Sends spans to an OpenTelemetry collector as OTLP/JSON over HTTP.
+
+    SDK trace ids are 32 hex digits and span ids 24, so span ids are cut to their last 16 digits;
+    ids that aren't hex are hashed instead. A trace isn't an OTLP span, so its name and group id are
+    remembered and attached to each of its spans as attributes.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:4318/v1/traces",
+        service_name: str = "openai-agents",
+        headers: dict[str, str] | None = None,
+        timeout: float = 10.0,
+    ) -> None:
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._client = httpx.Client(headers=headers, timeout=timeout)
+        self._traces: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        spans = []
+        for item in items:
+            if isinstance(item, Trace):
+                self._remember(item)
+            else:
+                spans.append(self._span(item))
+        if not spans:
+            return
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+                    "scopeSpans": [{"scope": {"name": "openai-agents"}, "spans": spans}],
+                }
+            ]
+        }
+        response = self._client.post(self.endpoint, json=payload)
+        response.raise_for_status()
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _remember(self, trace: Trace) -> None:
+        data = trace.export() or {}
+        self._traces[trace.trace_id] = {
+            "agents.workflow_name": data.get("workflow_name"),
+            "agents.group_id": data.get("group_id"),
+        }
+        while len(self._traces) > 1024:
+            self._traces.popitem(last=False)
+
+    def _span(self, span: Span[Any]) -> dict[str, Any]:
+        data = span.span_data.export()
+        attributes = {f"agents.{key}": value for key, value in data.items()}
+        attributes.update(self._traces.get(span.trace_id, {}))
+        otlp: dict[str, Any] = {
+            "traceId": _hex_id(span.trace_id, 32),
+            "spanId": _hex_id(span.span_id, 16),
+            "name": data.get("name") or span.span_data.type,
+            "kind": 1,
+            "startTimeUnixNano": _unix_nanos(span.started_at),
+            "endTimeUnixNano": _unix_nanos(span.ended_at),
+            "attributes": [
+                _attribute(key, value) for key, value in attributes.items() if value is not None
+            ],
+        }
+        if span.parent_id:
+            otlp["parentSpanId"] = _hex_id(span.parent_id, 16)
+        if span.error:
+            otlp["status"] = {"code": 2, "message": span.error.get("message", "")}
+        return otlp
+
+
+def _hex_id(value: str, width: int) -> str:
+    digits = value.split("_", 1)[-1].lower()
+    if len(digits) < width or any(c not in "0123456789abcdef" for c in digits):
+        digits = hashlib.sha256(value.encode()).hexdigest()
+    return digits[-width:]
+
+
+def _unix_nanos(timestamp: str | None) -> str:
+    if not timestamp:
+        return "0"
+    return str(int(datetime.fromisoformat(timestamp).timestamp() * 1_000_000_000))
+
+
+def _attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    elif isinstance(value, str):
+        typed = {"stringValue": value}
+    else:
+        typed = {"stringValue": json.dumps(value, default=str)}
+    return {"key": key, "value": typed}
@@ -0,0 +1,62 @@
+import os
+from dotenv import load_dotenv
+from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, function_tool, set_trace_processors, trace
+from agents.run import RunConfig
+import asyncio
+
+from exporters import JsonlFileExporter
+from sampling import BatchExporter, SamplingProcessor
+
+load_dotenv()
+api_key = os.getenv("GEMINI_API_KEY")
+
+
+client = AsyncOpenAI(api_key=api_key, base_url="https://generativelanguage.googleapis.com/v1beta/openai/",)
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+
+# Keep every trace with an error or slower than 5 seconds, and 10% of the rest.
+# Swap JsonlFileExporter for OTLPExporter() to send them to an OpenTelemetry collector.
+processor = SamplingProcessor(
+    BatchExporter(JsonlFileExporter("traces.jsonl"), max_batch_size = 128, flush_interval = 2.0),
+    sample_rate = 0.1,
+    slow_threshold = 5.0,
+)
+set_trace_processors([processor])
+
+config = RunConfig(model = model,
+                   model_provider = client,
+                   tracing_disabled = False,
+                   workflow_name = "Sampled Tracing",
+                   trace_metadata = {"test_type": "sampling"}
+                   )
+
+@function_tool
+def get_weather_tool():
+    return ("FAisalabad weather is sunny!")
+
+@function_tool
+def get_time_tool():
+    return ("Current time is 3:45 PM!")
+
+agent = Agent(
+    name = "Multi-tool agent",
+    instructions="You are a helpful assistant that can provide weather and time information.",
+    tools=[get_weather_tool, get_time_tool],
+    model = model
+)
+
+async def main():
+    for i in range(5):
+        with trace(workflow_name="Sampled Tracing", group_id=f"session_{i}"):
+            result = await Runner.run(agent, "What is the weather and the current time?", run_config = config)
+        print(f"Run {i + 1}:", result.final_output)
+
+    processor.shutdown()
+    print("\n=== Sampling ===")
+    print(processor.stats)
+    print(processor.batch.stats)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
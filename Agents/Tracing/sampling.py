@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents.tracing import Span, Trace, TracingProcessor
+from agents.tracing.processor_interface import TracingExporter
+
+
+@dataclass
+class ExportStats:
+    exported: int = 0
+    dropped: int = 0
+    batches: int = 0
+    errors: int = 0
+    last_error: BaseException | None = None
+
+
+class BatchExporter:
+    """Hands traces and spans to an exporter in batches, from a background thread.
+
+    Items wait in a queue of at most `max_queue_size`; once it's full, new items are dropped and
+    counted in `stats.dropped` rather than slowing the run down. The worker exports as soon as
+    `max_batch_size` items are waiting, and otherwise every `flush_interval` seconds. An exporter
+    that raises loses that batch only; the error is kept in `stats.last_error`.
+
+    `shutdown` exports what's left and then closes the exporter, if it has a `close` method.
+    """
+
+    def __init__(
+        self,
+        exporter: TracingExporter,
+        max_queue_size: int = 8192,
+        max_batch_size: int = 256,
+        flush_interval: float = 5.0,
+    ) -> None:
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.stats = ExportStats()
+        self._queue: queue.Queue[Trace | Span[Any]] = queue.Queue(maxsize=max_queue_size)
+        self._wakeup = threading.Event()
+        self._export_lock = threading.Lock()
+        # `stats` is updated from the worker and from every thread that submits or flushes.
+        self._stats_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, item: Trace | Span[Any]) -> None:
+        if self._closed:
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            with self._stats_lock:
+                self.stats.dropped += 1
+            return
+        if self._worker is None:
+            self._start()
+        if self._queue.qsize() >= self.max_batch_size:
+            self._wakeup.set()
+
+    def force_flush(self) -> None:
+        """Exports everything queued so far, on the calling thread."""
+        self._drain(everything=True)
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        """Stops the worker, exports whatever is still queued, and closes the exporter."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+        self._drain(everything=True)
+        close = getattr(self.exporter, "close", None)
+        if callable(close):
+            # Waits for a worker that outlived `timeout`, so nothing exports to a closed exporter.
+            with self._export_lock:
+                close()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="trace-export", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            full = self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            # Woken by a full batch: export full batches only and leave the rest for the timer.
+            self._drain(everything=not full)
+
+    def _drain(self, everything: bool) -> None:
+        with self._export_lock:
+            while everything or self._queue.qsize() >= self.max_batch_size:
+                batch: list[Trace | Span[Any]] = []
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    break
+                try:
+                    self.exporter.export(batch)
+                except Exception as error:
+                    with self._stats_lock:
+                        self.stats.errors += 1
+                        self.stats.last_error = error
+                else:
+                    with self._stats_lock:
+                        self.stats.exported += len(batch)
+                        self.stats.batches += 1
+
+
+@dataclass
+class SamplingStats:
+    traces: int = 0
+    kept_sampled: int = 0
+    kept_errors: int = 0
+    kept_slow: int = 0
+    dropped: int = 0
+    spans_truncated: int = 0
+
+    @property
+    def kept(self) -> int:
+        return self.kept_sampled + self.kept_errors + self.kept_slow
+
+
+@dataclass(slots=True)
+class _PendingTrace:
+    started: float
+    keep: bool
+    items: list[Trace | Span[Any]] = field(default_factory=list)
+
+
+class SamplingProcessor(TracingProcessor):
+    """A trace processor that keeps every failed or slow trace and `sample_rate` of the rest.
+
+    The head decision is made when a trace starts, from a hash of its id, so it's the same in every
+    process that sees the trace. Sampled traces go straight to the `BatchExporter`. The others are
+    held in memory until they either record a span error, which exports them at once, or end: a
+    trace that took at least `slow_threshold` seconds is exported, any other is dropped.
+
+    A held trace keeps at most `max_spans_per_trace` spans, and at most `max_pending_traces` traces
+    are held at a time; past that the oldest is decided as if it had ended.
+    """
+
+    def __init__(
+        self,
+        exporter: TracingExporter | BatchExporter,
+        sample_rate: float = 0.1,
+        slow_threshold: float | None = 10.0,
+        keep_errors: bool = True,
+        max_spans_per_trace: int = 1000,
+        max_pending_traces: int = 1000,
+    ) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+        self.batch = exporter if isinstance(exporter, BatchExporter) else BatchExporter(exporter)
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.keep_errors = keep_errors
+        self.max_spans_per_trace = max_spans_per_trace
+        self.max_pending_traces = max_pending_traces
+        self.stats = SamplingStats()
+        self._threshold = int(sample_rate * 0xFFFFFFFF)
+        self._pending: dict[str, _PendingTrace] = {}
+        self._lock = threading.Lock()
+
+    def sampled(self, trace_id: str) -> bool:
+        """The head decision for a trace id."""
+        return self.sample_rate >= 1.0 or zlib.crc32(trace_id.encode()) < self._threshold
+
+    def on_trace_start(self, trace: Trace) -> None:
+        keep = self.sampled(trace.trace_id)
+        with self._lock:
+            self.stats.traces += 1
+            if keep:
+                self.stats.kept_sampled += 1
+            self._pending[trace.trace_id] = _PendingTrace(
+                time.monotonic(), keep, [] if keep else [trace]
+            )
+            evicted = self._evict()
+        if keep:
+            self.batch.submit(trace)
+        if evicted is not None:
+            self._decide(evicted)
+
+    def on_trace_end(self, trace: Trace) -> None:
+        with self._lock:
+            pending = self._pending.pop(trace.trace_id, None)
+        if pending is not None:
+            self._decide(pending)
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        pass
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        with self._lock:
+            pending = self._pending.get(span.trace_id)
+            if pending is None or pending.keep:
+                release = None
+            elif self.keep_errors and span.error is not None:
+                pending.keep = True
+                self.stats.kept_errors += 1
+                release, pending.items = pending.items, []
+            else:
+                if len(pending.items) < self.max_spans_per_trace:
+                    pending.items.append(span)
+                else:
+                    self.stats.spans_truncated += 1
+                return
+
+        if release is not None:
+            for item in release:
+                self.batch.submit(item)
+        if pending is None:
+            # A span whose trace started before this processor was installed.
+            if self.sampled(span.trace_id):
+                self.batch.submit(span)
+        else:
+            self.batch.submit(span)
+
+    def force_flush(self) -> None:
+        self.batch.force_flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for trace in pending:
+            self._decide(trace)
+        self.batch.shutdown()
+
+    def _evict(self) -> _PendingTrace | None:
+        if len(self._pending) <= self.max_pending_traces:
+            return None
+        oldest = next(iter(self._pending))
+        return self._pending.pop(oldest)
+
+    def _decide(self, pending: _PendingTrace) -> None:
+        if pending.keep:
+            return
+        duration = time.monotonic() - pending.started
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            with self._lock:
+                self.stats.kept_slow += 1
+            for item in pending.items:
+                self.batch.submit(item)
+        else:
+            with self._lock:
+                self.stats.dropped += 1
+        pending.items = []
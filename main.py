@@ -31,7 +31,7 @@ async def main():
         
         result = await Runner.run(agent, input = history, run_config = config)
         
-        print(f"Response: ", result.to_input_list()[-1]['content'][0]['text'].strip())
+        print(f"Response: ", str(result.final_output).strip())
   
         ##### 1st Method
         # --------------------------------------------------------------------------